@@ -0,0 +1,113 @@
+"""
+Succès déclarés comme données et évalués au fil des modifications des stats.
+
+Chaque succès indique les métriques qu'il surveille et le seuil à atteindre:
+
+    {"id": "10_sessions", "name": "10 sessions", "description": "...", "when": {"launch_count": 10}}
+
+Un seuil numérique est atteint quand la métrique est >= au seuil; une chaîne doit
+faire partie de la métrique (ensemble). Seuls les succès dont une métrique dépend
+d'une clé de stats modifiée sont réévalués, et tous les déblocages d'une même
+évaluation sont enregistrés en une seule écriture.
+"""
+from datetime import date
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# métrique -> (clés de stats dont elle dépend, calcul à partir des stats)
+METRICS = {
+    "launch_count": (("launch_count",), lambda stats, manager: stats.get("launch_count", 0)),
+    "login_count": (("login_count",), lambda stats, manager: stats.get("login_count", 0)),
+    "playtime": (("playtime",), lambda stats, manager: stats.get("playtime", 0)),
+    "best_streak": (("streak",), lambda stats, manager: manager.get_streaks(stats)[1]),
+    # Jours de l'année joués, au format MM-DD
+    "played_on": (("play_days",), lambda stats, manager: {date.fromordinal(day).strftime("%m-%d") for day in stats.get("play_days", [])}),
+}
+
+ACHIEVEMENTS = [
+    {"id": "first_launch", "name": "Premier lancement", "description": "Lancer Minecraft pour la première fois",
+     "when": {"launch_count": 1}},
+    {"id": "10_sessions", "name": "10 sessions", "description": "Jouer 10 sessions différentes",
+     "when": {"launch_count": 10}},
+    {"id": "10h_play", "name": "10 heures de jeu", "description": "Atteindre 10 heures de jeu cumulées",
+     "when": {"playtime": 36000}},
+    {"id": "3_streak", "name": "3 jours de streak", "description": "Jouer 3 jours d'affilée",
+     "when": {"best_streak": 3}},
+    {"id": "7_streak", "name": "7 jours de streak", "description": "Jouer 7 jours d'affilée",
+     "when": {"best_streak": 7}},
+    {"id": "new_year", "name": "Jour de l'an", "description": "Jouer un 1er janvier",
+     "when": {"played_on": "01-01"}},
+]
+
+def condition_met(value, expected):
+    if isinstance(expected, str):
+        return expected in value
+    return value >= expected
+
+class AchievementEngine(QObject):
+    """
+    Évalue les succès à chaque notification du StatsManager.
+    `unlocked` est émis avec la liste des succès qui viennent d'être débloqués.
+    """
+    unlocked = pyqtSignal(list)
+
+    def __init__(self, stats_manager, achievements=ACHIEVEMENTS, parent=None):
+        super().__init__(parent)
+        self.stats_manager = stats_manager
+        self.achievements = list(achievements)
+        self._by_stat = {}
+        for achievement in self.achievements:
+            for metric in achievement["when"]:
+                if metric not in METRICS:
+                    raise ValueError(f"Métrique inconnue pour le succès {achievement['id']}: {metric}")
+                for key in METRICS[metric][0]:
+                    self._by_stat.setdefault(key, []).append(achievement)
+        self._unlocked = {s['id'] for s in stats_manager.get_successes()}
+        stats_manager.add_listener(self._on_stats_changed)
+        # Rattrapage au démarrage (nouveaux succès ou stats modifiées hors du launcher), sans notification
+        self.evaluate(stats_manager._read_stats(), notify=False)
+
+    def _candidates(self, changed_keys):
+        if changed_keys is None:
+            return [a for a in self.achievements if a["id"] not in self._unlocked]
+        seen = set()
+        candidates = []
+        for key in changed_keys:
+            for achievement in self._by_stat.get(key, []):
+                if achievement["id"] not in self._unlocked and achievement["id"] not in seen:
+                    seen.add(achievement["id"])
+                    candidates.append(achievement)
+        return candidates
+
+    def evaluate(self, stats, changed_keys=None, notify=True):
+        """Débloque les succès atteints parmi ceux concernés par `changed_keys` (tous si None)."""
+        candidates = self._candidates(changed_keys)
+        if not candidates:
+            return []
+        metrics = {}
+        newly_unlocked = []
+        for achievement in candidates:
+            met = True
+            for metric, expected in achievement["when"].items():
+                if metric not in metrics:
+                    metrics[metric] = METRICS[metric][1](stats, self.stats_manager)
+                if not condition_met(metrics[metric], expected):
+                    met = False
+                    break
+            if met:
+                newly_unlocked.append(achievement)
+        if not newly_unlocked:
+            return []
+        self._unlocked.update(a["id"] for a in newly_unlocked)
+        entries = self.stats_manager.unlock_successes(
+            [(a["id"], a["name"], a["description"]) for a in newly_unlocked]
+        )
+        if entries and notify:
+            self.unlocked.emit(entries)
+        return entries
+
+    def _on_stats_changed(self, stats, changed_keys):
+        if 'successes' in changed_keys:
+            # Réinitialisation ou déblocage: la liste du fichier fait foi
+            self._unlocked = {s['id'] for s in stats.get('successes', [])}
+        self.evaluate(stats, changed_keys)
@@ -2,10 +2,10 @@ import os
 import json
 import threading
 import functools
-import requests
+import time
 import webbrowser
 from urllib.parse import urlparse, parse_qs
-from datetime import datetime
+from datetime import datetime, timezone
 import traceback
 from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtWidgets import QInputDialog, QMessageBox
@@ -13,9 +13,10 @@ from PyQt5.QtWidgets import QInputDialog, QMessageBox
 from .utils import (
     refresh_ms_token, exchange_code_for_token, authenticate_with_xbox, 
     authenticate_with_xsts, login_with_minecraft, get_minecraft_profile,
-    save_github_token, load_github_token, CONFIG_FILE
+    save_github_token, load_github_token, save_secret, load_secret, CONFIG_FILE
 )
 from .translation_manager import translations
+from .tracing import span, traced
 
 def run_in_thread(fn):
     @functools.wraps(fn)
@@ -64,6 +65,116 @@ def load_azure_client_id():
         print(f"ERREUR: Le fichier '{config_path}' est malformé. Veuillez le corriger.")
         return None
 
+# Étapes de la chaîne d'authentification dont le token est mis en cache (dans le keyring)
+AUTH_STAGES = ("ms", "xbl", "xsts", "minecraft", "profile")
+# Un token est considéré expiré un peu avant sa date réelle
+TOKEN_EXPIRY_MARGIN = 300
+
+def _parse_xbox_expiry(not_after):
+    """Convertit le champ NotAfter d'Xbox Live (ISO 8601, UTC) en timestamp."""
+    try:
+        return datetime.strptime(not_after[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        return 0
+
+class AuthTokenCache:
+    """
+    Tokens intermédiaires (Microsoft, Xbox, XSTS, Minecraft) et profil avec leur expiration.
+    Chaque étape est un secret séparé du keyring; le profil est valable tant que le token Minecraft l'est.
+    """
+
+    def __init__(self):
+        self._tokens = None
+
+    def _load(self):
+        if self._tokens is None:
+            self._tokens = {}
+            for stage in AUTH_STAGES:
+                raw = load_secret(f"auth_{stage}")
+                if raw:
+                    try:
+                        self._tokens[stage] = json.loads(raw)
+                    except ValueError:
+                        pass
+        return self._tokens
+
+    def get(self, stage):
+        """Retourne l'entrée de l'étape si elle n'est pas (bientôt) expirée, sinon None."""
+        entry = self._load().get(stage)
+        if stage == "profile":
+            return entry if entry and self.get("minecraft") else None
+        if entry and entry.get("expires_at", 0) - TOKEN_EXPIRY_MARGIN > time.time():
+            return entry
+        return None
+
+    def put(self, stage, expires_at=None, **values):
+        entry = dict(values, expires_at=expires_at or 0)
+        self._load()[stage] = entry
+        save_secret(f"auth_{stage}", json.dumps(entry))
+        return entry
+
+    def expires_at(self, stage):
+        """Expiration enregistrée pour une étape (même dépassée), ou None."""
+        entry = self._load().get(stage)
+        return entry.get("expires_at") if entry else None
+
+    def invalidate(self, stage):
+        """Oublie le token d'une étape en mémoire pour forcer son renouvellement."""
+        self._load().pop(stage, None)
+
+    def clear(self):
+        for stage in AUTH_STAGES:
+            save_secret(f"auth_{stage}", None)
+        self._tokens = {}
+
+class TokenRefreshScheduler:
+    """
+    Renouvelle le token Minecraft en arrière-plan avant son expiration, pour que le lancement
+    du jeu n'attende jamais l'authentification. L'horloge murale est vérifiée régulièrement,
+    ce qui couvre aussi les mises en veille de la machine.
+    """
+    REFRESH_LEAD = 900
+    CHECK_INTERVAL = 60
+    RETRY_DELAYS = (30, 60, 120, 300, 600)
+
+    def __init__(self, get_expiry, refresh):
+        self.get_expiry = get_expiry
+        self.refresh = refresh
+        self._thread = None
+        self._stop = threading.Event()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="token-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self, stop):
+        failures = 0
+        next_attempt = 0
+        while not stop.wait(self.CHECK_INTERVAL):
+            expires_at = self.get_expiry()
+            now = time.time()
+            if not expires_at or now < expires_at - self.REFRESH_LEAD or now < next_attempt:
+                continue
+            try:
+                self.refresh()
+                failures = 0
+                next_attempt = 0
+            except Exception as e:
+                delay = self.RETRY_DELAYS[min(failures, len(self.RETRY_DELAYS) - 1)]
+                failures += 1
+                next_attempt = now + delay
+                print(f"Renouvellement du token échoué ({type(e).__name__}: {e}), nouvel essai dans {delay} s")
+
 class AuthManager:
     """Manages Microsoft authentication for the launcher."""
     
@@ -72,6 +183,11 @@ class AuthManager:
         self.signals = signals
         self.client_id = load_azure_client_id()
         self.auth_data = None
+        self.token_cache = AuthTokenCache()
+        self._auth_lock = threading.Lock()
+        self.refresh_scheduler = TokenRefreshScheduler(
+            lambda: self.token_cache.expires_at("minecraft"), self.refresh_tokens
+        )
     
     def get_client_id(self):
         """Get the Azure client ID."""
@@ -128,42 +244,32 @@ class AuthManager:
         return False
 
     @run_in_thread
+    @traced("auth.microsoft_flow")
     def _do_microsoft_auth_flow(self, auth_code=None, refresh_token=None):
         """Handle Microsoft authentication flow in a background thread."""
         try:
-            if refresh_token:
-                self.signals.status.emit("🔄 Actualisation du token...")
-                ms_token_data = refresh_ms_token(refresh_token, self.client_id)
-            elif auth_code:
-                self.signals.status.emit("🔐 Échange du code...")
-                ms_token_data = exchange_code_for_token(auth_code, self.client_id)
-            else:
+            if auth_code:
+                # Nouvelle connexion: les tokens d'un éventuel autre compte ne sont plus valables
+                self.token_cache.clear()
+            elif not refresh_token:
                 self.signals.login_error.emit("Aucun code ou token fourni.")
                 return
 
-            access_token = ms_token_data['access_token']
-
-            self.signals.status.emit("🎮 Authentification Xbox...")
-            xbl_data = authenticate_with_xbox(access_token)
-
-            self.signals.status.emit("🔒 Authentification XSTS...")
-            xsts_data = authenticate_with_xsts(xbl_data['Token'])
-
-            self.signals.status.emit("⚡ Authentification Minecraft...")
-            mc_data = login_with_minecraft(xbl_data['DisplayClaims']['xui'][0]['uhs'], xsts_data['Token'])
-
-            self.signals.status.emit("👤 Récupération du profil...")
-            profile = get_minecraft_profile(mc_data['access_token'])
+            with self._auth_lock:
+                try:
+                    mc_token, profile = self._run_auth_chain(auth_code, refresh_token)
+                except Exception as e:
+                    if auth_code or getattr(e, 'response', None) is None:
+                        raise
+                    # Un token en cache a pu être révoqué: on recommence sans le cache
+                    print(f"Authentification avec les tokens en cache refusée ({e}), nouvelle tentative complète.")
+                    self.token_cache.clear()
+                    mc_token, profile = self._run_auth_chain(None, refresh_token)
 
             self.auth_data = {
-                "access_token": mc_data['access_token'],
+                "access_token": mc_token,
                 "profile": profile
             }
-
-            if 'refresh_token' in ms_token_data:
-                self.config["refresh_token"] = ms_token_data['refresh_token']
-                self.save_config()
-
             self.signals.login_complete.emit(profile)
 
         except Exception as e:
@@ -173,8 +279,95 @@ class AuthManager:
                 error_message = f"HTTP {e.response.status_code} pour {e.response.url}"
             self.signals.login_error.emit(str(translations.tr("login.auth_error", error=error_message)))
 
+    def refresh_tokens(self):
+        """Renouvelle le token Minecraft sans interface (appelé par le planificateur, dans son thread)."""
+        with self._auth_lock:
+            # Vérifié sous le verrou: logout() le prend aussi avant d'effacer la session
+            refresh_token = self.config.get("refresh_token")
+            if not refresh_token or self.auth_data is None:
+                return
+            self.token_cache.invalidate("minecraft")
+            try:
+                mc_token, profile = self._run_auth_chain(None, refresh_token, quiet=True)
+            except Exception as e:
+                if getattr(e, 'response', None) is None:
+                    raise
+                # Un token Xbox/XSTS en cache a pu être révoqué: on repart du refresh token
+                print(f"Renouvellement avec les tokens en cache refusé ({e}), nouvelle tentative complète.")
+                self.token_cache.clear()
+                mc_token, profile = self._run_auth_chain(None, refresh_token, quiet=True)
+            if self.config.get("refresh_token") is None:
+                # Déconnexion pendant le renouvellement: on ne garde rien
+                self.token_cache.clear()
+                return
+            self.auth_data = {
+                "access_token": mc_token,
+                "profile": profile
+            }
+        print("Token Minecraft renouvelé en arrière-plan.")
+
+    def _run_auth_chain(self, auth_code=None, refresh_token=None, quiet=False):
+        """
+        MS token -> Xbox -> XSTS -> Minecraft -> profil, en repartant de la dernière étape
+        dont le token en cache est encore valide. Retourne (token Minecraft, profil).
+        """
+        cache = self.token_cache
+        status = (lambda message: None) if quiet else self.signals.status.emit
+        mc = cache.get("minecraft")
+        if not mc:
+            xsts = cache.get("xsts")
+            if not xsts:
+                xbl = cache.get("xbl")
+                if not xbl:
+                    ms = None if auth_code else cache.get("ms")
+                    if not ms:
+                        ms = self._fetch_ms_token(auth_code, refresh_token, status)
+                    status("🎮 Authentification Xbox...")
+                    with span("auth.xbox"):
+                        xbl_data = authenticate_with_xbox(ms['token'])
+                    xbl = cache.put("xbl", _parse_xbox_expiry(xbl_data.get('NotAfter')), token=xbl_data['Token'],
+                                    uhs=xbl_data['DisplayClaims']['xui'][0]['uhs'])
+
+                status("🔒 Authentification XSTS...")
+                with span("auth.xsts"):
+                    xsts_data = authenticate_with_xsts(xbl['token'])
+                xsts = cache.put("xsts", _parse_xbox_expiry(xsts_data.get('NotAfter')), token=xsts_data['Token'],
+                                 uhs=xbl['uhs'])
+
+            status("⚡ Authentification Minecraft...")
+            with span("auth.minecraft"):
+                mc_data = login_with_minecraft(xsts['uhs'], xsts['token'])
+            mc = cache.put("minecraft", time.time() + mc_data.get('expires_in', 0), token=mc_data['access_token'])
+
+        profile_entry = cache.get("profile")
+        if profile_entry:
+            profile = profile_entry['profile']
+        else:
+            status("👤 Récupération du profil...")
+            with span("auth.profile"):
+                profile = get_minecraft_profile(mc['token'])
+            cache.put("profile", profile=profile)
+        return mc['token'], profile
+
+    def _fetch_ms_token(self, auth_code=None, refresh_token=None, status=None):
+        status = status or self.signals.status.emit
+        if auth_code:
+            status("🔐 Échange du code...")
+            with span("auth.ms_token"):
+                ms_token_data = exchange_code_for_token(auth_code, self.client_id)
+        else:
+            status("🔄 Actualisation du token...")
+            with span("auth.ms_token"):
+                ms_token_data = refresh_ms_token(refresh_token, self.client_id)
+
+        if 'refresh_token' in ms_token_data:
+            self.config["refresh_token"] = ms_token_data['refresh_token']
+            self.save_config()
+        return self.token_cache.put("ms", time.time() + ms_token_data.get('expires_in', 0), token=ms_token_data['access_token'])
+
     def handle_login_complete(self, profile, parent_widget):
         """Handle successful login with animation."""
+        self.refresh_scheduler.start()
         self.signals.account_info.emit(str(translations.tr("login.connected", name=profile['name'])))
         self.signals.status.emit(str(translations.tr("login.login_success", name=profile['name'])))
         return profile
@@ -186,8 +379,12 @@ class AuthManager:
 
     def logout(self):
         """Logout with animation."""
-        self.auth_data = None
+        self.refresh_scheduler.stop()
+        # Retiré avant d'attendre le verrou: un renouvellement en cours verra la déconnexion
         self.config.pop("refresh_token", None)
+        with self._auth_lock:
+            self.auth_data = None
+            self.token_cache.clear()
         self.save_config()
         self.signals.account_info.emit(str(translations.tr("login.not_connected")))
         self.signals.status.emit(str(translations.tr("login.logout_success")))
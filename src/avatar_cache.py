@@ -0,0 +1,165 @@
+"""
+Cache des avatars Minecraft (minotar.net), en mémoire et sur disque dans SAVE_DIR/avatars.
+
+Les avatars sont indexés par UUID de profil. Une image en cache est affichée
+immédiatement; elle est revalidée en arrière-plan (ETag) une fois son TTL expiré.
+Le téléchargement et le décodage se font dans un thread, le QPixmap est créé dans
+le thread de l'interface et transmis par le signal `avatar_ready`.
+"""
+import os
+import re
+import json
+import time
+import threading
+import functools
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+from .utils import SAVE_DIR, lazy_import
+from .transfers import transfer_scheduler, INTERACTIVE
+
+requests = lazy_import("requests")
+
+AVATAR_DIR = os.path.join(SAVE_DIR, "avatars")
+AVATAR_INDEX_FILE = os.path.join(AVATAR_DIR, "index.json")
+AVATAR_URL = "https://minotar.net/armor/body/{}/120"
+AVATAR_TTL = 24 * 3600
+AVATAR_SIZE = (120, 240)
+FETCH_TIMEOUT = 5
+
+def run_in_thread(fn):
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        thread = threading.Thread(target=fn, args=(self, *args), kwargs=kwargs, daemon=True)
+        thread.start()
+        return thread
+    return wrapper
+
+def load_json_file(path, fallback=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return fallback
+
+def save_json_file(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+def decode_avatar(data):
+    """Décode et redimensionne un avatar (utilisable hors du thread de l'interface)."""
+    image = QImage.fromData(data)
+    if image.isNull():
+        return None
+    return image.scaled(AVATAR_SIZE[0], AVATAR_SIZE[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+class AvatarCache(QObject):
+    """Avatars par clé (UUID du profil): mémoire -> disque -> réseau."""
+    avatar_ready = pyqtSignal(str, QPixmap)
+    _image_loaded = pyqtSignal(str, QImage)
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, cache_dir=AVATAR_DIR, ttl=AVATAR_TTL):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.ttl = ttl
+        self._pixmaps = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._index = load_json_file(self.index_file, {})
+        # Le QPixmap doit être créé dans le thread de l'interface
+        self._image_loaded.connect(self._on_image_loaded)
+
+    def _file_for(self, key):
+        return os.path.join(self.cache_dir, re.sub(r'[^A-Za-z0-9_-]', '_', key) + ".png")
+
+    def get(self, key, name=None):
+        """
+        Retourne l'avatar en cache (ou None) sans jamais attendre le réseau.
+        Lance un téléchargement en arrière-plan s'il est absent ou expiré; `avatar_ready` suivra.
+        `name` est l'identifiant demandé à minotar (UUID ou pseudo), `key` par défaut.
+        """
+        pixmap = self._pixmaps.get(key)
+        with self._lock:
+            entry = self._index.get(key)
+        if pixmap is None and entry:
+            pixmap = QPixmap()
+            if pixmap.loadFromData(self._read_file(key) or b""):
+                pixmap = pixmap.scaled(AVATAR_SIZE[0], AVATAR_SIZE[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                self._pixmaps[key] = pixmap
+            else:
+                pixmap = None
+        if pixmap is None or not entry or time.time() - entry.get("fetched_at", 0) > self.ttl:
+            self.refresh(key, name or key)
+        return pixmap
+
+    def refresh(self, key, name=None):
+        """Télécharge (ou revalide) l'avatar en arrière-plan; un seul téléchargement par clé à la fois."""
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._fetch(key, name or key)
+
+    def _read_file(self, key):
+        try:
+            with open(self._file_for(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @run_in_thread
+    def _fetch(self, key, name):
+        try:
+            with self._lock:
+                entry = dict(self._index.get(key) or {})
+            headers = {}
+            if entry.get("etag") and os.path.exists(self._file_for(key)):
+                headers["If-None-Match"] = entry["etag"]
+            response = requests.get(AVATAR_URL.format(name), headers=headers, timeout=FETCH_TIMEOUT, stream=True)
+            if response.status_code == 304:
+                entry["fetched_at"] = time.time()
+                self._save_entry(key, entry)
+                return
+            response.raise_for_status()
+            with transfer_scheduler.job(f"avatar:{name}", INTERACTIVE) as job:
+                content = job.read(response)
+            image = decode_avatar(content)
+            if image is None:
+                print(f"[ERREUR] Avatar invalide pour {name} depuis {AVATAR_URL.format(name)}")
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._file_for(key) + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, self._file_for(key))
+            self._save_entry(key, {"etag": response.headers.get("ETag"), "fetched_at": time.time()})
+            self._image_loaded.emit(key, image)
+        except Exception as e:
+            print(f"[ERREUR] Exception lors du chargement de l'avatar pour {name} : {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def _save_entry(self, key, entry):
+        with self._lock:
+            self._index[key] = entry
+            index = dict(self._index)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            save_json_file(self.index_file, index)
+        except OSError as e:
+            print(f"[DEBUG] Erreur écriture index des avatars : {e}")
+
+    def _on_image_loaded(self, key, image):
+        pixmap = QPixmap.fromImage(image)
+        self._pixmaps[key] = pixmap
+        self.avatar_ready.emit(key, pixmap)
@@ -1,12 +1,16 @@
 import os
 import json
-import psutil
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 from PyQt5.QtCore import QTimer, Qt
 
-from .utils import CONFIG_FILE, save_github_token, load_github_token
+from .utils import CONFIG_FILE, save_github_token, load_github_token, lazy_import
 from .translation_manager import translations
 from .custom_widgets import load_qss_stylesheet, get_available_themes, apply_css_class
+from .jvm_tuning import get_available_profiles, DEFAULT_JVM_PROFILE
+from .tracing import traced
+from .transfers import transfer_scheduler
+
+psutil = lazy_import("psutil")
 
 def load_json_file(path, fallback=None):
     try:
@@ -24,7 +28,9 @@ class ConfigManager:
     
     def __init__(self):
         self.config = self.load_config()
+        transfer_scheduler.configure(self.config)
     
+    @traced("config.load")
     def load_config(self):
         """Load configuration from file."""
         config = load_json_file(CONFIG_FILE, {})
@@ -53,10 +59,15 @@ class ConfigManager:
         # Extract values from UI elements
         self.config["java_path"] = ui_elements['java_path_edit'].text()
         self.config["java_args"] = ui_elements['java_args_edit'].text()
+        self.config["jvm_profile"] = ui_elements['jvm_profile_selector'].currentText()
         self.config["auto_check_updates"] = ui_elements['auto_check_cb'].isChecked()
         self.config["auto_check_launcher_updates"] = ui_elements['auto_check_launcher_cb'].isChecked()
         self.config["theme"] = ui_elements['theme_selector'].currentText()
         self.config["max_memory"] = ui_elements['max_memory_slider'].value()
+        self.config["download_limit_kbps"] = ui_elements['download_limit_spin'].value()
+        self.config["download_limit_in_game_kbps"] = ui_elements['download_limit_in_game_spin'].value()
+        transfer_scheduler.configure(self.config)
+        self.config["install_workers"] = ui_elements['install_workers_spin'].value()
         
         # Sauvegarder et appliquer la nouvelle langue
         new_language = ui_elements['language_selector'].currentText()
@@ -100,6 +111,16 @@ class ConfigManager:
             if theme == current_theme:
                 theme_selector.setCurrentText(theme)
 
+    def populate_jvm_profiles(self, jvm_profile_selector):
+        """Populates the JVM profile selector combobox."""
+        jvm_profile_selector.clear()
+        current_profile = self.config.get("jvm_profile", DEFAULT_JVM_PROFILE)
+
+        for profile in get_available_profiles():
+            jvm_profile_selector.addItem(profile)
+            if profile == current_profile:
+                jvm_profile_selector.setCurrentText(profile)
+
     def populate_languages(self, language_selector):
         """Populates the language selector combobox."""
         language_selector.clear()
@@ -111,6 +132,7 @@ class ConfigManager:
             if language == current_language:
                 language_selector.setCurrentText(language)
 
+    @traced("ui.apply_styles")
     def apply_styles(self, parent_widget):
         """Apply beautiful modern styling to the entire application."""
         theme = self.config.get("theme", "dark.qss")
@@ -0,0 +1,276 @@
+"""
+Index des crashs de tous les modpacks (crash-reports/ et logs/ de chaque profil).
+
+Le scan est incrémental: seuls les fichiers dont la date de modification ou la taille
+a changé sont relus. L'index compact est stocké dans SAVE_DIR/crash_index.json.
+
+Usage:
+    python -m src.crash_indexer [--days 7] [--modpack "Nom du modpack"]
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import hashlib
+import argparse
+import threading
+import functools
+from collections import Counter
+
+from .utils import SAVE_DIR, get_minecraft_directory
+from .staging import is_modpack_dir_name
+
+CRASH_INDEX_FILE = os.path.join(SAVE_DIR, "crash_index.json")
+CRASH_INDEX_VERSION = 1
+SCANNED_DIRS = ("crash-reports", "logs")
+LOG_EXTENSIONS = (".txt", ".log", ".log.gz")
+SIGNATURE_FRAMES = 5
+
+EXCEPTION_LINE = re.compile(r"^(?:Caused by:\s*|Exception in thread \"[^\"]*\"\s*)?((?:[a-zA-Z_$][\w$]*\.)+[\w$]*(?:Exception|Error|Throwable))\b")
+FRAME_LINE = re.compile(r"^\s*at\s+([\w$.<>/]+)")
+SUSPECTED_MOD = re.compile(r"^\s*(?:Suspected Mods?:)?\s*[^(\n]*\(([a-z][a-z0-9_-]{1,63})\),\s*Version:")
+MOD_SECTION = re.compile(r"^-- MOD ([a-z][a-z0-9_-]{1,63}) --")
+FRAME_JAR = re.compile(r"~\[([A-Za-z][\w.+-]*?)(?:[-_](?:mc)?\d[^\]\s:%!]*)?\.jar")
+LOG_CRASH_MARKER = re.compile(r"/FATAL\]|Game crashed!|Exception in thread \"main\"|Crash report saved to")
+LOG_REPORT_REFERENCE = re.compile(r"Crash report saved to|This crash report has been saved to")
+
+# Jars et espaces de noms qui ne désignent pas un mod fautif
+IGNORED_CULPRITS = {"forge", "minecraft", "client", "server", "fmlcore", "javafmllanguage", "mclanguage",
+                    "lowcodelanguage", "fmlloader", "modlauncher", "securejarhandler", "bootstraplauncher",
+                    "eventbus", "mixin", "datafixerupper", "authlib", "brigadier", "guava", "netty"}
+
+def run_in_thread(fn):
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        thread = threading.Thread(target=fn, args=(self, *args), kwargs=kwargs, daemon=True)
+        thread.start()
+        return thread
+    return wrapper
+
+def load_json_file(path, fallback=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return fallback
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+def _stack_signature(exception, frames):
+    """Empreinte courte d'une pile: type d'exception + premières frames sans numéros de ligne."""
+    raw = "|".join([exception or "?"] + frames[:SIGNATURE_FRAMES])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+def extract_crash_info(lines, is_log=False):
+    """
+    Analyse un rapport de crash (ou un log) ligne par ligne.
+    Retourne {"exception", "cause", "mods", "signature"} ou None si aucun crash n'est trouvé.
+    Pour un log, seules les exceptions qui suivent un marqueur de crash sont retenues.
+    """
+    exception = cause = None
+    frames = []
+    mods = []
+    jar_culprits = []
+    armed = not is_log
+    references_report = False
+
+    for line in lines:
+        if is_log and not armed:
+            if LOG_CRASH_MARKER.search(line):
+                armed = True
+            else:
+                continue
+        if is_log and LOG_REPORT_REFERENCE.search(line):
+            references_report = True
+
+        match = EXCEPTION_LINE.match(line.strip())
+        if match:
+            if exception is None:
+                exception = match.group(1)
+            elif line.lstrip().startswith("Caused by:"):
+                cause = match.group(1)
+            continue
+
+        match = FRAME_LINE.match(line)
+        if match:
+            if exception and len(frames) < SIGNATURE_FRAMES and not cause:
+                frames.append(match.group(1))
+            jar = FRAME_JAR.search(line)
+            if jar:
+                jar_culprits.append(jar.group(1).lower())
+            continue
+
+        match = MOD_SECTION.match(line) or SUSPECTED_MOD.match(line)
+        if match:
+            mods.append(match.group(1))
+
+    if exception is None or references_report:
+        # Un log qui pointe vers un rapport de crash est déjà compté via le rapport
+        return None
+
+    if not mods:
+        mods = jar_culprits[:1]
+    culprits = []
+    for mod in mods:
+        if mod not in IGNORED_CULPRITS and mod not in culprits:
+            culprits.append(mod)
+
+    return {
+        "exception": exception,
+        "cause": cause,
+        "mods": culprits,
+        "signature": _stack_signature(exception, frames),
+    }
+
+class CrashIndexer:
+    """
+    Index incrémental des crashs: {chemin: {mtime, size, modpack, time, exception, cause, mods, signature}}.
+    Les fichiers sans crash sont gardés avec seulement mtime/size/modpack pour ne pas être relus.
+    """
+
+    def __init__(self, index_file=CRASH_INDEX_FILE, minecraft_dir=None):
+        self.index_file = index_file
+        self.minecraft_dir = minecraft_dir
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._entries = self._load_index()
+
+    def _load_index(self):
+        data = load_json_file(self.index_file, {})
+        if not isinstance(data, dict) or data.get("version") != CRASH_INDEX_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _save_index(self):
+        with self._lock:
+            data = {"version": CRASH_INDEX_VERSION, "files": dict(self._entries)}
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_file)
+
+    def _modpack_dirs(self, modpacks=None):
+        root = os.path.join(self.minecraft_dir or get_minecraft_directory(), "modpacks")
+        try:
+            names = modpacks or [e.name for e in os.scandir(root) if e.is_dir() and is_modpack_dir_name(e.name)]
+        except OSError:
+            return []
+        return [(name, os.path.join(root, name)) for name in names]
+
+    def _iter_files(self, modpacks=None):
+        for modpack, modpack_dir in self._modpack_dirs(modpacks):
+            for sub_dir in SCANNED_DIRS:
+                try:
+                    entries = list(os.scandir(os.path.join(modpack_dir, sub_dir)))
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(LOG_EXTENSIONS):
+                        yield modpack, sub_dir, entry
+
+    def _index_file(self, modpack, sub_dir, path, stat):
+        record = {"mtime": stat.st_mtime, "size": stat.st_size, "modpack": modpack}
+        try:
+            with _open_text(path) as f:
+                info = extract_crash_info(f, is_log=(sub_dir == "logs"))
+        except (OSError, EOFError) as e:
+            print(f"Impossible d'indexer {path}: {e}")
+            return record
+        if info:
+            record.update(info, time=stat.st_mtime)
+        return record
+
+    def scan(self, modpacks=None):
+        """
+        Relit uniquement les fichiers nouveaux ou modifiés (mtime/size) et met à jour l'index.
+        `modpacks` limite le scan à certains profils. Retourne le nombre de fichiers relus.
+        """
+        with self._scan_lock:
+            started = time.perf_counter()
+            seen = set()
+            updated = 0
+            try:
+                for modpack, sub_dir, entry in self._iter_files(modpacks):
+                    path = entry.path
+                    seen.add(path)
+                    stat = entry.stat()
+                    with self._lock:
+                        known = self._entries.get(path)
+                    if known and known["mtime"] == stat.st_mtime and known["size"] == stat.st_size:
+                        continue
+                    record = self._index_file(modpack, sub_dir, path, stat)
+                    with self._lock:
+                        self._entries[path] = record
+                    updated += 1
+
+                with self._lock:
+                    scanned_packs = set(modpacks) if modpacks else None
+                    removed = [path for path, record in self._entries.items() if path not in seen
+                               and (scanned_packs is None or record.get("modpack") in scanned_packs)]
+                    for path in removed:
+                        del self._entries[path]
+
+                if updated or removed:
+                    self._save_index()
+                print(f"Index des crashs: {updated} fichier(s) relu(s), {len(removed)} supprimé(s) en {time.perf_counter() - started:.2f} s")
+            except Exception as e:
+                print(f"Erreur lors de l'indexation des crashs: {e}")
+        return updated
+
+    @run_in_thread
+    def scan_in_background(self, modpacks=None):
+        """Lance le scan dans un thread pour ne pas bloquer l'interface."""
+        self.scan(modpacks)
+
+    def query(self, days=None, modpack=None, mod=None, exception=None):
+        """Retourne les crashs indexés (du plus récent au plus ancien) correspondant aux filtres."""
+        since = time.time() - days * 86400 if days else None
+        with self._lock:
+            records = [dict(record, path=path) for path, record in self._entries.items() if "exception" in record]
+        results = [
+            r for r in records
+            if (since is None or r["time"] >= since)
+            and (modpack is None or r["modpack"] == modpack)
+            and (mod is None or mod in r["mods"])
+            and (exception is None or exception in (r["exception"], r.get("cause")))
+        ]
+        return sorted(results, key=lambda r: r["time"], reverse=True)
+
+    def top_crashing_mods(self, days=7, modpack=None, limit=5):
+        """Retourne [(mod, nombre de crashs)] pour la période donnée."""
+        counter = Counter(mod for r in self.query(days=days, modpack=modpack) for mod in r["mods"])
+        return counter.most_common(limit)
+
+    def top_signatures(self, days=7, modpack=None, limit=5):
+        """Retourne [(signature, exception, nombre de crashs)] pour regrouper les crashs identiques."""
+        crashes = self.query(days=days, modpack=modpack)
+        counter = Counter(r["signature"] for r in crashes)
+        exceptions = {r["signature"]: r.get("cause") or r["exception"] for r in crashes}
+        return [(signature, exceptions[signature], count) for signature, count in counter.most_common(limit)]
+
+crash_indexer = CrashIndexer()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Indexe les crashs des modpacks et affiche les mods les plus souvent en cause.")
+    parser.add_argument("--days", type=int, default=7, help="Période analysée (jours)")
+    parser.add_argument("--modpack", help="Limite l'analyse à un modpack")
+    args = parser.parse_args(argv)
+
+    crash_indexer.scan()
+    crashes = crash_indexer.query(days=args.days, modpack=args.modpack)
+    print(f"\n{len(crashes)} crash(s) sur les {args.days} derniers jours")
+    for mod, count in crash_indexer.top_crashing_mods(days=args.days, modpack=args.modpack, limit=10):
+        print(f"  {mod:<30} {count}")
+    print("\nSignatures les plus fréquentes:")
+    for signature, exception, count in crash_indexer.top_signatures(days=args.days, modpack=args.modpack):
+        print(f"  {signature}  {count:>3}  {exception}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,16 +5,19 @@ import time
 import threading
 import subprocess
 import sys
-import requests
-from PyQt5.QtCore import QSize, Qt, QPropertyAnimation, QEasingCurve, QTimer, QPoint
-from PyQt5.QtGui import QPixmap, QPainter, QColor, QRadialGradient, QBrush, QPen, QFont, QMovie, QIcon
+from PyQt5.QtCore import (
+    QSize, Qt, QPropertyAnimation, QEasingCurve, QTimer, QPoint, QRect, QEvent, pyqtSignal,
+    QAbstractListModel, QModelIndex
+)
+from PyQt5.QtGui import QPixmap, QPainter, QColor, QRadialGradient, QBrush, QPen, QFont, QMovie, QIcon, QPalette, QFontMetrics
 from PyQt5.QtWidgets import (
-    QTabWidget, QProgressBar, QListWidget, QWidget, QHBoxLayout, QVBoxLayout, 
-    QLabel, QPushButton, QListWidgetItem, QMenu, QAction, QMessageBox
+    QTabWidget, QProgressBar, QListView, QWidget, QHBoxLayout, QVBoxLayout,
+    QLabel, QPushButton, QMenu, QAction, QMessageBox, QApplication, QToolTip,
+    QStyledItemDelegate, QStyleOptionViewItem, QStyle, QAbstractItemView
 )
 from PyQt5.QtCore import Qt as QtCoreQt
 
-from .particles import ParticleSystem, Particle, AnimatedButton, LoadingSpinner
+from .particles import ParticleSystem, ParticleField, FrameClock, AnimatedButton, LoadingSpinner
 from .translation_manager import translations
 from .utils import get_minecraft_directory
 
@@ -62,6 +65,33 @@ class AnimatedTabWidget(QTabWidget):
         super().mouseMoveEvent(event)
         self.particle_system.mouse_move_event(event.pos())
 
+class LazyTabPage(QWidget):
+    """
+    Page d'onglet dont le contenu n'est construit qu'au premier affichage.
+    `factory` retourne le widget du contenu.
+    """
+
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.content = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def is_built(self):
+        return self.content is not None
+
+    def ensure_built(self):
+        """Construit le contenu s'il ne l'est pas encore et le retourne."""
+        if self.content is None:
+            self.content = self.factory()
+            self.layout().addWidget(self.content)
+        return self.content
+
+    def showEvent(self, event):
+        self.ensure_built()
+        super().showEvent(event)
+
 class AnimatedProgressBar(QProgressBar):
     """Enhanced progress bar with smooth animations and particle effects."""
     
@@ -70,235 +100,359 @@ class AnimatedProgressBar(QProgressBar):
         self.animation = QPropertyAnimation(self, b"value")
         self.animation.setDuration(500)
         self.animation.setEasingCurve(QEasingCurve.OutCubic)
-        self.particles = []
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_particles)
-        self.timer.start(16)
+        self.particles = ParticleField()
         
     def setValue(self, value):
-        """Animate the value change."""
+        """Animate the value change (directly when transitions are disabled by the animation quality)."""
+        if not FrameClock.instance().transitions_enabled():
+            self.animation.stop()
+            super().setValue(value)
+            return
         self.animation.setStartValue(self.value())
         self.animation.setEndValue(value)
         self.animation.start()
+        FrameClock.instance().subscribe(self.update_particles)
+
+    def _in_progress(self):
+        return 0 < self.value() < self.maximum() or self.animation.state() == QPropertyAnimation.Running
         
-    def update_particles(self):
-        """Update particles for progress bar."""
-        if self.value() > 0 and self.value() < self.maximum():
-            # Emit particles occasionally during progress
-            if random.random() < 0.1:
+    def update_particles(self, dt):
+        """Update particles for progress bar; stops once the bar is idle and no particle is left."""
+        in_progress = self._in_progress() and self.isVisible()
+        if in_progress:
+            # Emit particles occasionally during progress (~10% des frames à 60 FPS)
+            if random.random() < 0.1 * dt * 60:
                 self.emit_particles()
                 
-        # Update existing particles
-        for particle in self.particles[:]:
-            if not particle.update(0.016):
-                self.particles.remove(particle)
+        alive = self.particles.step(dt)
         self.update()
+        return in_progress or alive > 0
         
     def emit_particles(self):
         """Emit particles from progress bar."""        
         progress_width = (self.value() / self.maximum()) * self.width()
-        for _ in range(2):
-            particle = Particle(
+        for _ in range(FrameClock.instance().particle_count(2)):
+            self.particles.emit(
                 progress_width + random.uniform(-10, 10),
                 random.randint(0, self.height()),
-                color=QColor(100, 200, 255),
+                random.uniform(-1, 1), random.uniform(-2, 0),
+                life=random.uniform(0.5, 1.0),
                 size=random.uniform(1, 3),
-                velocity=(random.uniform(-1, 1), random.uniform(-2, 0)),
-                life=random.uniform(0.5, 1.0)
+                color=QColor(100, 200, 255)
             )
-            self.particles.append(particle)
             
     def paintEvent(self, event):
         """Custom paint event with particles."""
         super().paintEvent(event)
         
-        painter = QPainter(self)
+        if len(self.particles):
+            painter = QPainter(self)
+            self.particles.draw(painter)
+
+def emoji_icon(emoji):
+    """Icône de menu à partir d'un emoji."""
+    pixmap = QPixmap(32, 32)
+    pixmap.fill(QColor(0, 0, 0, 0))
+    painter = QPainter(pixmap)
+    font = QFont()
+    font.setPointSize(18)
+    painter.setFont(font)
+    painter.drawText(pixmap.rect(), Qt.AlignCenter, emoji)
+    painter.end()
+    return QIcon(pixmap)
+
+def open_modpack_folder(modpack_data, parent=None):
+    """Ouvre le dossier du modpack dans l'explorateur de fichiers."""
+    try:
+        minecraft_dir = get_minecraft_directory()
+        modpack_dir = os.path.join(minecraft_dir, "modpacks", modpack_data['name'])
+
+        if os.path.exists(modpack_dir):
+            # Ouvrir le dossier dans l'explorateur de fichiers
+            if sys.platform == "win32":
+                os.startfile(modpack_dir)
+            elif sys.platform == "darwin":  # macOS
+                subprocess.run(["open", modpack_dir])
+            else:  # Linux
+                subprocess.run(["xdg-open", modpack_dir])
+        else:
+            QMessageBox.information(
+                parent,
+                str(translations.tr("modpack_item.folder.not_found_title")),
+                str(translations.tr("modpack_item.folder.not_found_message", name=modpack_data['name'])) + "\n\n" +
+                str(translations.tr("modpack_item.folder.expected_path", path=modpack_dir))
+            )
+    except Exception as e:
+        QMessageBox.critical(
+            parent,
+            str(translations.tr("modpack_item.folder.error_title")),
+            str(translations.tr("modpack_item.folder.error_message", error=str(e)))
+        )
+
+class ModpackListModel(QAbstractListModel):
+    """
+    Modèle de la liste des modpacks: une ligne par pack, identifiée par son nom.
+    `set_modpacks` compare le nouveau catalogue aux lignes existantes et ne signale
+    que les insertions, suppressions, déplacements et modifications réels.
+    """
+    ModpackRole = Qt.UserRole + 1
+    CheckingRole = Qt.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._modpacks = []
+        self._checking = set()
+
+    @staticmethod
+    def _key(modpack_data):
+        return modpack_data.get('name')
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._modpacks)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._modpacks):
+            return None
+        modpack_data = self._modpacks[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{modpack_data['name']} - {modpack_data['version']}"
+        if role == self.ModpackRole:
+            return modpack_data
+        if role == self.CheckingRole:
+            return self._key(modpack_data) in self._checking
+        return None
+
+    def modpack_at(self, row):
+        return self._modpacks[row] if 0 <= row < len(self._modpacks) else None
+
+    def row_of(self, name):
+        for row, modpack_data in enumerate(self._modpacks):
+            if self._key(modpack_data) == name:
+                return row
+        return -1
+
+    def set_modpacks(self, modpacks):
+        """Applique le nouveau catalogue en conservant les lignes inchangées (et la sélection)."""
+        new_keys = [self._key(pack) for pack in modpacks]
+        wanted = set(new_keys)
+
+        # 1. Suppressions, par blocs contigus en partant de la fin
+        row = len(self._modpacks) - 1
+        while row >= 0:
+            if self._key(self._modpacks[row]) in wanted:
+                row -= 1
+                continue
+            last = row
+            while row > 0 and self._key(self._modpacks[row - 1]) not in wanted:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row, last)
+            del self._modpacks[row:last + 1]
+            self.endRemoveRows()
+            row -= 1
+
+        # 2. Insertions, déplacements et mises à jour dans l'ordre du catalogue
+        existing = {self._key(pack) for pack in self._modpacks}
+        for row, pack in enumerate(modpacks):
+            key = new_keys[row]
+            current = self._modpacks[row] if row < len(self._modpacks) else None
+            if current is not None and self._key(current) == key:
+                if current != pack:
+                    self._modpacks[row] = pack
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+                continue
+
+            source = -1
+            if key in existing:
+                source = next((r for r in range(row + 1, len(self._modpacks)) if self._key(self._modpacks[r]) == key), -1)
+            if source < 0:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._modpacks.insert(row, pack)
+                self.endInsertRows()
+            else:
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), row)
+                self._modpacks.insert(row, self._modpacks.pop(source))
+                self.endMoveRows()
+                if self._modpacks[row] != pack:
+                    self._modpacks[row] = pack
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+
+        # Doublons éventuels en fin de liste
+        if len(self._modpacks) > len(modpacks):
+            self.beginRemoveRows(QModelIndex(), len(modpacks), len(self._modpacks) - 1)
+            del self._modpacks[len(modpacks):]
+            self.endRemoveRows()
+        self._checking &= wanted
+
+    def set_checking(self, name, checking=True):
+        """Affiche (ou retire) l'indicateur de vérification des mises à jour sur une ligne."""
+        if checking:
+            self._checking.add(name)
+        else:
+            self._checking.discard(name)
+        row = self.row_of(name)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [self.CheckingRole])
+
+class ModpackItemDelegate(QStyledItemDelegate):
+    """Dessine chaque ligne de modpack à la demande: fond (QSS ::item), nom et bouton info."""
+    ROW_HEIGHT = 60
+    BUTTON_SIZE = 24
+    MARGIN = 8
+
+    info_clicked = pyqtSignal(QModelIndex, QPoint)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.hovered_row = -1
+        self._name_font = None
+        self._button_font = QFont()
+        self._button_font.setPointSize(10)
+
+    def sizeHint(self, option, index):
+        return QSize(100, self.ROW_HEIGHT)
+
+    def info_rect(self, rect):
+        """Zone du bouton info (ℹ️) dans une ligne."""
+        return QRect(rect.right() - self.MARGIN - self.BUTTON_SIZE, rect.center().y() - self.BUTTON_SIZE // 2,
+                     self.BUTTON_SIZE, self.BUTTON_SIZE)
+
+    def _font_for(self, base_font):
+        if self._name_font is None or self._name_font.family() != base_font.family():
+            self._name_font = QFont(base_font)
+            self._name_font.setPixelSize(14)
+            self._name_font.setBold(True)
+        return self._name_font
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text = opt.text
+        opt.text = ""
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
+
+        painter.save()
+        selected = bool(opt.state & QStyle.State_Selected)
+        name_font = self._font_for(opt.font)
+        text_rect = opt.rect.adjusted(self.MARGIN * 2, 0, -(self.BUTTON_SIZE + self.MARGIN * 3), 0)
+        painter.setFont(name_font)
+        painter.setPen(opt.palette.color(QPalette.HighlightedText if selected else QPalette.Text))
+        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                         QFontMetrics(name_font).elidedText(text, Qt.ElideRight, text_rect.width()))
+
+        button = self.info_rect(opt.rect)
+        hovered = index.row() == self.hovered_row
         painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Draw particles
-        for particle in self.particles:
-            gradient = QRadialGradient(particle.x, particle.y, particle.size)
-            color = QColor(particle.color)
-            color.setAlpha(particle.alpha)
-            gradient.setColorAt(0, color)
-            gradient.setColorAt(1, QColor(0, 0, 0, 0))
-            
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(int(particle.x - particle.size), int(particle.y - particle.size), 
-                              int(particle.size * 2), int(particle.size * 2))
+        painter.setPen(QPen(QColor(110, 130, 190, 230) if hovered else QColor(100, 120, 180, 153), 1))
+        painter.setBrush(QColor(90, 110, 150, 204) if hovered else QColor(80, 100, 140, 153))
+        painter.drawEllipse(button)
+        painter.setFont(self._button_font)
+        painter.setPen(QColor(255, 255, 255))
+        painter.drawText(button, Qt.AlignCenter, "⏳" if index.data(ModpackListModel.CheckingRole) else "ℹ️")
+        painter.restore()
 
-class ModpackListItem(QWidget):
-    """Widget personnalisé pour afficher un modpack avec un bouton d'info qui ouvre le menu contextuel."""
-    
-    def __init__(self, modpack_data, parent=None):
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton
+                and self.info_rect(option.rect).contains(event.pos())):
+            view = option.widget
+            button = self.info_rect(option.rect)
+            self.info_clicked.emit(index, view.viewport().mapToGlobal(button.bottomRight()) if view else event.globalPos())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.ToolTip and self.info_rect(option.rect).contains(event.pos()):
+            QToolTip.showText(event.globalPos(), "Informations et actions", view)
+            return True
+        return super().helpEvent(event, view, option, index)
+
+class ModpackListView(QListView):
+    """
+    Liste des modpacks virtualisée: aucune ligne n'a de widget propre, le délégué dessine
+    uniquement les lignes visibles. Le bouton info ouvre le menu d'actions du modpack.
+    """
+    info_requested = pyqtSignal(dict)
+    update_check_requested = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.modpack_data = modpack_data
-        
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(8, 4, 8, 4)
-        layout.setSpacing(10)
-        
-        # Label avec le nom et la version
-        self.name_label = QLabel(f"{modpack_data['name']} - {modpack_data['version']}")
-        self.name_label.setProperty("class", "modpack-name")
-        layout.addWidget(self.name_label)
-        
-        layout.addStretch()
-        
-        # Remplacer le bouton update par un bouton info (ℹ️)
-        self.info_btn = AnimatedButton("ℹ️")
-        self.info_btn.setFixedSize(24, 24)
-        self.info_btn.setToolTip("Informations et actions")
-        self.info_btn.setProperty("class", "info-btn")
-        layout.addWidget(self.info_btn)
-        
-        # Connecter le bouton info à l'ouverture du menu contextuel
-        self.info_btn.clicked.connect(self.show_context_menu)
-        
-        # SUPPRIMER le menu contextuel au clic droit
-        # self.setContextMenuPolicy(Qt.CustomContextMenu)
-        # self.customContextMenuRequested.connect(self.show_context_menu)
-    
-    def set_checking_state(self, checking=True):
-        """Change l'état du bouton pendant la vérification."""
-        # Désactivé car plus de bouton update
-        pass
-    
-    def show_context_menu(self, position=None):
+        self.setModel(ModpackListModel(self))
+        self.delegate = ModpackItemDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.delegate.info_clicked.connect(self.show_context_menu)
+
+    def set_modpacks(self, modpacks):
+        self.model().set_modpacks(modpacks)
+
+    def set_checking(self, name, checking=True):
+        self.model().set_checking(name, checking)
+
+    def current_modpack(self):
+        """Retourne les données du modpack sélectionné, ou None."""
+        index = self.currentIndex()
+        return index.data(ModpackListModel.ModpackRole) if index.isValid() else None
+
+    def _set_hovered_row(self, row):
+        if row == self.delegate.hovered_row:
+            return
+        for old_row in (self.delegate.hovered_row, row):
+            if old_row >= 0:
+                self.viewport().update(self.visualRect(self.model().index(old_row)))
+        self.delegate.hovered_row = row
+        self.viewport().setCursor(Qt.PointingHandCursor if row >= 0 else Qt.ArrowCursor)
+
+    def mouseMoveEvent(self, event):
+        """Survol du bouton info."""
+        super().mouseMoveEvent(event)
+        index = self.indexAt(event.pos())
+        hovered = index.isValid() and self.delegate.info_rect(self.visualRect(index)).contains(event.pos())
+        self._set_hovered_row(index.row() if hovered else -1)
+
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        self._set_hovered_row(-1)
+
+    def show_context_menu(self, index, position):
         """Affiche le menu contextuel pour le modpack."""
-        from PyQt5.QtCore import QPoint
-        if not isinstance(position, QPoint):
-            position = None
+        modpack_data = index.data(ModpackListModel.ModpackRole)
+        if not modpack_data:
+            return
         context_menu = QMenu(self)
-        
-        def emoji_icon(emoji):
-            pixmap = QPixmap(32, 32)
-            pixmap.fill(QColor(0, 0, 0, 0))
-            painter = QPainter(pixmap)
-            font = QFont()
-            font.setPointSize(18)
-            painter.setFont(font)
-            painter.drawText(pixmap.rect(), Qt.AlignCenter, emoji)
-            painter.end()
-            return QIcon(pixmap)
 
         # Action pour ouvrir le dossier du modpack
         open_folder_action = QAction(str(translations.tr("modpack_item.context_menu.open_folder")), self)
         open_folder_action.setIcon(emoji_icon("📁"))
-        open_folder_action.triggered.connect(self.open_modpack_folder)
+        open_folder_action.triggered.connect(lambda: open_modpack_folder(modpack_data, self))
         context_menu.addAction(open_folder_action)
-        
+
         # Action pour vérifier les mises à jour
         check_update_action = QAction(str(translations.tr("modpack_item.context_menu.check_updates")), self)
         check_update_action.setIcon(emoji_icon("🔄"))
-        check_update_action.triggered.connect(self.trigger_update_check)
+        check_update_action.triggered.connect(lambda: self.update_check_requested.emit(modpack_data))
         context_menu.addAction(check_update_action)
-        
+
         # Action pour afficher les informations du modpack
         info_action = QAction(str(translations.tr("modpack_item.context_menu.show_info")), self)
         info_action.setIcon(emoji_icon("ℹ️"))
-        info_action.triggered.connect(self.show_modpack_info)
+        info_action.triggered.connect(lambda: self.info_requested.emit(modpack_data))
         context_menu.addAction(info_action)
-        
-        # Ouvrir le menu à côté du bouton info
-        if position is None:
-            btn_pos = self.info_btn.mapToGlobal(self.info_btn.rect().bottomRight())
-            context_menu.exec_(btn_pos)
-        else:
-            context_menu.exec_(self.mapToGlobal(position))
-    
-    def open_modpack_folder(self):
-        """Ouvre le dossier du modpack dans l'explorateur de fichiers."""
-        try:
-            minecraft_dir = get_minecraft_directory()
-            modpack_dir = os.path.join(minecraft_dir, "modpacks", self.modpack_data['name'])
-            
-            if os.path.exists(modpack_dir):
-                # Ouvrir le dossier dans l'explorateur de fichiers
-                if sys.platform == "win32":
-                    os.startfile(modpack_dir)
-                elif sys.platform == "darwin":  # macOS
-                    subprocess.run(["open", modpack_dir])
-                else:  # Linux
-                    subprocess.run(["xdg-open", modpack_dir])
-            else:
-                QMessageBox.information(
-                    self, 
-                    str(translations.tr("modpack_item.folder.not_found_title")), 
-                    str(translations.tr("modpack_item.folder.not_found_message", name=self.modpack_data['name'])) + "\n\n" + 
-                    str(translations.tr("modpack_item.folder.expected_path", path=modpack_dir))
-                )
-        except Exception as e:
-            QMessageBox.critical(
-                self, 
-                str(translations.tr("modpack_item.folder.error_title")), 
-                str(translations.tr("modpack_item.folder.error_message", error=str(e)))
-            )
-    
-    def trigger_update_check(self):
-        """Déclenche la vérification des mises à jour pour ce modpack."""
-        # Trouver le launcher principal en remontant la hiérarchie des widgets
-        current_widget = self
-        launcher = None
-        
-        while current_widget and not launcher:
-            if hasattr(current_widget, 'check_single_modpack_update'):
-                launcher = current_widget
-                break
-            current_widget = current_widget.parent()
-        
-        if launcher:
-            launcher.check_single_modpack_update(self.modpack_data)
-        else:
-            # Fallback : essayer de trouver le launcher via la liste des modpacks
-            try:
-                # Chercher dans la liste des modpacks pour trouver le launcher
-                list_widget = self.parent()
-                if list_widget and hasattr(list_widget, 'parent'):
-                    main_window = list_widget.parent()
-                    if main_window and hasattr(main_window, 'check_single_modpack_update'):
-                        main_window.check_single_modpack_update(self.modpack_data)
-                    else:
-                        print("Impossible de trouver le launcher principal pour la vérification des mises à jour")
-            except Exception as e:
-                print(f"Erreur lors de la vérification des mises à jour : {e}")
-    
-    def show_modpack_info(self):
-        """Demande à la fenêtre principale d'afficher l'overlay d'informations du modpack."""
-        main_window = self.window()
-        if hasattr(main_window, 'show_modpack_info_with_data'):
-            main_window.show_modpack_info_with_data(self.modpack_data)
-
-class AnimatedListWidget(QListWidget):
-    """Enhanced list widget with hover effects and animations."""
-    
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setMouseTracking(True)
-        self.hovered_item = None
-        self.animations = {}
-        
-    def enterEvent(self, event):
-        """Handle mouse enter."""
-        super().enterEvent(event)
-        
-    def leaveEvent(self, event):
-        """Handle mouse leave."""
-        super().leaveEvent(event)
-        self.hovered_item = None
-        
-    def mouseMoveEvent(self, event):
-        """Handle mouse movement for hover effects."""
-        super().mouseMoveEvent(event)
-        item = self.itemAt(event.pos())
-        if item != self.hovered_item:
-            self.hovered_item = item
-            self.update()
+
+        context_menu.exec_(position)
 
 class LoadingScreen(QWidget):
+    first_painted = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._painted = False
         layout = QVBoxLayout(self)
         layout.setAlignment(Qt.AlignCenter)
         layout.setSpacing(18)
@@ -344,23 +498,30 @@ class LoadingScreen(QWidget):
         self.tip_timer.timeout.connect(self.show_random_tip)
         self.tip_timer.start(4000)
 
-        # Animation de progression fluide
-        self.progress_value = 0
-        self.progress_timer = QTimer(self)
-        self.progress_timer.timeout.connect(self.update_progress)
-        self.progress_timer.start(30)
+        # Progression pilotée par les tâches réelles du démarrage (voir StartupReadiness)
+        self.progress_animation = QPropertyAnimation(self.progress, b"value")
+        self.progress_animation.setDuration(200)
+        self.progress_animation.setEasingCurve(QEasingCurve.OutCubic)
 
     def show_random_tip(self):
         self.tip_label.setText(random.choice(self.tips))
 
-    def update_progress(self):
-        if self.progress_value < 100:
-            self.progress_value += 1
-            self.progress.setValue(self.progress_value)
-        else:
-            self.progress_timer.stop()
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
+
+    def set_progress(self, value):
+        """Anime la barre jusqu'à la progression réelle (0-100)."""
+        value = max(self.progress.value(), min(100, value))
+        self.progress_animation.stop()
+        self.progress_animation.setStartValue(self.progress.value())
+        self.progress_animation.setEndValue(value)
+        self.progress_animation.start()
 
-    # Optionnel : expose une méthode pour finir le chargement
     def finish(self):
+        self.progress_animation.stop()
         self.progress.setValue(100)
-        self.progress_timer.stop() 
\ No newline at end of file
+        self.tip_timer.stop()
+        self.cat_movie.stop()
\ No newline at end of file
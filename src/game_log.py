@@ -0,0 +1,158 @@
+import os
+import re
+import threading
+from collections import deque
+
+from .utils import SAVE_DIR
+
+GAME_LOG_DIR = os.path.join(SAVE_DIR, "game_logs")
+
+# Marqueurs du log du jeu délimitant les phases du démarrage (Forge)
+LAUNCH_MARKERS = [
+    ("mod_construction", re.compile(r"ModLauncher running|Launching target '?fmlclient|Loading \d+ mods|Constructing mods")),
+    ("resource_reload", re.compile(r"Reloading ResourceManager")),
+    ("main_menu", re.compile(r"Forge mod loading complete|Sound engine started")),
+]
+
+OOM_PATTERN = re.compile(r"java\.lang\.OutOfMemoryError(?::\s*(.*))?")
+CRASH_REPORT_PATTERN = re.compile(r"(?:Crash report saved to:\s*(?:#@!@#\s*)?|This crash report has been saved to:\s*)(.+?\.txt)")
+FATAL_PATTERN = re.compile(r"/FATAL\]|Game crashed!|Exception in thread \"main\"")
+
+class GameLogRingBuffer:
+    """
+    Journal du jeu sur disque avec rotation (taille bornée) et les dernières lignes en mémoire.
+    """
+
+    def __init__(self, name, max_bytes=5 * 1024 * 1024, backup_count=3, memory_lines=400):
+        os.makedirs(GAME_LOG_DIR, exist_ok=True)
+        safe_name = re.sub(r'[^\w.-]+', '_', name)
+        self.path = os.path.join(GAME_LOG_DIR, f"{safe_name}.log")
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.lines = deque(maxlen=memory_lines)
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+        self._pending = 0
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._size = 0
+
+    def write(self, line):
+        with self._lock:
+            self.lines.append(line)
+            if self._file is None:
+                return
+            data = line if line.endswith('\n') else line + '\n'
+            try:
+                if self._size + len(data) > self.max_bytes:
+                    self._rotate()
+                self._file.write(data)
+                self._size += len(data)
+                self._pending += 1
+                if self._pending >= 50:
+                    self._file.flush()
+                    self._pending = 0
+            except OSError as e:
+                # Disque plein...: on garde les dernières lignes en mémoire, sans fichier
+                print(f"Écriture du journal du jeu désactivée ({self.path}): {e}")
+                try:
+                    self._file.close()
+                except OSError:
+                    pass
+                self._file = None
+
+    def tail(self, count=40):
+        """Retourne les dernières lignes gardées en mémoire."""
+        with self._lock:
+            return list(self.lines)[-count:]
+
+    def close(self):
+        with self._lock:
+            if self._file is not None and not self._file.closed:
+                self._file.close()
+
+class GameLogParser:
+    """Analyse le log du jeu ligne par ligne et produit des événements (phase, oom, crash)."""
+
+    def __init__(self):
+        self.phases_seen = set()
+        self.crash_report = None
+        self.oom = False
+        self.fatal = False
+
+    def feed(self, line):
+        """Retourne la liste des événements (type, valeur) détectés dans la ligne."""
+        events = []
+        for name, pattern in LAUNCH_MARKERS:
+            if name not in self.phases_seen and pattern.search(line):
+                self.phases_seen.add(name)
+                events.append(("phase", name))
+
+        match = OOM_PATTERN.search(line)
+        if match and not self.oom:
+            self.oom = True
+            events.append(("oom", (match.group(1) or "Java heap space").strip()))
+
+        match = CRASH_REPORT_PATTERN.search(line)
+        if match and not self.crash_report:
+            self.crash_report = match.group(1).strip()
+            events.append(("crash_report", self.crash_report))
+        elif FATAL_PATTERN.search(line):
+            self.fatal = True
+        return events
+
+class GameLogStreamer:
+    """
+    Lit la sortie du processus du jeu dans un thread dédié, l'écrit dans le ring buffer
+    et transmet les événements détectés au callback.
+    """
+
+    def __init__(self, process, name, on_event=None):
+        self.process = process
+        self.buffer = GameLogRingBuffer(name)
+        self.parser = GameLogParser()
+        self.on_event = on_event
+        # Vrai une fois le crash signalé à l'interface (pendant la partie ou à sa fin)
+        self.crash_reported = False
+        self._thread = threading.Thread(target=self._read, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _read(self):
+        # Le tube doit être vidé jusqu'au bout quoi qu'il arrive: plein, il bloquerait le jeu
+        buffer_ok = True
+        try:
+            for line in self.process.stdout:
+                line = line.rstrip('\r\n')
+                if buffer_ok:
+                    try:
+                        self.buffer.write(line)
+                    except Exception as e:
+                        buffer_ok = False
+                        print(f"Journal du jeu désactivé: {e}")
+                try:
+                    for event in self.parser.feed(line):
+                        if self.on_event:
+                            self.on_event(*event)
+                except Exception as e:
+                    print(f"Erreur lors du traitement du log du jeu: {e}")
+        except (OSError, ValueError) as e:
+            print(f"Lecture du log du jeu interrompue: {e}")
+        finally:
+            self.buffer.close()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def tail(self, count=40):
+        return self.buffer.tail(count)
@@ -0,0 +1,113 @@
+"""
+Profil du temps d'import au démarrage (équivalent de `python -X importtime`).
+
+Usage:
+    python -m src.import_profile [--top 25] [--runs 3]
+
+Importe `src.launcher_core` dans un interpréteur neuf avec `-X importtime`, agrège les
+temps par module et ajoute le résultat à SAVE_DIR/benchmarks/import_profile.json pour
+suivre l'évolution du démarrage à froid.
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+from datetime import datetime
+from statistics import median
+
+from .utils import SAVE_DIR
+
+BENCHMARK_DIR = os.path.join(SAVE_DIR, "benchmarks")
+IMPORT_PROFILE_FILE = os.path.join(BENCHMARK_DIR, "import_profile.json")
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_MODULE = "src.launcher_core"
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def load_json_file(path, fallback=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return fallback
+
+def save_json_file(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+def parse_importtime(output):
+    """
+    Analyse la sortie de `-X importtime`.
+    Retourne {module: {"self_us", "cumulative_us", "depth"}} et le total (µs) des imports de premier niveau.
+    """
+    modules = {}
+    total_us = 0
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        depth = (len(indent) - 1) // 2
+        modules[name] = {"self_us": self_us, "cumulative_us": cumulative_us, "depth": depth}
+        if depth == 0:
+            total_us += cumulative_us
+    return modules, total_us
+
+def profile_imports(entry_module=ENTRY_MODULE):
+    """Importe le module d'entrée dans un nouvel interpréteur et retourne le profil parsé."""
+    code = f"import sys; sys.path.insert(0, 'src'); import {entry_module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("\n".join(errors[-10:]) or f"code de sortie {result.returncode}")
+    return parse_importtime(result.stderr)
+
+def top_modules(modules, count=25, key="cumulative_us"):
+    """Retourne les `count` modules les plus coûteux."""
+    return sorted(modules.items(), key=lambda item: item[1][key], reverse=True)[:count]
+
+def record_profile(total_us, modules, top=25):
+    """Ajoute un profil (total + modules les plus coûteux) à l'historique et retourne l'entrée."""
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        "entry_module": ENTRY_MODULE,
+        "total_ms": round(total_us / 1000, 1),
+        "module_count": len(modules),
+        "top": {name: round(info["cumulative_us"] / 1000, 1) for name, info in top_modules(modules, top)},
+    }
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    history = load_json_file(IMPORT_PROFILE_FILE, [])
+    history.append(entry)
+    save_json_file(IMPORT_PROFILE_FILE, history)
+    return entry, history
+
+def print_report(entry, modules, history, top=25, window=5):
+    previous = [r["total_ms"] for r in history if r["timestamp"] != entry["timestamp"]][-window:]
+    line = f"\nImports au démarrage: {entry['total_ms']:.1f} ms ({entry['module_count']} modules)"
+    if previous:
+        baseline = median(previous)
+        line += f"   (médiane précédente {baseline:.1f} ms, {(entry['total_ms'] - baseline) / baseline:+.0%})"
+    print(line)
+    print(f"  {'cumulé (ms)':>12} {'propre (ms)':>12}  module")
+    for name, info in top_modules(modules, top):
+        print(f"  {info['cumulative_us'] / 1000:12.1f} {info['self_us'] / 1000:12.1f}  {'  ' * info['depth']}{name}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure le temps d'import du launcher au démarrage.")
+    parser.add_argument("--top", type=int, default=25, help="Nombre de modules affichés")
+    parser.add_argument("--runs", type=int, default=1, help="Nombre de mesures (la plus rapide est gardée)")
+    args = parser.parse_args(argv)
+
+    runs = [profile_imports() for _ in range(max(1, args.runs))]
+    modules, total_us = min(runs, key=lambda run: run[1])
+    entry, history = record_profile(total_us, modules, args.top)
+    print_report(entry, modules, history, args.top)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
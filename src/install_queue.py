@@ -0,0 +1,143 @@
+"""
+File d'attente des installations et mises à jour de modpacks.
+
+Chaque demande (installation, mise à jour acceptée) devient un job identifié par le nom du
+modpack: une demande déjà en attente ou en cours n'est pas dupliquée. Un nombre limité de
+workers (`install_workers`, 1 par défaut) traite la file, ce qui évite de télécharger et
+d'extraire tous les modpacks en même temps. La file est enregistrée dans
+SAVE_DIR/install_queue.json: un job interrompu par la fermeture du launcher y reste et
+reprend au démarrage suivant (depuis le début; la version en place n'a pas été touchée,
+voir staging.py).
+"""
+import os
+import json
+import time
+import threading
+
+from .utils import SAVE_DIR
+
+INSTALL_QUEUE_FILE = os.path.join(SAVE_DIR, "install_queue.json")
+DEFAULT_INSTALL_WORKERS = 1
+MAX_INSTALL_WORKERS = 4
+
+def load_json_file(path, fallback=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return fallback
+
+def save_json_file(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+class InstallQueue:
+    """
+    File persistante de jobs `{"key", "modpack", "minecraft_dir", "queued_at"}`.
+    `run_job(job)` est appelé dans un thread worker; le job quitte la file quand il se termine,
+    qu'il ait réussi ou non.
+    """
+
+    def __init__(self, run_job, max_workers=DEFAULT_INSTALL_WORKERS, path=INSTALL_QUEUE_FILE):
+        self.run_job = run_job
+        self.path = path
+        self.max_workers = self._clamp(max_workers)
+        self._jobs = []
+        self._running = set()
+        self._workers = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clamp(value):
+        try:
+            return max(1, min(MAX_INSTALL_WORKERS, int(value)))
+        except (TypeError, ValueError):
+            return DEFAULT_INSTALL_WORKERS
+
+    def enqueue(self, modpack_data, minecraft_dir):
+        """
+        Ajoute l'installation de `modpack_data` à la file. Retourne sa position (1: prochain job),
+        ou None si ce modpack est déjà en cours d'installation.
+        """
+        key = modpack_data['name']
+        with self._lock:
+            if key in self._running:
+                return None
+            for position, job in enumerate(self._pending(), 1):
+                if job["key"] == key:
+                    # Même modpack déjà en attente: on garde sa place, avec les données les plus récentes
+                    job["modpack"] = modpack_data
+                    job["minecraft_dir"] = minecraft_dir
+                    self._save()
+                    return position
+            self._jobs.append({"key": key, "modpack": modpack_data, "minecraft_dir": minecraft_dir, "queued_at": time.time()})
+            self._save()
+            position = len(self._pending())
+        self._spawn_workers()
+        return position
+
+    def resume(self):
+        """Relance les jobs restés dans le fichier (launcher fermé pendant une installation). Retourne leur nombre."""
+        with self._lock:
+            known = {job["key"] for job in self._jobs}
+            saved = load_json_file(self.path, fallback=[])
+            for job in saved if isinstance(saved, list) else []:
+                if isinstance(job, dict) and job.get("key") and job.get("modpack") and job["key"] not in known:
+                    self._jobs.append(job)
+                    known.add(job["key"])
+            count = len(self._pending())
+        if count:
+            print(f"Reprise de {count} installation(s) interrompue(s)")
+            self._spawn_workers()
+        return count
+
+    def set_max_workers(self, value):
+        with self._lock:
+            self.max_workers = self._clamp(value)
+        self._spawn_workers()
+
+    def _pending(self):
+        """Jobs en attente, dans l'ordre (verrou tenu)."""
+        return [job for job in self._jobs if job["key"] not in self._running]
+
+    def _save(self):
+        """Enregistre la file (verrou tenu)."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            save_json_file(self.path, self._jobs)
+        except OSError as e:
+            print(f"Erreur lors de l'enregistrement de la file d'installation : {e}")
+
+    def _spawn_workers(self):
+        with self._lock:
+            missing = min(self.max_workers - self._workers, len(self._pending()))
+            self._workers += max(0, missing)
+        for _ in range(missing):
+            threading.Thread(target=self._worker, name="install-worker", daemon=True).start()
+
+    def _next_job(self):
+        """Réserve le prochain job, ou libère ce worker s'il n'y a plus rien à faire (ou trop de workers)."""
+        with self._lock:
+            pending = self._pending()
+            if not pending or self._workers > self.max_workers:
+                self._workers -= 1
+                return None
+            job = pending[0]
+            self._running.add(job["key"])
+            return job
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                self.run_job(job)
+            except Exception as e:
+                print(f"Job d'installation '{job['key']}' échoué: {e}")
+            finally:
+                with self._lock:
+                    self._running.discard(job["key"])
+                    if job in self._jobs:
+                        self._jobs.remove(job)
+                    self._save()
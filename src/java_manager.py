@@ -0,0 +1,326 @@
+import os
+import re
+import sys
+import glob
+import json
+import shutil
+import threading
+import functools
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from .utils import SAVE_DIR
+
+JAVA_CACHE_FILE = os.path.join(SAVE_DIR, "java_runtimes.json")
+# Attente max d'un scan en cours quand le cache n'a pas le Java requis
+SCAN_WAIT_TIMEOUT = 10
+
+def run_in_thread(fn):
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        thread = threading.Thread(target=fn, args=(self, *args), kwargs=kwargs, daemon=True)
+        thread.start()
+        return thread
+    return wrapper
+
+def load_json_file(path, fallback=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return fallback
+
+def save_json_file(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+def parse_java_major(version_string):
+    """
+    Extrait la version majeure d'une chaîne de version Java.
+    "1.8.0_382" -> 8, "17.0.2" -> 17, "21" -> 21.
+    """
+    if not version_string:
+        return None
+    match = re.match(r'(\d+)(?:\.(\d+))?', str(version_string).strip().strip('"'))
+    if not match:
+        return None
+    major = int(match.group(1))
+    if major == 1 and match.group(2):
+        return int(match.group(2))
+    return major
+
+def required_java_major(modpack):
+    """
+    Retourne la version majeure de Java requise par un modpack.
+    Utilise 'java_version' du catalogue, sinon la déduit de la version de Minecraft.
+    """
+    declared = parse_java_major(modpack.get('java_version'))
+    if declared:
+        return declared
+
+    parts = [int(p) for p in re.findall(r'\d+', str(modpack.get('version', '')))[:3]]
+    if len(parts) < 2:
+        return None
+    minor = parts[1]
+    patch = parts[2] if len(parts) > 2 else 0
+    if minor <= 16:
+        return 8
+    if minor == 17:
+        return 16
+    if minor < 20 or (minor == 20 and patch < 5):
+        return 17
+    return 21
+
+def _java_binary_names():
+    if sys.platform == "win32":
+        return ["javaw.exe", "java.exe"]
+    return ["java"]
+
+def _candidate_homes():
+    """Liste des dossiers susceptibles de contenir un runtime Java (patterns glob)."""
+    home = os.path.expanduser("~")
+    patterns = []
+
+    java_home = os.environ.get("JAVA_HOME")
+    if java_home:
+        patterns.append(java_home)
+
+    if sys.platform == "win32":
+        for root in filter(None, [os.environ.get("ProgramFiles"), os.environ.get("ProgramFiles(x86)"), os.environ.get("ProgramW6432")]):
+            for vendor in ["Java", "Eclipse Adoptium", "Eclipse Foundation", "AdoptOpenJDK", "Zulu", "Microsoft",
+                           "BellSoft", "Amazon Corretto", "Semeru", "GraalVM"]:
+                patterns.append(os.path.join(root, vendor, "*"))
+        appdata = os.environ.get("APPDATA", os.path.join(home, "AppData", "Roaming"))
+        patterns.append(os.path.join(appdata, ".minecraft", "runtime", "*", "*", "*"))
+        local_appdata = os.environ.get("LOCALAPPDATA", os.path.join(home, "AppData", "Local"))
+        patterns.append(os.path.join(local_appdata, "Packages", "Microsoft.4297127D64EC6_8wekyb3d8bbwe",
+                                     "LocalCache", "Local", "runtime", "*", "*", "*"))
+    elif sys.platform == "darwin":
+        patterns.append("/Library/Java/JavaVirtualMachines/*/Contents/Home")
+        patterns.append(os.path.join(home, "Library", "Java", "JavaVirtualMachines", "*", "Contents", "Home"))
+        patterns.append(os.path.join(home, "Library", "Application Support", "minecraft", "runtime", "*", "*", "*", "jre.bundle", "Contents", "Home"))
+    else:
+        patterns += ["/usr/lib/jvm/*", "/usr/lib64/jvm/*", "/usr/java/*", "/opt/java/*", "/opt/jdk*"]
+        patterns.append(os.path.join(home, ".minecraft", "runtime", "*", "*", "*"))
+
+    patterns.append(os.path.join(home, ".sdkman", "candidates", "java", "*"))
+    patterns.append(os.path.join(home, ".jdks", "*"))
+    return patterns
+
+def _find_binary_in_home(java_home):
+    for name in _java_binary_names():
+        candidate = os.path.join(java_home, "bin", name)
+        if os.path.isfile(candidate):
+            return os.path.normpath(candidate)
+    return None
+
+def _home_from_binary(java_bin):
+    return os.path.dirname(os.path.dirname(os.path.realpath(java_bin)))
+
+def _read_release_file(java_home):
+    """Lit le fichier 'release' d'un JDK/JRE (aucun processus lancé)."""
+    release_path = os.path.join(java_home, "release")
+    if not os.path.isfile(release_path):
+        return None
+    values = {}
+    try:
+        with open(release_path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                if '=' in line:
+                    key, value = line.split('=', 1)
+                    values[key.strip()] = value.strip().strip('"')
+    except OSError:
+        return None
+    if 'JAVA_VERSION' not in values:
+        return None
+    return {
+        'version': values['JAVA_VERSION'],
+        'vendor': values.get('IMPLEMENTOR', ''),
+        'arch': values.get('OS_ARCH', '')
+    }
+
+def _run_version_probe(java_bin):
+    """Exécute 'java -XshowSettings:properties -version' pour les runtimes sans fichier 'release'."""
+    probe_bin = java_bin
+    if sys.platform == "win32" and probe_bin.lower().endswith("javaw.exe"):
+        console_bin = probe_bin[:-len("javaw.exe")] + "java.exe"
+        if os.path.isfile(console_bin):
+            probe_bin = console_bin
+    flags = 0x08000000 if sys.platform == "win32" else 0  # CREATE_NO_WINDOW
+    try:
+        result = subprocess.run(
+            [probe_bin, "-XshowSettings:properties", "-version"],
+            capture_output=True, text=True, timeout=10, creationflags=flags
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Impossible d'interroger {java_bin}: {e}")
+        return None
+    output = result.stderr + result.stdout
+    properties = dict(re.findall(r'^\s*([\w.]+) = (.*)$', output, re.MULTILINE))
+    version = properties.get('java.version')
+    if not version:
+        match = re.search(r'version "([^"]+)"', output)
+        version = match.group(1) if match else None
+    if not version:
+        return None
+    return {
+        'version': version,
+        'vendor': properties.get('java.vendor', ''),
+        'arch': properties.get('os.arch', '')
+    }
+
+def probe_java_runtime(java_bin):
+    """Retourne les informations (version, major, vendor, arch) d'un binaire Java."""
+    info = _read_release_file(_home_from_binary(java_bin)) or _run_version_probe(java_bin)
+    if not info:
+        return None
+    info['major'] = parse_java_major(info['version'])
+    info['path'] = java_bin
+    info['is_64bit'] = any(token in info.get('arch', '').lower() for token in ("64", "aarch64"))
+    return info
+
+class JavaRuntimeRegistry:
+    """Découvre les runtimes Java installés et met en cache leur version, vendeur et architecture."""
+
+    def __init__(self, cache_file=JAVA_CACHE_FILE):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._runtimes = {}
+        # Levé quand aucun scan n'est en cours
+        self._scan_done = threading.Event()
+        self._scan_done.set()
+        self._load_cache()
+
+    def _load_cache(self):
+        cached = load_json_file(self.cache_file, {})
+        if isinstance(cached, dict):
+            self._runtimes = {path: info for path, info in cached.get('runtimes', {}).items() if isinstance(info, dict)}
+
+    def _save_cache(self):
+        try:
+            save_json_file(self.cache_file, {'runtimes': self._runtimes})
+        except OSError as e:
+            print(f"Impossible de sauvegarder le cache Java: {e}")
+
+    def _discover_binaries(self, extra_paths=()):
+        def expand(pattern):
+            return [path for path in glob.glob(pattern) if os.path.isdir(path)]
+
+        patterns = _candidate_homes()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            homes = [home for result in executor.map(expand, patterns) for home in result]
+
+        binaries = set()
+        for java_home in homes:
+            java_bin = _find_binary_in_home(java_home)
+            if java_bin:
+                binaries.add(java_bin)
+
+        for name in _java_binary_names():
+            on_path = shutil.which(name)
+            if on_path:
+                java_bin = _find_binary_in_home(_home_from_binary(on_path))
+                binaries.add(java_bin or os.path.normpath(on_path))
+
+        for path in extra_paths:
+            if path and os.path.isfile(path):
+                binaries.add(os.path.normpath(path))
+        return binaries
+
+    def _inspect(self, java_bin):
+        """Retourne l'entrée du cache si le binaire n'a pas changé, sinon le sonde."""
+        try:
+            mtime = os.path.getmtime(java_bin)
+        except OSError:
+            return None
+        cached = self._runtimes.get(java_bin)
+        if cached and cached.get('mtime') == mtime:
+            return cached
+        info = probe_java_runtime(java_bin)
+        if info:
+            info['mtime'] = mtime
+        return info
+
+    def scan(self, extra_paths=()):
+        """Scanne les emplacements connus en parallèle et met à jour le cache."""
+        self._scan_done.clear()
+        try:
+            binaries = self._discover_binaries(extra_paths)
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(self._inspect, sorted(binaries)))
+            runtimes = {info['path']: info for info in results if info and info.get('major')}
+            with self._lock:
+                self._runtimes = runtimes
+            self._save_cache()
+            summary = ', '.join(f"{info['major']} ({path})" for path, info in runtimes.items())
+            print(f"Runtimes Java détectés: {summary or 'aucun'}")
+        except Exception as e:
+            print(f"Erreur lors de la détection des runtimes Java: {e}")
+        finally:
+            self._scan_done.set()
+        return self.get_runtimes()
+
+    @run_in_thread
+    def scan_in_background(self, extra_paths=()):
+        """Lance le scan dans un thread pour ne jamais bloquer le lancement."""
+        self.scan(extra_paths)
+
+    def get_runtimes(self):
+        """Retourne la liste des runtimes connus (depuis le cache, sans sonder)."""
+        with self._lock:
+            return list(self._runtimes.values())
+
+    def get_runtime_info(self, java_bin):
+        """Retourne les informations en cache pour un binaire, ou None s'il est inconnu."""
+        if not java_bin:
+            return None
+        with self._lock:
+            return self._runtimes.get(os.path.normpath(java_bin))
+
+    def find_runtime(self, major):
+        """Retourne le meilleur runtime pour une version majeure (64 bits et plus récent en priorité)."""
+        candidates = [r for r in self.get_runtimes() if r.get('major') == major]
+        if not candidates:
+            return None
+
+        def sort_key(runtime):
+            numbers = tuple(int(n) for n in re.findall(r'\d+', runtime.get('version', '')))
+            return (runtime.get('is_64bit', False), numbers)
+        return max(candidates, key=sort_key)
+
+    def resolve_java_for_modpack(self, modpack, config):
+        """
+        Choisit l'exécutable Java pour un modpack à partir du cache (en attendant brièvement
+        un scan en cours si le cache n'a pas la bonne version).
+        Priorité: chemin forcé pour ce modpack, chemin global s'il a la bonne version,
+        runtime détecté de la bonne version, puis chemin global ou défaut système.
+        """
+        default_bin = "javaw.exe" if sys.platform == "win32" else "java"
+        pack_override = config.get("java_paths", {}).get(modpack.get('name'))
+        if pack_override:
+            return pack_override
+
+        global_path = config.get("java_path")
+        required = required_java_major(modpack)
+        if not required:
+            return global_path or default_bin
+
+        if global_path:
+            info = self.get_runtime_info(global_path)
+            if info is None or info.get('major') == required:
+                return global_path
+
+        runtime = self.find_runtime(required)
+        if runtime is None and not self._scan_done.is_set():
+            # Premier lancement: le cache est vide tant que le scan du démarrage n'est pas fini
+            print(f"Attente de la détection des runtimes Java (Java {required} requis)...")
+            self._scan_done.wait(SCAN_WAIT_TIMEOUT)
+            runtime = self.find_runtime(required)
+        if runtime:
+            return runtime['path']
+
+        print(f"ATTENTION: Aucun Java {required} détecté pour '{modpack.get('name')}', utilisation de {global_path or default_bin}.")
+        return global_path or default_bin
+
+# Instance globale du registre des runtimes Java
+java_registry = JavaRuntimeRegistry()
@@ -0,0 +1,167 @@
+import os
+import math
+
+from .utils import extract_mb_from_string, lazy_import
+
+psutil = lazy_import("psutil")
+
+DEFAULT_JVM_PROFILE = "balanced"
+
+# Profils JVM sélectionnables par modpack.
+# heap_per_mod_mb: mémoire estimée par mod, heap_share: part max de la RAM totale,
+# xms_ratio: rapport -Xms/-Xmx, gc_threads_ratio: part des cœurs donnés au GC.
+JVM_PROFILES = {
+    "low-mem": {
+        "min_heap_gb": 2,
+        "heap_per_mod_mb": 12,
+        "heap_share": 0.4,
+        "xms_ratio": 0.25,
+        "gc_threads_ratio": 0.25,
+        "pause_target_ms": 100,
+    },
+    "balanced": {
+        "min_heap_gb": 3,
+        "heap_per_mod_mb": 20,
+        "heap_share": 0.6,
+        "xms_ratio": 0.5,
+        "gc_threads_ratio": 0.5,
+        "pause_target_ms": 200,
+    },
+    "throughput": {
+        "min_heap_gb": 4,
+        "heap_per_mod_mb": 28,
+        "heap_share": 0.75,
+        "xms_ratio": 1.0,
+        "gc_threads_ratio": 0.75,
+        "pause_target_ms": 200,
+    },
+}
+
+# Au-delà de ces seuils un modpack Forge est considéré comme "gros" (flags Aikar)
+BIG_PACK_MOD_COUNT = 100
+BIG_PACK_SIZE_MB = 500
+OS_RESERVED_GB = 2
+
+def get_available_profiles():
+    """Retourne les noms des profils JVM disponibles."""
+    return list(JVM_PROFILES.keys())
+
+def get_machine_resources():
+    """Retourne la RAM totale/libre (Go) et le nombre de cœurs logiques."""
+    try:
+        memory = psutil.virtual_memory()
+        total_gb = memory.total / (1024 ** 3)
+        free_gb = memory.available / (1024 ** 3)
+    except Exception:
+        total_gb, free_gb = 8, 4
+    cores = psutil.cpu_count(logical=True) or os.cpu_count() or 2
+    return {"total_gb": total_gb, "free_gb": free_gb, "cores": cores}
+
+def get_modpack_footprint(modpack, modpack_dir=None):
+    """Retourne le nombre de mods installés et la taille estimée du modpack (Mo)."""
+    mod_count = 0
+    if modpack_dir:
+        mods_dir = os.path.join(modpack_dir, "mods")
+        try:
+            mod_count = sum(1 for entry in os.scandir(mods_dir) if entry.name.endswith(".jar"))
+        except OSError:
+            mod_count = 0
+    return {"mod_count": mod_count, "size_mb": extract_mb_from_string(modpack.get("estimated_mb", 200))}
+
+def resolve_profile_name(modpack, config):
+    """Choix du profil: config par modpack > catalogue > config globale > défaut."""
+    candidates = [
+        config.get("jvm_profiles", {}).get(modpack.get("name")),
+        modpack.get("jvm_profile"),
+        config.get("jvm_profile"),
+    ]
+    for name in candidates:
+        if name in JVM_PROFILES:
+            return name
+    return DEFAULT_JVM_PROFILE
+
+def compute_heap_gb(profile, resources, footprint, max_memory_gb=None):
+    """
+    Calcule -Xmx (Go). La RAM choisie par l'utilisateur (`max_memory_gb`, réglage « RAM Max »)
+    est utilisée telle quelle; sinon elle est estimée à partir de la taille du modpack,
+    sans dépasser la part de RAM du profil.
+    """
+    if max_memory_gb:
+        return max(1, int(max_memory_gb))
+    needed_gb = profile["min_heap_gb"] + (footprint["mod_count"] * profile["heap_per_mod_mb"] + footprint["size_mb"] * 0.5) / 1024
+    ceiling_gb = min(resources["total_gb"] * profile["heap_share"], resources["total_gb"] - OS_RESERVED_GB)
+    # Arrondi au Go le plus proche, mais jamais au-dessus du plafond
+    return max(1, min(round(min(needed_gb, ceiling_gb)), math.floor(ceiling_gb)))
+
+def _flag_name(arg):
+    """'-XX:+UseG1GC' -> 'UseG1GC', '-XX:G1ReservePercent=20' -> 'G1ReservePercent'."""
+    return arg[len("-XX:"):].split("=", 1)[0].lstrip("+-")
+
+def _g1_args(profile_name, profile, heap_gb, big_pack):
+    """Flags G1. Pour les gros modpacks, reprend les flags d'Aikar."""
+    args = ["-XX:+UseG1GC", "-XX:+ParallelRefProcEnabled", f"-XX:MaxGCPauseMillis={profile['pause_target_ms']}",
+            "-XX:+UnlockExperimentalVMOptions", "-XX:+DisableExplicitGC"]
+    if big_pack:
+        large_heap = heap_gb >= 12
+        args += [
+            f"-XX:G1NewSizePercent={40 if large_heap else 30}",
+            f"-XX:G1MaxNewSizePercent={50 if large_heap else 40}",
+            f"-XX:G1HeapRegionSize={16 if large_heap else 8}M",
+            f"-XX:G1ReservePercent={15 if large_heap else 20}",
+            "-XX:G1HeapWastePercent=5",
+            "-XX:G1MixedGCCountTarget=4",
+            f"-XX:InitiatingHeapOccupancyPercent={20 if large_heap else 15}",
+            "-XX:G1MixedGCLiveThresholdPercent=90",
+            "-XX:G1RSetUpdatingPauseTimePercent=5",
+            "-XX:SurvivorRatio=32",
+            "-XX:+PerfDisableSharedMem",
+            "-XX:MaxTenuringThreshold=1",
+        ]
+    else:
+        args += [
+            f"-XX:G1HeapRegionSize={4 if heap_gb < 4 else 8}M",
+            "-XX:G1NewSizePercent=20",
+            "-XX:G1ReservePercent=20",
+        ]
+    if profile_name == "low-mem":
+        args.append("-XX:+UseStringDeduplication")
+    return args
+
+def build_jvm_args(profile_name, java_major, resources, footprint, max_memory_gb=None):
+    """Construit les arguments JVM (heap, GC, threads) pour un profil donné."""
+    profile = JVM_PROFILES.get(profile_name, JVM_PROFILES[DEFAULT_JVM_PROFILE])
+    heap_gb = compute_heap_gb(profile, resources, footprint, max_memory_gb)
+    xms_mb = max(512, int(heap_gb * 1024 * profile["xms_ratio"]))
+    big_pack = footprint["mod_count"] >= BIG_PACK_MOD_COUNT or footprint["size_mb"] >= BIG_PACK_SIZE_MB
+
+    args = [f"-Xmx{heap_gb}G", f"-Xms{xms_mb}M"]
+
+    if profile_name == "throughput" and (java_major or 8) >= 21 and heap_gb >= 8:
+        args += ["-XX:+UseZGC", "-XX:+ZGenerational"]
+    else:
+        args += _g1_args(profile_name, profile, heap_gb, big_pack)
+
+    if profile["xms_ratio"] >= 1.0 and resources["free_gb"] > heap_gb + 1:
+        args.append("-XX:+AlwaysPreTouch")
+
+    parallel_threads = max(1, int(resources["cores"] * profile["gc_threads_ratio"]))
+    args.append(f"-XX:ParallelGCThreads={parallel_threads}")
+    args.append(f"-XX:ConcGCThreads={max(1, parallel_threads // 4)}")
+    return args
+
+def merge_with_user_args(profile_args, user_args):
+    """Les arguments saisis par l'utilisateur sont prioritaires sur ceux du profil."""
+    user_sets_heap = any(a.startswith(("-Xmx", "-Xms")) for a in user_args)
+    user_sets_gc = any(a.startswith("-XX:+Use") and a.endswith("GC") for a in user_args)
+    user_flags = {_flag_name(a) for a in user_args if a.startswith("-XX:")}
+
+    merged = []
+    for arg in profile_args:
+        if user_sets_heap and arg.startswith(("-Xmx", "-Xms")):
+            continue
+        if user_sets_gc and arg.startswith(("-XX:+UseG1GC", "-XX:+UseZGC", "-XX:+ZGenerational", "-XX:G1")):
+            continue
+        if arg.startswith("-XX:") and _flag_name(arg) in user_flags:
+            continue
+        merged.append(arg)
+    return merged + user_args
@@ -0,0 +1,219 @@
+"""
+Benchmark du temps de lancement d'un modpack (du clic sur "Jouer" au menu principal).
+
+Usage:
+    python -m src.launch_benchmark --modpack "Nom du modpack" [--runs 3]
+    python -m src.launch_benchmark --modpack "Nom du modpack" --stub-jvm   # CI, sans lancer le jeu
+
+Le jeu est arrêté dès que le menu principal est atteint. Les résultats sont ajoutés à
+SAVE_DIR/benchmarks/launch_benchmarks.json et comparés aux exécutions précédentes.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from datetime import datetime
+from statistics import median
+
+from .utils import SAVE_DIR, CONFIG_FILE, get_minecraft_directory, install_forge_if_needed
+from .game_log import GameLogParser
+
+BENCHMARK_DIR = os.path.join(SAVE_DIR, "benchmarks")
+BENCHMARK_FILE = os.path.join(BENCHMARK_DIR, "launch_benchmarks.json")
+REGRESSION_THRESHOLD = 0.10
+
+PHASES = ["command_build", "jvm_start", "mod_construction", "resource_reload", "total"]
+
+# Faux JVM pour la CI: imprime les mêmes marqueurs que Forge avec des délais fixes
+STUB_JVM_SCRIPT = """
+import time
+for delay, line in [
+    (0.2, "[main/INFO] [cp.mo.mo.Launcher/MODLAUNCHER]: ModLauncher running: args [--launchTarget, fmlclient]"),
+    (0.5, "[main/INFO] [ne.mi.fm.lo.LoadingModList/]: Loading 200 mods"),
+    (0.5, "[Render thread/INFO] [minecraft/SimpleReloadableResourceManager]: Reloading ResourceManager: Default, Mod Resources"),
+    (0.5, "[Render thread/INFO] [minecraft/SoundEngine]: Sound engine started"),
+]:
+    time.sleep(delay)
+    print(line, flush=True)
+time.sleep(60)
+"""
+
+OFFLINE_AUTH_DATA = {
+    "access_token": "0",
+    "profile": {"name": "Benchmark", "id": "00000000000000000000000000000000"}
+}
+
+def load_json_file(path, fallback=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return fallback
+
+def save_json_file(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+
+class LaunchBenchmark:
+    """Lance un modpack, suit son log et mesure la durée de chaque phase du démarrage."""
+
+    def __init__(self, modpack_manager, modpack, config, stub_jvm=False, timeout=900):
+        self.modpack_manager = modpack_manager
+        self.modpack = modpack
+        self.config = config
+        self.stub_jvm = stub_jvm
+        self.timeout = timeout
+
+    def _prepare(self):
+        """Installe Forge si besoin (hors mesure: ce n'est pas le chemin d'un lancement normal)."""
+        install_forge_if_needed(self.modpack['version'], self.modpack['forge_version'], get_minecraft_directory())
+
+    def _build_command(self):
+        """
+        Construit la vraie commande de lancement (Java, profil JVM, classpath...).
+        Avec --stub-jvm, seul l'exécutable Java est remplacé par le faux JVM.
+        """
+        command, cwd = self.modpack_manager.build_launch_command(self.modpack, OFFLINE_AUTH_DATA, self.config)
+        if self.stub_jvm:
+            # Les arguments JVM et de jeu suivent le script et se retrouvent dans son sys.argv
+            command = [sys.executable, "-u", "-c", STUB_JVM_SCRIPT] + list(command[1:])
+            if not os.path.isdir(cwd):
+                cwd = os.getcwd()
+        return command, cwd
+
+    def run(self):
+        """Exécute un lancement et retourne le dictionnaire des timings (secondes)."""
+        self._prepare()
+        marks = {"start": time.perf_counter()}
+        command, cwd = self._build_command()
+        marks["command_built"] = time.perf_counter()
+
+        process = subprocess.Popen(
+            command, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding='utf-8', errors='replace', bufsize=1
+        )
+        marks["spawned"] = time.perf_counter()
+        reached_menu = threading.Event()
+        parser = GameLogParser()
+
+        def watch_output():
+            for line in process.stdout:
+                now = time.perf_counter()
+                marks.setdefault("first_output", now)
+                for kind, value in parser.feed(line):
+                    if kind == "phase":
+                        marks[value] = now
+                if "main_menu" in marks:
+                    reached_menu.set()
+                    return
+
+        watcher = threading.Thread(target=watch_output, daemon=True)
+        watcher.start()
+        finished = reached_menu.wait(self.timeout)
+        self._stop(process)
+
+        if not finished:
+            raise TimeoutError(f"Menu principal non atteint après {self.timeout} s (code de sortie: {process.poll()})")
+        return self._phases(marks)
+
+    def _stop(self, process):
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def _phases(self, marks):
+        first_output = marks.get("first_output", marks["spawned"])
+        mods_start = marks.get("mod_construction", first_output)
+        reload_start = marks.get("resource_reload", marks["main_menu"])
+        return {
+            "command_build": marks["command_built"] - marks["start"],
+            "jvm_start": mods_start - marks["spawned"],
+            "mod_construction": reload_start - mods_start,
+            "resource_reload": marks["main_menu"] - reload_start,
+            "total": marks["main_menu"] - marks["start"],
+        }
+
+def load_results():
+    """Charge l'historique des benchmarks."""
+    return load_json_file(BENCHMARK_FILE, [])
+
+def record_result(modpack, config, phases, stub_jvm=False):
+    """Ajoute une exécution à l'historique et retourne l'entrée enregistrée."""
+    from .jvm_tuning import resolve_profile_name
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        "modpack": modpack["name"],
+        "stub_jvm": stub_jvm,
+        "jvm_profile": resolve_profile_name(modpack, config),
+        "java_args": config.get("java_args", ""),
+        "phases": {name: round(value, 3) for name, value in phases.items()},
+    }
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    results = load_results()
+    results.append(entry)
+    save_json_file(BENCHMARK_FILE, results)
+    return entry
+
+def compare_with_history(entry, history, window=5):
+    """
+    Compare une exécution à la médiane des exécutions précédentes du même modpack.
+    Retourne {phase: (baseline, valeur, variation relative)}.
+    """
+    previous = [r for r in history if r["timestamp"] != entry["timestamp"] and r["modpack"] == entry["modpack"]
+                and r.get("stub_jvm") == entry.get("stub_jvm")][-window:]
+    comparison = {}
+    for phase in PHASES:
+        values = [r["phases"][phase] for r in previous if phase in r.get("phases", {})]
+        if not values:
+            continue
+        baseline = median(values)
+        current = entry["phases"][phase]
+        comparison[phase] = (baseline, current, (current - baseline) / baseline if baseline else 0.0)
+    return comparison
+
+def print_report(entry, comparison):
+    print(f"\nBenchmark '{entry['modpack']}' (profil JVM: {entry['jvm_profile']})")
+    for phase in PHASES:
+        line = f"  {phase:<18} {entry['phases'][phase]:8.2f} s"
+        if phase in comparison:
+            baseline, _, delta = comparison[phase]
+            flag = "  <-- RÉGRESSION" if delta > REGRESSION_THRESHOLD else ""
+            line += f"   (médiane précédente {baseline:.2f} s, {delta:+.0%}){flag}"
+        print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesure le temps de lancement d'un modpack.")
+    parser.add_argument("--modpack", required=True, help="Nom du modpack (tel que dans le catalogue)")
+    parser.add_argument("--runs", type=int, default=1, help="Nombre de lancements")
+    parser.add_argument("--stub-jvm", action="store_true", help="Utilise un faux JVM (CI)")
+    parser.add_argument("--timeout", type=int, default=900, help="Délai max par lancement (s)")
+    args = parser.parse_args(argv)
+
+    from .java_manager import java_registry
+    from .modpack_manager import ModpackManager
+    config = load_json_file(CONFIG_FILE, {})
+    java_registry.scan(extra_paths=[config.get("java_path")])
+    modpack_manager = ModpackManager(config, None, None)
+    modpacks = modpack_manager.load_modpacks()
+    modpack = next((m for m in modpacks if m["name"] == args.modpack), None)
+    if not modpack:
+        print(f"Modpack '{args.modpack}' introuvable dans le catalogue.")
+        return 1
+
+    regressions = False
+    for _ in range(args.runs):
+        phases = LaunchBenchmark(modpack_manager, modpack, config, stub_jvm=args.stub_jvm, timeout=args.timeout).run()
+        entry = record_result(modpack, config, phases, stub_jvm=args.stub_jvm)
+        comparison = compare_with_history(entry, load_results())
+        print_report(entry, comparison)
+        regressions |= comparison.get("total", (0, 0, 0))[2] > REGRESSION_THRESHOLD
+    return 2 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,20 +7,25 @@ import random
 import ctypes
 import sys
 import subprocess
-from PyQt5.QtCore import Qt, pyqtSignal, QObject, QPropertyAnimation, QTimer, QPoint
-from PyQt5.QtGui import QIcon, QFontMetrics
+from PyQt5.QtCore import Qt, pyqtSignal, QObject, QPropertyAnimation, QTimer, QPoint, QUrl, QEvent
+from PyQt5.QtGui import QIcon, QFontMetrics, QDesktopServices
 from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QMessageBox, QApplication,QGraphicsOpacityEffect
-from pyqttoast import Toast, ToastPreset, ToastPosition
 
 from .translation_manager import translations
-from .custom_widgets import ParticleSystem
+from .custom_widgets import ParticleSystem, LazyTabPage
+from .particles import FrameClock
 from .auth_manager import AuthManager
 from .modpack_manager import ModpackManager
-from .stats_manager import StatsManager
+from .stats_manager import StatsManager, StatsViewModel
+from .achievements import AchievementEngine
 from .config_manager import ConfigManager
-from .ui_components import UIComponents, BannerToast
+from .ui_components import UIComponents, BannerToast, ToastPreset
 from .launcher_updater import LauncherUpdateManager, is_git_repo
+from .update_scheduler import UpdateScheduler
+from .transfers import transfer_scheduler
 from .utils import SAVE_DIR
+from .startup_readiness import StartupReadiness
+from .tracing import tracer, span, traced
 
 def run_in_thread(fn):
     @functools.wraps(fn)
@@ -40,33 +45,54 @@ class WorkerSignals(QObject):
     updates_found = pyqtSignal(list)
     installation_finished = pyqtSignal()
     modpack_list_refreshed = pyqtSignal(list)
+    modpack_checking = pyqtSignal(str, bool)
     error_dialog = pyqtSignal(str, str)
     single_update_found = pyqtSignal(dict)  # Nouveau signal pour les updates individuels
     launcher_update_found = pyqtSignal(dict)
+    game_phase = pyqtSignal(str)
+    game_oom = pyqtSignal(str)
+    game_crashed = pyqtSignal(str, str)
+    task_done = pyqtSignal(str)
+    game_running = pyqtSignal(bool)
 
 class MinecraftLauncher(QMainWindow):
     """Main launcher class using modular components."""
     
+    @traced("launcher.__init__")
     def __init__(self):
         super().__init__()
         os.makedirs(SAVE_DIR, exist_ok=True)
 
         self.signals = WorkerSignals()
+        self.readiness = StartupReadiness(parent=self)
         self.config_manager = ConfigManager()
-        self.auth_manager = AuthManager(self.config_manager.get_config(), self.signals)
-        self.stats_manager = StatsManager()
-        self.modpack_manager = ModpackManager(self.config_manager.get_config(), self.signals, self.stats_manager)
-        self.ui_components = UIComponents(self.config_manager)
-        self.launcher_repo_url = "https://github.com/quentin452/CatzLauncher"
-        self.launcher_version = self.config_manager.get_current_launcher_version()
-        self.launcher_updater = LauncherUpdateManager(self.launcher_repo_url, current_version=self.launcher_version)
-        self.launcher_update_thread = None
-
-        self._setup_ui()
-        self.main_tab, self.main_ui_elements = self.ui_components.create_main_tab()
-        self.config_tab, self.config_ui_elements = self.ui_components.create_config_tab()
-        self.stats_tab, self.stats_labels = self.ui_components.create_stats_tab()
-        self.success_tab = self.ui_components.create_success_tab()
+        self.readiness.complete("config")
+        with span("launcher.managers"):
+            self.auth_manager = AuthManager(self.config_manager.get_config(), self.signals)
+            self.stats_manager = StatsManager()
+            self.stats_view = StatsViewModel(self.stats_manager, self)
+            self.achievements = AchievementEngine(self.stats_manager, parent=self)
+            self.modpack_manager = ModpackManager(self.config_manager.get_config(), self.signals, self.stats_manager)
+            self.ui_components = UIComponents(self.config_manager)
+            self.launcher_repo_url = "https://github.com/quentin452/CatzLauncher"
+            self.launcher_version = self.config_manager.get_current_launcher_version()
+            self.launcher_updater = LauncherUpdateManager(self.launcher_repo_url, current_version=self.launcher_version)
+            self.launcher_update_thread = None
+            self.update_scheduler = UpdateScheduler(
+                self.modpack_manager, self.launcher_updater, self.signals,
+                self.config_manager.get_config, check_launcher=not is_git_repo()
+            )
+
+        with span("launcher.setup_ui"):
+            self._setup_ui()
+        with span("launcher.main_tab"):
+            self.main_tab, self.main_ui_elements = self.ui_components.create_main_tab()
+        # Les onglets secondaires sont construits au premier affichage
+        self.config_ui_elements = None
+        self.stats_labels = {}
+        self.config_tab = LazyTabPage(self._build_config_tab)
+        self.stats_tab = LazyTabPage(self._build_stats_tab)
+        self.success_tab = LazyTabPage(self._build_success_tab)
         self.tabs = self.ui_components.create_main_content_widget(self.main_tab, self.config_tab, self.stats_tab, self.success_tab)
         self.stats_tab_index = 1  # Jouer = 0, Statistiques = 1, Config = 2
         self.stacked_widget.addWidget(self.tabs)
@@ -75,21 +101,53 @@ class MinecraftLauncher(QMainWindow):
 
         QTimer.singleShot(100, lambda: self.show_toast("", "", ToastPreset.INFORMATION))
 
-        QTimer.singleShot(3000, self.show_main_content)
+        self.readiness.progress.connect(self.loading_screen.set_progress)
+        self.loading_screen.first_painted.connect(lambda: self.readiness.complete("first_paint"))
+        self.readiness.ready.connect(self.show_main_content)
+        self.readiness.finished.connect(tracer.finish)
+        self.signals.task_done.connect(self.readiness.complete)
+        self.signals.login_complete.connect(lambda _: self.readiness.complete("auth"))
+        self.signals.login_error.connect(lambda _: self.readiness.complete("auth"))
+
+        # Le réseau (catalogue, connexion, mises à jour) démarre après le premier affichage
+        QTimer.singleShot(0, self._start_background_tasks)
 
+        self.fade_animation.start()
+
+    def _start_background_tasks(self):
+        """Démarre les tâches réseau une fois la fenêtre affichée."""
         self.modpack_manager.refresh_modpack_list()
-        self.auth_manager.try_refresh_login()
-        
+        if not self.auth_manager.try_refresh_login():
+            self.readiness.complete("auth")
+
         if not is_git_repo() and self.config_manager.get_config().get("auto_check_launcher_updates", True):
             self.check_launcher_updates(trigger_modpack_check_if_up_to_date=True)
         elif self.config_manager.get_config().get("auto_check_updates", True):
             self.modpack_manager.check_modpack_updates()
-        
-        self.fade_animation.start()
+        # Vérifications suivantes en arrière-plan, espacées tant que rien ne change
+        self.update_scheduler.start()
+        # Installations interrompues par la fermeture précédente du launcher
+        self.modpack_manager.resume_installations()
 
         if not self.auth_manager.get_client_id():
             self.show_client_id_error()
 
+    def _build_config_tab(self):
+        """Construit l'onglet Configuration (au premier affichage)."""
+        tab, self.config_ui_elements = self.ui_components.create_config_tab()
+        self.config_ui_elements['browse_java_btn'].clicked.connect(self.browse_java)
+        self.config_ui_elements['save_settings_btn'].clicked.connect(self.save_settings)
+        return tab
+
+    def _build_stats_tab(self):
+        """Construit l'onglet Statistiques (au premier affichage)."""
+        tab, self.stats_labels = self.ui_components.create_stats_tab(self.stats_view)
+        return tab
+
+    def _build_success_tab(self):
+        """Construit l'onglet Succès (au premier affichage)."""
+        return self.ui_components.create_success_tab(self.stats_view, parent_launcher=self)
+
     def _setup_ui(self):
         # Create central widget with gradient background
         central_widget = QWidget()
@@ -105,9 +163,9 @@ class MinecraftLauncher(QMainWindow):
         main_layout.addWidget(self.header)
         
         # QStackedWidget for switching between loading and main content
-        loading_widget = self.ui_components.create_loading_widget()
+        self.loading_screen = self.ui_components.create_loading_widget()
         self.stacked_widget = self.ui_components.setup_stacked_widget(
-            loading_widget,
+            self.loading_screen,
             None
         )
         main_layout.addWidget(self.stacked_widget)
@@ -140,10 +198,10 @@ class MinecraftLauncher(QMainWindow):
         # Button clicks
         self.main_ui_elements['play_btn'].clicked.connect(self.launch_game)
         self.main_ui_elements['check_updates_btn'].clicked.connect(self.manual_check_updates)
-        self.config_ui_elements['browse_java_btn'].clicked.connect(self.browse_java)
-        self.config_ui_elements['save_settings_btn'].clicked.connect(self.save_settings)
         self.main_ui_elements['login_btn'].clicked.connect(self.microsoft_login)
         self.main_ui_elements['logout_btn'].clicked.connect(self.logout)
+        self.main_ui_elements['modpack_list'].update_check_requested.connect(self.check_single_modpack_update)
+        self.main_ui_elements['modpack_list'].info_requested.connect(self.show_modpack_info_with_data)
 
         # Window controls
         self.minimize_btn.clicked.connect(self.showMinimized)
@@ -156,29 +214,42 @@ class MinecraftLauncher(QMainWindow):
         self.signals.account_info.connect(self.main_ui_elements['account_info_label'].setText)
         self.signals.login_complete.connect(self.handle_login_complete)
         self.signals.login_error.connect(self.handle_login_error)
+        self.signals.updates_found.connect(self.update_scheduler.remember_notified)
         self.signals.updates_found.connect(self.prompt_for_updates)
         self.signals.installation_finished.connect(self.refresh_modpack_list)
         self.signals.modpack_list_refreshed.connect(self.update_modpack_list_ui)
+        self.signals.modpack_checking.connect(self.main_ui_elements['modpack_list'].set_checking)
         self.signals.single_update_found.connect(self.handle_single_update_found)
+        self.signals.launcher_update_found.connect(self.update_scheduler.remember_launcher_update)
         self.signals.launcher_update_found.connect(self.prompt_launcher_update)
+        self.signals.game_phase.connect(self.handle_game_phase)
+        self.signals.game_oom.connect(self.handle_game_oom)
+        self.signals.game_crashed.connect(self.handle_game_crashed)
+        self.signals.game_running.connect(FrameClock.instance().set_game_running)
+        self.signals.game_running.connect(transfer_scheduler.set_game_running)
+        self.achievements.unlocked.connect(self.notify_successes)
 
     def _apply_styles(self):
         """Apply styles to the application."""
         self.config_manager.apply_styles(self)
 
     def show_main_content(self):
-        # Create opacity effect for the tabs for a smooth fade-in
-        tabs_opacity_effect = QGraphicsOpacityEffect(self.tabs)
-        self.tabs.setGraphicsEffect(tabs_opacity_effect)
-
-        # Animation to fade in tabs widget
-        self.tabs_fade_in = QPropertyAnimation(tabs_opacity_effect, b"opacity")
-        self.tabs_fade_in.setDuration(500)
-        self.tabs_fade_in.setStartValue(0)
-        self.tabs_fade_in.setEndValue(1)
-        
+        if self.stacked_widget.currentWidget() is self.tabs:
+            return
+        self.loading_screen.finish()
+        if FrameClock.instance().transitions_enabled():
+            # Create opacity effect for the tabs for a smooth fade-in
+            tabs_opacity_effect = QGraphicsOpacityEffect(self.tabs)
+            self.tabs.setGraphicsEffect(tabs_opacity_effect)
+
+            # Animation to fade in tabs widget
+            self.tabs_fade_in = QPropertyAnimation(tabs_opacity_effect, b"opacity")
+            self.tabs_fade_in.setDuration(500)
+            self.tabs_fade_in.setStartValue(0)
+            self.tabs_fade_in.setEndValue(1)
+            self.tabs_fade_in.start()
+
         self.stacked_widget.setCurrentWidget(self.tabs)
-        self.tabs_fade_in.start()
 
         # Vérification des mises à jour unifiée - seulement si la vérification du launcher n'est pas activée
         if not self.config_manager.get_config().get("auto_check_launcher_updates", True) and self.config_manager.get_config().get("auto_check_updates", True):
@@ -209,7 +280,7 @@ class MinecraftLauncher(QMainWindow):
         self.main_ui_elements['login_btn'].setEnabled(True)
         self.auth_manager.handle_login_complete(profile, self)
         self.update_login_button_states()
-        self.stats_manager.update_avatar(profile['name'], self.main_ui_elements['avatar_label'])
+        self.stats_manager.update_avatar(profile['name'], self.main_ui_elements['avatar_label'], uuid=profile.get('id'))
         self.stats_manager.update_stats_on_login()
         self.show_toast(
             str(translations.tr("notifications.login_title")),
@@ -242,6 +313,7 @@ class MinecraftLauncher(QMainWindow):
     def save_settings(self):
         """Save settings."""
         self.config_manager.save_settings(self, self.config_ui_elements)
+        self.modpack_manager.install_queue.set_max_workers(self.config_manager.get_config().get("install_workers"))
         self._apply_styles()
         self.show_toast(
             str(translations.tr("notifications.config_title")),
@@ -255,16 +327,11 @@ class MinecraftLauncher(QMainWindow):
 
     def launch_game(self):
         """Launch the selected modpack."""
-        selected_item = self.main_ui_elements['modpack_list'].currentItem()
-        if not selected_item:
+        modpack_list = self.main_ui_elements['modpack_list']
+        if not modpack_list.currentIndex().isValid():
             self.show_toast("Erreur", str(translations.tr("errors.select_modpack")), ToastPreset.WARNING)
             return
-        # Get the custom widget from the selected item
-        widget = self.main_ui_elements['modpack_list'].itemWidget(selected_item)
-        if not widget:
-            self.show_toast("Erreur", str(translations.tr("errors.modpack_data_error")), ToastPreset.ERROR)
-            return
-        modpack = widget.modpack_data
+        modpack = modpack_list.current_modpack()
         if not modpack:
             self.show_toast("Erreur", str(translations.tr("errors.modpack_not_found")), ToastPreset.ERROR)
             return
@@ -277,41 +344,6 @@ class MinecraftLauncher(QMainWindow):
         )
         if success:
             self.stats_manager.update_launch_stat()
-            self.refresh_stats_labels()
-            # Succès : premier lancement
-            self.stats_manager.unlock_success("first_launch", "Premier lancement", "Lancer Minecraft pour la première fois")
-            # Succès : 10 sessions
-            stats = self.stats_manager._read_stats()
-            if stats.get('launch_count', 0) >= 10:
-                self.stats_manager.unlock_success("10_sessions", "10 sessions", "Jouer 10 sessions différentes")
-            # Succès : 10h de jeu
-            if stats.get('playtime', 0) >= 36000:
-                self.stats_manager.unlock_success("10h_play", "10 heures de jeu", "Atteindre 10 heures de jeu cumulées")
-            # Succès streaks
-            streak_actuel, best_streak = self.stats_manager.get_streaks()
-            if best_streak >= 3:
-                self.stats_manager.unlock_success("3_streak", "3 jours de streak", "Jouer 3 jours d'affilée")
-            if best_streak >= 7:
-                self.stats_manager.unlock_success("7_streak", "7 jours de streak", "Jouer 7 jours d'affilée")
-            # Succès : jouer un 1er janvier
-            from datetime import datetime
-            now = datetime.now()
-            if now.month == 1 and now.day == 1:
-                self.stats_manager.unlock_success("new_year", "Jour de l'an", "Jouer un 1er janvier")
-            # Notification pour chaque succès débloqué
-            for sid in ["first_launch", "10_sessions", "10h_play", "3_streak", "7_streak", "new_year"]:
-                unlocked = [s for s in self.stats_manager.get_successes() if s['id'] == sid]
-                if unlocked and unlocked[-1].get('date'):
-                    # On notifie seulement si le succès vient d'être débloqué (date très récente)
-                    from datetime import datetime, timedelta
-                    try:
-                        date_succes = datetime.strptime(unlocked[-1]['date'], '%Y-%m-%d %H:%M')
-                        if (datetime.now() - date_succes) < timedelta(seconds=5):
-                            self.notify_success(unlocked[-1])
-                    except Exception:
-                        pass
-            # Rafraîchir l'affichage des succès en temps réel
-            self.refresh_success_tab()
             self.show_toast(
                 str(translations.tr("notifications.launch_title")),
                 str(translations.tr("notifications.launch_start", name=modpack.get('name', 'modpack'))),
@@ -324,6 +356,42 @@ class MinecraftLauncher(QMainWindow):
                 ToastPreset.ERROR
             )
 
+    def handle_game_phase(self, phase):
+        """Affiche la progression du chargement du jeu."""
+        status_keys = {
+            "mod_construction": "installation.loading_mods",
+            "resource_reload": "installation.loading_resources",
+            "main_menu": "installation.main_menu_reached",
+        }
+        if phase in status_keys:
+            self.main_ui_elements['status_label'].setText(str(translations.tr(status_keys[phase])))
+
+    def handle_game_oom(self, detail):
+        """Prévient l'utilisateur que le jeu manque de mémoire."""
+        self.show_toast(
+            str(translations.tr("installation.game_crashed_title")),
+            str(translations.tr("installation.game_oom", detail=detail)),
+            ToastPreset.WARNING
+        )
+
+    def handle_game_crashed(self, crash_report_path, log_excerpt):
+        """Affiche le diagnostic du crash dès la fin du processus du jeu."""
+        self.show_toast(
+            str(translations.tr("installation.game_crashed_title")),
+            os.path.basename(crash_report_path) or str(translations.tr("installation.game_crashed_title")),
+            ToastPreset.ERROR
+        )
+        box = QMessageBox(self)
+        box.setIcon(QMessageBox.Critical)
+        box.setWindowTitle(str(translations.tr("installation.game_crashed_title")))
+        box.setText(str(translations.tr("installation.game_crashed_message")))
+        box.setDetailedText(log_excerpt)
+        open_button = box.addButton(str(translations.tr("installation.open_crash_report")), QMessageBox.ActionRole) if crash_report_path else None
+        box.addButton(QMessageBox.Close)
+        box.exec_()
+        if open_button is not None and box.clickedButton() == open_button:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(crash_report_path))
+
     def manual_check_updates(self):
         """Manual check for updates."""
         self.main_ui_elements['check_updates_btn'].setEnabled(False)
@@ -346,7 +414,7 @@ class MinecraftLauncher(QMainWindow):
 
     def check_single_modpack_update(self, modpack_data):
         """Check updates for a single modpack."""
-        self.modpack_manager.check_single_modpack_update(modpack_data, self.main_ui_elements['modpack_list'])
+        self.modpack_manager.check_single_modpack_update(modpack_data)
 
     def prompt_for_updates(self, updates):
         """Prompt for updates."""
@@ -399,23 +467,23 @@ class MinecraftLauncher(QMainWindow):
             self.perform_launcher_update(update_info)
 
     def perform_launcher_update(self, update_info):
-        """Perform launcher update."""
-        from .launcher_updater import perform_launcher_update as do_update
-        from PyQt5.QtWidgets import QProgressDialog, QApplication
+        """Perform launcher update in a worker thread; the dialog's button cancels it."""
+        from .launcher_updater import LauncherUpdateWorker
+        from PyQt5.QtWidgets import QProgressDialog
         
         progress_dialog = QProgressDialog(str(translations.tr("launcher_updates.updating")), str(translations.tr("stats.close")), 0, 100, self)
         progress_dialog.setWindowModality(Qt.WindowModal)
         progress_dialog.setWindowTitle(str(translations.tr("launcher_updates.updating")))
-        progress_dialog.show()
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
 
-        def progress_callback(current, total):
+        worker = LauncherUpdateWorker(self.launcher_repo_url, update_info, self)
+
+        def on_progress(current, total):
             if total > 0:
                 progress_dialog.setValue(int((current / total) * 100))
-            QApplication.processEvents()
 
-        try:
-            success, result = do_update(self.launcher_repo_url, update_info, progress_callback)
-            
+        def on_complete(success, result):
             if success and result:
                 script_path = result
                 progress_dialog.setLabelText(str(translations.tr("launcher_updates.update_complete")))
@@ -423,14 +491,29 @@ class MinecraftLauncher(QMainWindow):
                 
                 QTimer.singleShot(1500, lambda: self._execute_update_script(script_path))
             else:
+                progress_dialog.close()
                 error_message = result or str(translations.tr("stats.error"))
                 QMessageBox.critical(self, str(translations.tr("errors.critical_error")), str(translations.tr("launcher_updates.update_error", error=error_message)))
-                progress_dialog.close()
 
-        except Exception as e:
-            traceback.print_exc()
-            QMessageBox.critical(self, str(translations.tr("errors.critical_error")), str(translations.tr("launcher_updates.update_unexpected_error", error=str(e))))
+        def on_error(error):
+            progress_dialog.close()
+            QMessageBox.critical(self, str(translations.tr("errors.critical_error")), str(translations.tr("launcher_updates.update_unexpected_error", error=error)))
+
+        def on_cancelled():
             progress_dialog.close()
+            self.show_toast("", str(translations.tr("launcher_updates.update_cancelled")), ToastPreset.INFORMATION)
+
+        worker.signals.progress.connect(on_progress)
+        worker.signals.status.connect(progress_dialog.setLabelText)
+        worker.signals.update_complete.connect(on_complete)
+        worker.signals.error.connect(on_error)
+        worker.signals.cancelled.connect(on_cancelled)
+        progress_dialog.canceled.connect(worker.cancel)
+        worker.finished.connect(worker.deleteLater)
+
+        self.launcher_update_worker = worker
+        progress_dialog.show()
+        worker.start()
 
     def _execute_update_script(self, script_path):
         """Execute the update script."""
@@ -494,6 +577,20 @@ class MinecraftLauncher(QMainWindow):
         self.drag_offset = None
         event.accept()
 
+    def changeEvent(self, event):
+        """Suspend animations while the window is minimized."""
+        if event.type() == QEvent.WindowStateChange:
+            FrameClock.instance().set_suspended(self.isMinimized())
+        super().changeEvent(event)
+
+    def hideEvent(self, event):
+        FrameClock.instance().set_suspended(True)
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        FrameClock.instance().set_suspended(self.isMinimized())
+        super().showEvent(event)
+
     def show_modpack_info_with_data(self, modpack_data):
         """Show modpack information."""
         self.ui_components.show_modpack_info_with_data(modpack_data, self)
@@ -518,16 +615,20 @@ class MinecraftLauncher(QMainWindow):
         self.main_ui_elements['login_btn'].setText(str(translations.tr("login.login_microsoft")))
         self.main_ui_elements['logout_btn'].setText(str(translations.tr("login.logout")))
         
-        # Config elements
+        # Config elements (l'onglet n'existe qu'après son premier affichage)
+        if self.config_ui_elements is None:
+            return
         self.config_ui_elements['browse_java_btn'].setText(str(translations.tr("config.browse")))
         self.config_ui_elements['github_token_edit'].setPlaceholderText(str(translations.tr("config.token_placeholder")))
         self.config_ui_elements['auto_check_cb'].setText(str(translations.tr("config.auto_check_updates")))
         self.config_ui_elements['auto_check_launcher_cb'].setText(str(translations.tr("config.auto_check_launcher")))
         self.config_ui_elements['save_settings_btn'].setText(str(translations.tr("config.save_config")))
-        
+        self.config_ui_elements['download_limit_spin'].setSpecialValueText(str(translations.tr("config.unlimited")))
+        self.config_ui_elements['download_limit_in_game_spin'].setSpecialValueText(str(translations.tr("config.unlimited")))
+
         # Update token status
         self.config_manager.update_token_status_label(self.config_ui_elements['token_status_label'])
-        
+
         # Re-populate selectors
         self.config_manager.populate_languages(self.config_ui_elements['language_selector'])
         self.config_manager.populate_themes(self.config_ui_elements['theme_selector'])
@@ -550,16 +651,10 @@ class MinecraftLauncher(QMainWindow):
         toast = BannerToast(self, title, text, icon_type=icon_type, duration=4000)
         toast.show() 
 
-    def refresh_stats_labels(self):
-        """Rafraîchit les labels de stats (lancements, temps de jeu) dans l'onglet stats."""
-        stats = self.stats_manager._read_stats()
-        playtime = stats.get('playtime', 0)
-        launch_count = stats.get('launch_count', 0)
-        if hasattr(self, 'stats_labels'):
-            if 'playtime' in self.stats_labels:
-                self.stats_labels['playtime'].setText(self.stats_manager.format_playtime_seconds(playtime))
-            if 'launch_count' in self.stats_labels:
-                self.stats_labels['launch_count'].setText(str(launch_count)) 
+    def notify_successes(self, successes):
+        """Notifie chaque succès qui vient d'être débloqué."""
+        for success in successes:
+            self.notify_success(success)
 
     def notify_success(self, success):
         """Affiche une notification toast et une notification système pour un succès."""
@@ -572,13 +667,4 @@ class MinecraftLauncher(QMainWindow):
             )
         except Exception:
             pass
-        self.show_toast(f"🏆 Succès débloqué !", f"{success['name']}\n{success['description']}") 
-
-    def refresh_success_tab(self):
-        """Rafraîchit le tab Succès en temps réel après reset."""
-        # On recrée le widget et on le remplace dans les tabs
-        from .ui_components import UIComponents
-        new_tab = self.ui_components.create_success_tab(parent_launcher=self)
-        self.tabs.removeTab(2)  # L'index du tab Succès (après Jouer, Stats)
-        self.tabs.insertTab(2, new_tab, "Succès")
-        self.success_tab = new_tab 
\ No newline at end of file
+        self.show_toast(f"🏆 Succès débloqué !", f"{success['name']}\n{success['description']}")
@@ -1,15 +1,36 @@
 import os
 import json
 import shutil
-import requests
 import sys
+import hashlib
 import tempfile
+import threading
+import traceback
 from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt5.QtCore import QObject, pyqtSignal, QThread
 from packaging import version as semver
-from .utils import SAVE_DIR
+from .utils import SAVE_DIR, lazy_import, _get_github_auth_headers, is_connected_to_internet
+from .transfers import transfer_scheduler, UPDATE
 import base64
-from utils import is_connected_to_internet
+
+requests = lazy_import("requests")
+
+DELTA_DOWNLOAD_WORKERS = 8
+
+def git_blob_sha(path):
+    """SHA1 d'un fichier au format des blobs git (le 'sha' renvoyé par l'API tree de GitHub)."""
+    digest = hashlib.sha1(f"blob {os.path.getsize(path)}\0".encode())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def git_blob_sha_bytes(data):
+    return hashlib.sha1(f"blob {len(data)}\0".encode() + data).hexdigest()
+
+class UpdateCancelled(Exception):
+    """La mise à jour a été annulée par l'utilisateur."""
 
 class LauncherUpdaterSignals(QObject):
     """Signals for launcher updater thread communication"""
@@ -17,6 +38,7 @@ class LauncherUpdaterSignals(QObject):
     status = pyqtSignal(str)
     update_available = pyqtSignal(dict)
     update_complete = pyqtSignal(bool, str)
+    cancelled = pyqtSignal()
     error = pyqtSignal(str)
 
 class LauncherUpdateManager:
@@ -25,10 +47,21 @@ class LauncherUpdateManager:
     def __init__(self, launcher_repo_url, current_version=None):
         self.launcher_repo_url = launcher_repo_url
         self.api_version_url = "https://api.github.com/repos/quentin452/CatzLauncher/contents/version.txt"
-        self.zip_url = f"{launcher_repo_url}/archive/refs/heads/main.zip"
+        self.branch = "main"
+        self.zip_url = f"{launcher_repo_url}/archive/refs/heads/{self.branch}.zip"
+        self.launcher_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.current_version = current_version or self._get_current_version()
         self.signals = LauncherUpdaterSignals()
         self.update_file = os.path.join(SAVE_DIR, "launcher_update_info.json")
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Demande l'arrêt de la mise à jour en cours (vérifié entre chaque fichier/bloc)."""
+        self._cancel_event.set()
+
+    def _check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise UpdateCancelled()
     
     def _get_current_version(self):
         version_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "version.txt")
@@ -48,80 +81,84 @@ class LauncherUpdateManager:
             headers = { 'Accept': 'application/vnd.github.v3+json' }
             response = requests.get(self.api_version_url, timeout=10, headers=headers)
             response.raise_for_status()
-            
-            # Decode the content from Base64
-            api_response = response.json()
-            if 'content' not in api_response:
-                raise ValueError("API response did not contain file content.")
-                
-            content_b64 = api_response['content']
-            decoded_content = base64.b64decode(content_b64).decode('utf-8')
-            remote_version_str = decoded_content.strip()
-
-            # 2. Safely parse remote version
-            try:
-                remote_version = semver.parse(remote_version_str)
-            except semver.InvalidVersion:
-                print(f"WARNING: Remote version from GitHub API is invalid: '{remote_version_str}'. Aborting.")
-                return False, None
+            return self.parse_version_response(response.json())
 
-            # 3. Safely parse local version
-            try:
-                local_version = semver.parse(self.current_version)
-            except semver.InvalidVersion:
-                print(f"WARNING: Local version is invalid: '{self.current_version}'. Defaulting to 0.0.0.")
-                local_version = semver.parse("0.0.0")
-            
-            # 4. Compare
-            if remote_version > local_version:
-                return True, {
-                    'current_version': str(local_version),
-                    'new_version': str(remote_version),
-                    'zip_url': self.zip_url
-                }
-            
+        except (requests.RequestException, ValueError, KeyError) as e:
             return False, None
 
-        except (requests.RequestException, ValueError, KeyError) as e:
+    def parse_version_response(self, api_response):
+        """Compares the version.txt returned by the GitHub contents API with the local version."""
+        # Decode the content from Base64
+        if 'content' not in api_response:
+            raise ValueError("API response did not contain file content.")
+            
+        content_b64 = api_response['content']
+        decoded_content = base64.b64decode(content_b64).decode('utf-8')
+        remote_version_str = decoded_content.strip()
+
+        # 2. Safely parse remote version
+        try:
+            remote_version = semver.parse(remote_version_str)
+        except semver.InvalidVersion:
+            print(f"WARNING: Remote version from GitHub API is invalid: '{remote_version_str}'. Aborting.")
             return False, None
+
+        # 3. Safely parse local version
+        try:
+            local_version = semver.parse(self.current_version)
+        except semver.InvalidVersion:
+            print(f"WARNING: Local version is invalid: '{self.current_version}'. Defaulting to 0.0.0.")
+            local_version = semver.parse("0.0.0")
+        
+        # 4. Compare
+        if remote_version > local_version:
+            return True, {
+                'current_version': str(local_version),
+                'new_version': str(remote_version),
+                'zip_url': self.zip_url
+            }
+        
+        return False, None
     
     def perform_update(self, update_info, progress_callback=None):
         """
-        Performs a full update by downloading, extracting the main branch zip,
-        and creating a script to perform the file operations after the app closes.
+        Télécharge uniquement les fichiers modifiés (comparaison des SHA de blobs git avec l'arbre
+        distant), puis crée le script qui les remplace après la fermeture du launcher.
+        Se rabat sur le zip complet de la branche si l'arbre distant n'est pas disponible.
         Returns (success, message) where message is the script_path on success,
         or an error string on failure.
         """
-        zip_url = update_info.get('zip_url')
-        if not zip_url:
-            return False, "L'URL de téléchargement est manquante dans les informations de mise à jour."
+        # Préparation dans le dossier du launcher (même volume): l'application au redémarrage
+        # n'est alors qu'un renommage par fichier
+        temp_dir = tempfile.mkdtemp(prefix=".catzlauncher_update_", dir=self.launcher_dir)
+        self._cancel_event.clear()
 
-        temp_dir = tempfile.mkdtemp(prefix="catzlauncher_update_")
-        
         try:
+            try:
+                self.signals.status.emit("Comparaison des fichiers...")
+                commit_sha, remote_files = self.get_remote_tree()
+            except (requests.RequestException, ValueError, KeyError) as e:
+                print(f"Mise à jour différentielle impossible ({e}), téléchargement complet.")
+                return self._perform_full_update(update_info, temp_dir, progress_callback)
+
+            changed_files = self.get_changed_files(remote_files)
+            print(f"Mise à jour: {len(changed_files)} fichier(s) modifié(s) sur {len(remote_files)}")
+
             # 1. Download
             self.signals.status.emit("Téléchargement de la mise à jour...")
-            zip_path = self.download_full_update(zip_url, temp_dir, progress_callback)
-            
-            # 2. Extract
-            self.signals.status.emit("Extraction des fichiers...")
-            extract_dir = os.path.join(temp_dir, "extracted")
-            with ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-
-            # 3. Find content directory
-            extracted_subfolders = os.listdir(extract_dir)
-            if not extracted_subfolders:
-                raise IOError("Le fichier de mise à jour (zip) est vide ou corrompu.")
-            extracted_content_dir = os.path.join(extract_dir, extracted_subfolders[0])
-            
-            # 4. Create update script
-            restart_script = self.create_update_script(extracted_content_dir, temp_dir)
-            
-            # 5. Finalize
-            self.save_local_update_info({'version': update_info['new_version']})
+            content_dir = os.path.join(temp_dir, "files")
+            self.download_changed_files(commit_sha, remote_files, changed_files, content_dir, progress_callback)
+
+            # 2. Create update script
+            restart_script = self.create_update_script(content_dir, temp_dir, files=changed_files)
+
+            # 3. Finalize
+            self.save_local_update_info({'version': update_info['new_version'], 'commit': commit_sha})
             return True, restart_script
 
+        except UpdateCancelled:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
         except (requests.RequestException, IOError) as e:
             # Catch specific, expected errors and return a user-friendly message
             shutil.rmtree(temp_dir, ignore_errors=True)
@@ -132,33 +169,158 @@ class LauncherUpdateManager:
             # Re-raise the exception to be handled by the main UI thread, which will show a traceback
             raise e
 
+    def _repo_slug(self):
+        parts = self.launcher_repo_url.rstrip('/').split('/')
+        if len(parts) < 5 or 'github.com' not in parts[2]:
+            raise ValueError(f"Dépôt GitHub invalide: {self.launcher_repo_url}")
+        return parts[3], parts[4]
+
+    def get_remote_tree(self):
+        """Retourne (sha du commit, {chemin: {"sha", "size", "mode"}}) pour la branche distante."""
+        owner, repo = self._repo_slug()
+        headers = _get_github_auth_headers()
+        response = requests.get(f"https://api.github.com/repos/{owner}/{repo}/commits/{self.branch}",
+                                headers=dict(headers, Accept='application/vnd.github.sha'), timeout=10)
+        response.raise_for_status()
+        commit_sha = response.text.strip()
+        response = requests.get(f"https://api.github.com/repos/{owner}/{repo}/git/trees/{commit_sha}?recursive=1",
+                                headers=dict(headers, Accept='application/vnd.github.v3+json'), timeout=15)
+        response.raise_for_status()
+        tree = response.json()
+        if tree.get('truncated'):
+            raise ValueError("arbre distant tronqué par l'API GitHub")
+        remote_files = {
+            entry['path']: {"sha": entry['sha'], "size": entry.get('size', 0), "mode": entry.get('mode')}
+            for entry in tree['tree']
+            # Les liens symboliques (120000) et sous-modules ne sont pas mis à jour
+            if entry.get('type') == 'blob' and entry.get('mode') != '120000'
+        }
+        return commit_sha, remote_files
+
+    def get_changed_files(self, remote_files):
+        """Chemins dont le fichier local est absent ou différent (taille puis SHA de blob)."""
+        changed = []
+        for path, info in remote_files.items():
+            local_path = os.path.join(self.launcher_dir, *path.split('/'))
+            try:
+                if os.path.getsize(local_path) == info["size"] and git_blob_sha(local_path) == info["sha"]:
+                    continue
+            except OSError:
+                pass
+            changed.append(path)
+        return sorted(changed)
+
+    def _download_file(self, owner, repo, commit_sha, path, info, content_dir, job):
+        self._check_cancelled()
+        response = requests.get(f"https://raw.githubusercontent.com/{owner}/{repo}/{commit_sha}/{path}",
+                                headers=_get_github_auth_headers(), timeout=30, stream=True)
+        response.raise_for_status()
+        content = job.read(response)
+        if git_blob_sha_bytes(content) != info["sha"]:
+            raise IOError(f"Contenu inattendu pour {path} (SHA différent)")
+        destination = os.path.join(content_dir, *path.split('/'))
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        with open(destination, 'wb') as f:
+            f.write(content)
+        if info.get("mode") == '100755' and sys.platform != 'win32':
+            os.chmod(destination, 0o755)
+        return len(content)
+
+    def download_changed_files(self, commit_sha, remote_files, paths, content_dir, progress_callback=None):
+        """Télécharge les fichiers modifiés en parallèle; la progression est rapportée depuis le thread appelant."""
+        owner, repo = self._repo_slug()
+        os.makedirs(content_dir, exist_ok=True)
+        total_size = sum(remote_files[path]["size"] for path in paths)
+        downloaded = 0
+        with transfer_scheduler.job("launcher", UPDATE, should_cancel=self._cancel_event.is_set) as job, \
+                ThreadPoolExecutor(max_workers=DELTA_DOWNLOAD_WORKERS) as executor:
+            futures = [executor.submit(self._download_file, owner, repo, commit_sha, path, remote_files[path], content_dir, job)
+                       for path in paths]
+            try:
+                for future in as_completed(futures):
+                    self._check_cancelled()
+                    downloaded += future.result()
+                    if progress_callback:
+                        progress_callback(downloaded, total_size)
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _perform_full_update(self, update_info, temp_dir, progress_callback=None):
+        """Ancienne méthode: zip complet de la branche, recopié entièrement par le script."""
+        zip_url = update_info.get('zip_url')
+        if not zip_url:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return False, "L'URL de téléchargement est manquante dans les informations de mise à jour."
+
+        # 1. Download
+        self.signals.status.emit("Téléchargement de la mise à jour...")
+        zip_path = self.download_full_update(zip_url, temp_dir, progress_callback)
+
+        # 2. Extract
+        self.signals.status.emit("Extraction des fichiers...")
+        extract_dir = os.path.join(temp_dir, "extracted")
+        with ZipFile(zip_path, 'r') as zip_ref:
+            for member in zip_ref.infolist():
+                self._check_cancelled()
+                zip_ref.extract(member, extract_dir)
+        os.remove(zip_path)
+
+        # 3. Find content directory
+        extracted_subfolders = os.listdir(extract_dir)
+        if not extracted_subfolders:
+            raise IOError("Le fichier de mise à jour (zip) est vide ou corrompu.")
+        extracted_content_dir = os.path.join(extract_dir, extracted_subfolders[0])
+
+        # 4. Create update script
+        restart_script = self.create_update_script(extracted_content_dir, temp_dir)
+
+        # 5. Finalize
+        self.save_local_update_info({'version': update_info['new_version']})
+        return True, restart_script
+
     def download_full_update(self, zip_url, temp_dir, progress_callback):
         zip_path = os.path.join(temp_dir, "launcher.zip")
         response = requests.get(zip_url, stream=True, timeout=30)
         response.raise_for_status()
         total_size = int(response.headers.get('content-length', 0))
         bytes_downloaded = 0
-        with open(zip_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
+        with transfer_scheduler.job("launcher", UPDATE, should_cancel=self._cancel_event.is_set) as job, \
+                open(zip_path, 'wb') as f:
+            for chunk in job.iter_content(response):
+                self._check_cancelled()
                 f.write(chunk)
                 bytes_downloaded += len(chunk)
                 if progress_callback:
                     progress_callback(bytes_downloaded, total_size)
         return zip_path
 
-    def create_update_script(self, new_content_dir, temp_dir_to_delete):
-        launcher_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    def create_update_script(self, new_content_dir, temp_dir_to_delete, files=None):
+        """
+        Crée le script lancé après la fermeture du launcher.
+        `files` (chemins relatifs) liste les fichiers préparés à mettre en place; par défaut tout le dossier.
+        """
+        if files is None:
+            files = [
+                os.path.relpath(os.path.join(root, name), new_content_dir).replace(os.sep, '/')
+                for root, _, names in os.walk(new_content_dir) for name in names
+            ]
+        launcher_dir = self.launcher_dir
         script_path = os.path.join(launcher_dir, "updater.py")
         python_executable = os.path.normpath(sys.executable)
         
         norm_new_content_dir = os.path.normpath(new_content_dir)
         norm_launcher_dir = os.path.normpath(launcher_dir)
         norm_temp_dir_to_delete = os.path.normpath(temp_dir_to_delete)
+        manifest_path = os.path.join(norm_temp_dir_to_delete, "update_manifest.json")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(files, f)
 
         # Create a self-contained Python script to perform the update.
         # This avoids all issues with batch files, special path characters, and shell interpretation.
         script_content = f'''# -*- coding: utf-8 -*-
-import sys, os, time, shutil, subprocess, traceback
+import sys, os, time, json, shutil, subprocess, traceback
 
 def main():
     # Create a log file immediately to trace execution.
@@ -181,9 +343,22 @@ def main():
             f.write("Waiting for launcher to close...\\n")
             time.sleep(3)
 
-            # 2. Copy
-            f.write("Copying files...\\n")
-            shutil.copytree(source_dir, target_dir, dirs_exist_ok=True)
+            # 2. Move the staged files into place (same volume: one rename per file)
+            manifest_path = r'{manifest_path}'
+            with open(manifest_path, "r", encoding="utf-8") as manifest:
+                files = json.load(manifest)
+            f.write(f"Replacing {{len(files)}} file(s)...\\n")
+            for relative_path in files:
+                source = os.path.join(source_dir, *relative_path.split("/"))
+                target = os.path.join(target_dir, *relative_path.split("/"))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                try:
+                    os.replace(source, target)
+                except OSError:
+                    # Staging on another volume: copy next to the target, then rename
+                    shutil.copy2(source, target + ".update_tmp")
+                    os.replace(target + ".update_tmp", target)
+                f.write(f"  {{relative_path}}\\n")
             f.write("Copy complete.\\n")
 
             # 3. Clean
@@ -234,6 +409,33 @@ class LauncherUpdater(QThread):
         except Exception as e:
             self.signals.error.emit(f"Update check failed: {str(e)}")
 
+class LauncherUpdateWorker(QThread):
+    """
+    Télécharge, vérifie et prépare la mise à jour hors du thread de l'interface.
+    Progression et résultat passent par les signaux du manager; `cancel()` interrompt le travail.
+    """
+
+    def __init__(self, launcher_repo_url, update_info, parent=None):
+        super().__init__(parent)
+        self.manager = LauncherUpdateManager(launcher_repo_url)
+        self.signals = self.manager.signals
+        self.update_info = update_info
+
+    def cancel(self):
+        self.manager.cancel()
+
+    def run(self):
+        try:
+            success, result = self.manager.perform_update(
+                self.update_info, lambda current, total: self.signals.progress.emit(current, total)
+            )
+            self.signals.update_complete.emit(success, result or "")
+        except UpdateCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(str(e))
+
 def check_launcher_updates(launcher_repo_url, current_version=None):
     manager = LauncherUpdateManager(launcher_repo_url, current_version)
     return manager.check_launcher_update()
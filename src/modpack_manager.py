@@ -2,20 +2,28 @@ import os
 import json
 import threading
 import functools
-import requests
 import traceback
 import time
 import subprocess
-from PyQt5.QtCore import QSize
-from PyQt5.QtWidgets import QListWidgetItem, QMessageBox
+from PyQt5.QtWidgets import QMessageBox
 
 from .utils import (
     install_modpack_files_fresh, check_update, install_forge_if_needed,
     is_modpack_installed, install_or_update_modpack_github, get_minecraft_directory,
-    is_connected_to_internet
+    is_connected_to_internet, lazy_import, discard_prepared_update, modpack_update_lock
 )
 from .translation_manager import translations
-from .custom_widgets import ModpackListItem
+from .java_manager import java_registry, required_java_major
+from .game_log import GameLogStreamer
+from .crash_indexer import crash_indexer
+from .install_queue import InstallQueue, DEFAULT_INSTALL_WORKERS
+from .tracing import traced
+from .jvm_tuning import (
+    resolve_profile_name, build_jvm_args, merge_with_user_args,
+    get_machine_resources, get_modpack_footprint
+)
+
+requests = lazy_import("requests")
 
 def run_in_thread(fn):
     @functools.wraps(fn)
@@ -39,7 +47,13 @@ class ModpackManager:
         self.config = config
         self.signals = signals
         self.stats_manager = stats_manager
+        self.game_running = False
+        self._crash_lock = threading.Lock()
+        self.install_queue = InstallQueue(self._run_install_job, config.get("install_workers", DEFAULT_INSTALL_WORKERS))
+        java_registry.scan_in_background(extra_paths=[config.get("java_path")])
+        crash_indexer.scan_in_background()
     
+    @traced("modpacks.load")
     def load_modpacks(self):
         """Load modpacks from URL or local file."""
         url = self.config.get("modpack_url", "modpacks.json")
@@ -89,44 +103,21 @@ class ModpackManager:
             self.signals.status.emit(str(translations.tr("main.ready_to_play")))
         except Exception as e:
             self.signals.status.emit(str(translations.tr("main.check_error", name="modpacks", error=str(e))))
+        finally:
+            self.signals.task_done.emit("catalogue")
 
     def update_modpack_list_ui(self, modpacks, modpack_list):
-        """Update modpack list UI with animations."""
-        modpack_list.clear()
-        for pack in modpacks:
-            # Créer un item vide
-            list_item = QListWidgetItem()
-            list_item.setSizeHint(QSize(100, 60))  
-            modpack_list.addItem(list_item)
-            
-            # Créer un widget personnalisé pour chaque modpack
-            item_widget = ModpackListItem(pack)
-            modpack_list.setItemWidget(list_item, item_widget)
-            
-            # Créer une fonction locale pour capturer correctement la variable pack
-            def create_click_handler(modpack_data):
-                def click_handler():
-                    self.check_single_modpack_update(modpack_data, modpack_list)
-                return click_handler
-            
-            # SUPPRIMER la connexion au bouton check_update_btn (il n'existe plus)
-            # item_widget.check_update_btn.clicked.connect(create_click_handler(pack))
+        """Met à jour la liste en place: seules les lignes ajoutées, retirées ou modifiées sont redessinées."""
+        modpack_list.set_modpacks(modpacks)
 
-    def check_single_modpack_update(self, modpack_data, modpack_list):
+    def check_single_modpack_update(self, modpack_data):
         """Vérifie les mises à jour pour un seul modpack."""
-        # Trouver le widget correspondant et changer son état
-        for i in range(modpack_list.count()):
-            item = modpack_list.item(i)
-            widget = modpack_list.itemWidget(item)
-            if widget and widget.modpack_data['name'] == modpack_data['name']:
-                widget.set_checking_state(True)
-                break
-        
+        self.signals.modpack_checking.emit(modpack_data['name'], True)
         # Lancer la vérification dans un thread
-        self._do_check_single_modpack_update(modpack_data, modpack_list)
+        self._do_check_single_modpack_update(modpack_data)
 
     @run_in_thread
-    def _do_check_single_modpack_update(self, modpack_data, modpack_list):
+    def _do_check_single_modpack_update(self, modpack_data):
         """Vérifie les mises à jour pour un seul modpack dans un thread."""
         try:
             self.signals.status.emit(str(translations.tr("main.checking_single", name=modpack_data['name'])))
@@ -142,54 +133,61 @@ class ModpackManager:
         except Exception as e:
             self.signals.status.emit(str(translations.tr("main.check_error", name=modpack_data['name'], error=str(e))))
         finally:
-            # Remettre le bouton dans son état normal
-            for i in range(modpack_list.count()):
-                item = modpack_list.item(i)
-                widget = modpack_list.itemWidget(item)
-                if widget and widget.modpack_data['name'] == modpack_data['name']:
-                    widget.set_checking_state(False)
-                    break
+            # Retirer l'indicateur de vérification de la ligne
+            self.signals.modpack_checking.emit(modpack_data['name'], False)
 
     def start_installation(self, modpack_data):
-        """Récupère le dossier Minecraft et lance l'installation dans un thread."""
+        """Récupère le dossier Minecraft et ajoute l'installation à la file (voir install_queue.py)."""
         minecraft_dir = get_minecraft_directory()
         if not minecraft_dir:
             self.signals.error_dialog.emit(str(translations.tr("errors.critical_error")), str(translations.tr("errors.minecraft_dir_not_found")))
             return
         
-        # Lance la méthode threadée avec le bon chemin
-        self.install_modpack(modpack_data, minecraft_dir)
+        position = self.install_queue.enqueue(modpack_data, minecraft_dir)
+        if position is None:
+            self.signals.status.emit(str(translations.tr("installation.already_installing", name=modpack_data['name'])))
+        else:
+            # Remplacé par "Installation de ..." dès qu'un worker prend le job
+            self.signals.status.emit(str(translations.tr("installation.queued", name=modpack_data['name'], position=position)))
+
+    def resume_installations(self):
+        """Reprend les installations interrompues par la fermeture du launcher."""
+        return self.install_queue.resume()
+
+    def _run_install_job(self, job):
+        self.install_modpack(job["modpack"], job["minecraft_dir"])
 
-    @run_in_thread
     def install_modpack(self, modpack_data, minecraft_directory):
-        """Installe le modpack dans un thread d'arrière-plan."""
+        """Installe le modpack (appelé par un worker de la file d'installation)."""
         try:
             self.signals.status.emit(str(translations.tr("installation.installing", name=modpack_data['name'])))
             self.signals.progress.emit(0)
 
             install_dir = os.path.join(minecraft_directory, "modpacks")
 
-            # Utiliser la nouvelle logique delta pour les modpacks GitHub
-            if 'github.com' in modpack_data["url"] and '/archive/refs/heads/' in modpack_data["url"]:
-                success = install_or_update_modpack_github(
-                    modpack_data["url"],
-                    install_dir,
-                    modpack_data["name"],
-                    modpack_data.get("estimated_mb", 200), 
-                    lambda cur, tot: self.signals.progress.emit(int(cur / tot * 100) if tot > 0 else 0)
-                )
-                
-                if not success:
-                    raise Exception(str(translations.tr("installation.installation_failed", name=modpack_data['name'])))
-            else:
-                # Installation classique pour les autres types d'URL
-                install_modpack_files_fresh(
-                    modpack_data["url"],
-                    install_dir,
-                    modpack_data["name"],
-                    modpack_data.get("estimated_mb", 200), 
-                    lambda cur, tot: self.signals.progress.emit(int(cur / tot * 100) if tot > 0 else 0)
-                )
+            # Attend une éventuelle préparation en arrière-plan du même modpack (elle sera réutilisée)
+            with modpack_update_lock(modpack_data["name"]):
+                # Utiliser la nouvelle logique delta pour les modpacks GitHub
+                if 'github.com' in modpack_data["url"] and '/archive/refs/heads/' in modpack_data["url"]:
+                    success = install_or_update_modpack_github(
+                        modpack_data["url"],
+                        install_dir,
+                        modpack_data["name"],
+                        modpack_data.get("estimated_mb", 200), 
+                        lambda cur, tot: self.signals.progress.emit(int(cur / tot * 100) if tot > 0 else 0)
+                    )
+                    
+                    if not success:
+                        raise Exception(str(translations.tr("installation.installation_failed", name=modpack_data['name'])))
+                else:
+                    # Installation classique pour les autres types d'URL
+                    install_modpack_files_fresh(
+                        modpack_data["url"],
+                        install_dir,
+                        modpack_data["name"],
+                        modpack_data.get("estimated_mb", 200), 
+                        lambda cur, tot: self.signals.progress.emit(int(cur / tot * 100) if tot > 0 else 0)
+                    )
 
             self.signals.progress.emit(100)
             self.signals.status.emit(str(translations.tr("installation.installation_complete")))
@@ -238,30 +236,27 @@ class ModpackManager:
         try:
             self.signals.status.emit(str(translations.tr("installation.preparing_launch")))
             minecraft_dir = get_minecraft_directory()
-            modpack_profile_dir = os.path.join(minecraft_dir, "modpacks", modpack["name"])
             forge_version = modpack['forge_version']
             if not os.path.exists(os.path.join(minecraft_dir, "versions", f"{modpack['version']}-forge-{forge_version}")):
                 self.signals.status.emit(str(translations.tr("installation.installing_forge", version=modpack['version'], forge_version=forge_version)))
                 install_forge_if_needed(modpack['version'], forge_version, minecraft_dir)
 
-            options = {
-                "username": auth_data['profile']['name'],
-                "uuid": auth_data['profile']['id'],
-                "token": auth_data['access_token'],
-                "executablePath": config.get("java_path") or "javaw.exe",
-                "jvmArguments": self._get_jvm_args_with_memory(config),
-                "gameDirectory": modpack_profile_dir
-            }
-
-            from minecraft_launcher_lib.command import get_minecraft_command
-            forge_launch_id = f"{modpack['version']}-forge-{modpack['forge_version']}"
-            minecraft_command = get_minecraft_command(forge_launch_id, minecraft_dir, options)
+            minecraft_command, modpack_profile_dir = self.build_launch_command(modpack, auth_data, config)
 
             self.signals.status.emit(str(translations.tr("installation.launching_minecraft")))
 
             start_time = time.time()
-            process = subprocess.Popen(minecraft_command, cwd=modpack_profile_dir)
-            
+            process = subprocess.Popen(
+                minecraft_command, cwd=modpack_profile_dir,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                text=True, encoding='utf-8', errors='replace', bufsize=1
+            )
+            log_streamer = GameLogStreamer(process, modpack["name"])
+            log_streamer.on_event = lambda kind, value: self._on_game_log_event(modpack, log_streamer, kind, value)
+            log_streamer.start()
+            self.game_running = True
+            self.signals.game_running.emit(True)
+
             def update_stats_periodically():
                 last_update_time = start_time
                 while process.poll() is None:
@@ -273,19 +268,91 @@ class ModpackManager:
             stats_thread = threading.Thread(target=update_stats_periodically, daemon=True)
             stats_thread.start()
             process.wait()
+            log_streamer.join(timeout=5)
+            self._report_game_exit(modpack, process.returncode, log_streamer)
             self.signals.status.emit(str(translations.tr("installation.ready")))
         except Exception as e:
             self.signals.status.emit(str(translations.tr("installation.launch_error")))
             print(f"Erreur de Lancement: {e}")
+        finally:
+            if self.game_running:
+                # Le jeu a écrit dans le dossier du modpack: une mise à jour préparée avant n'est plus à jour
+                discard_prepared_update(os.path.join(get_minecraft_directory(), "modpacks"), modpack["name"])
+                self.game_running = False
+                self.signals.game_running.emit(False)
+
+    def _on_game_log_event(self, modpack, log_streamer, kind, value):
+        """Relaie les événements du log du jeu vers l'interface (appelé depuis le thread de lecture)."""
+        if kind == "phase":
+            self.signals.game_phase.emit(value)
+        elif kind == "oom":
+            self.signals.game_oom.emit(value)
+        elif kind == "crash_report":
+            # Signalé dès l'écriture du rapport: Forge peut rester bloqué sans jamais quitter
+            self._report_crash(modpack, log_streamer)
+
+    def _report_game_exit(self, modpack, return_code, log_streamer):
+        """Signale un crash si le jeu a produit un rapport de crash ou s'est terminé en erreur."""
+        parser = log_streamer.parser
+        if parser.crash_report or parser.fatal or return_code not in (0, None):
+            self._report_crash(modpack, log_streamer)
+
+    def _report_crash(self, modpack, log_streamer):
+        """
+        Signale le crash une seule fois par partie. Peut être appelé depuis le thread de lecture
+        du log: l'indexation des crashs se fait dans un autre thread pour ne pas cesser de vider la sortie du jeu.
+        """
+        with self._crash_lock:
+            if log_streamer.crash_reported:
+                return
+            log_streamer.crash_reported = True
+        self._emit_crash(modpack, log_streamer.parser.crash_report or "", "\n".join(log_streamer.tail(15)))
 
-    def _get_jvm_args_with_memory(self, config):
-        """Compose JVM arguments with max memory from config."""
-        args = config.get("java_args", "").split()
-        has_xmx = any(a.startswith("-Xmx") for a in args)
-        has_xms = any(a.startswith("-Xms") for a in args)
-        if not has_xmx and not has_xms:
-            max_mem = int(config.get("max_memory", 4))
-            args.append(f"-Xmx{max_mem}G")
+    @run_in_thread
+    def _emit_crash(self, modpack, crash_report_path, excerpt):
+        """Ajoute les mods qui plantent le plus souvent à l'extrait du log, puis émet `game_crashed`."""
+        try:
+            crash_indexer.scan([modpack["name"]])
+            top_mods = crash_indexer.top_crashing_mods(days=7, modpack=modpack["name"])
+            if top_mods:
+                mods = ", ".join(f"{mod} ({count})" for mod, count in top_mods)
+                excerpt = f"{translations.tr('installation.top_crashing_mods', mods=mods)}\n\n{excerpt}"
+        except Exception as e:
+            print(f"Analyse des crashs de '{modpack['name']}' impossible: {e}")
+        self.signals.game_crashed.emit(crash_report_path, excerpt)
+
+    def build_launch_command(self, modpack, auth_data, config):
+        """Construit la commande de lancement du modpack (Forge doit déjà être installé)."""
+        from minecraft_launcher_lib.command import get_minecraft_command
+        minecraft_dir = get_minecraft_directory()
+        modpack_profile_dir = os.path.join(minecraft_dir, "modpacks", modpack["name"])
+        java_path = java_registry.resolve_java_for_modpack(modpack, config)
+        options = {
+            "username": auth_data['profile']['name'],
+            "uuid": auth_data['profile']['id'],
+            "token": auth_data['access_token'],
+            "executablePath": java_path,
+            "jvmArguments": self._get_jvm_args_with_memory(config, modpack, java_path, modpack_profile_dir),
+            "gameDirectory": modpack_profile_dir
+        }
+        forge_launch_id = f"{modpack['version']}-forge-{modpack['forge_version']}"
+        return get_minecraft_command(forge_launch_id, minecraft_dir, options), modpack_profile_dir
+
+    def _get_jvm_args_with_memory(self, config, modpack, java_path=None, modpack_dir=None):
+        """Compose JVM arguments from the pack's JVM profile, machine resources and user args."""
+        user_args = config.get("java_args", "").split()
+        runtime = java_registry.get_runtime_info(java_path)
+        java_major = runtime.get('major') if runtime else required_java_major(modpack)
+        profile_name = resolve_profile_name(modpack, config)
+        profile_args = build_jvm_args(
+            profile_name,
+            java_major,
+            get_machine_resources(),
+            get_modpack_footprint(modpack, modpack_dir),
+            max_memory_gb=int(config.get("max_memory", 0)) or None
+        )
+        args = merge_with_user_args(profile_args, user_args)
+        print(f"Profil JVM '{profile_name}' (Java {java_major}) pour '{modpack.get('name')}': {' '.join(args)}")
         return args
 
     def prompt_for_updates(self, updates, parent_widget):
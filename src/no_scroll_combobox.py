@@ -1,4 +1,4 @@
-from PyQt5.QtWidgets import QComboBox, QSlider, QApplication
+from PyQt5.QtWidgets import QComboBox, QSlider, QSpinBox, QApplication
 from PyQt5.QtCore import Qt
 
 class NoScrollComboBox(QComboBox):
@@ -17,4 +17,11 @@ class NoScrollSlider(QSlider):
         # Toujours ignorer la molette et la propager au parent (scroll vertical global)
         event.ignore()
         if self.parent():
-            QApplication.sendEvent(self.parent(), event) 
\ No newline at end of file
+            QApplication.sendEvent(self.parent(), event) 
+
+class NoScrollSpinBox(QSpinBox):
+    def wheelEvent(self, event):
+        # Même comportement que le slider: la molette fait défiler la page, pas la valeur
+        event.ignore()
+        if self.parent():
+            QApplication.sendEvent(self.parent(), event)
@@ -1,45 +1,345 @@
 import math
 import random
 import time
-from PyQt5.QtCore import QObject, QTimer, pyqtSignal, QPoint, QPropertyAnimation, QEasingCurve, Qt
+from array import array
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, QPoint, QPointF, QRectF, QPropertyAnimation, QEasingCurve, Qt, QEvent
 from PyQt5.QtWidgets import QWidget, QLabel, QPushButton
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QPixmap, QRadialGradient
 
-class Particle:
-    """Represents a single particle in the particle system."""
-    
-    def __init__(self, x, y, color=None, size=None, velocity=None, life=None):
-        self.x = x
-        self.y = y
-        self.color = color or QColor(random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
-        self.size = size or random.uniform(2, 6)
-        self.velocity_x = velocity[0] if velocity else random.uniform(-2, 2)
-        self.velocity_y = velocity[1] if velocity else random.uniform(-2, 2)
-        self.life = life or random.uniform(0.5, 2.0)
-        self.max_life = self.life
-        self.alpha = 255
-        self.gravity = 0.1
-        self.friction = 0.98
-        
-    def update(self, dt):
-        """Update particle position and life."""
-        self.x += self.velocity_x
-        self.y += self.velocity_y
-        self.velocity_y += self.gravity
-        self.velocity_x *= self.friction
-        self.velocity_y *= self.friction
-        
-        self.life -= dt
-        self.alpha = int((self.life / self.max_life) * 255)
-        
-        return self.life > 0
+MAX_FRAME_DT = 0.1
+
+# Niveaux de qualité, du plus beau au plus léger
+QUALITY_TIERS = [
+    {"name": "high", "interval_ms": 16, "particles": 1.0, "transitions": True},
+    {"name": "medium", "interval_ms": 33, "particles": 0.5, "transitions": True},
+    {"name": "low", "interval_ms": 66, "particles": 0.0, "transitions": False},
+]
+GAME_RUNNING_TIER = 2        # Niveau maximal quand un jeu lancé par le launcher tourne
+SLOW_FRAME_FACTOR = 1.5      # Une frame est lente si elle dépasse 1.5x l'intervalle visé
+BUDGET_WINDOW = 30           # Frames analysées avant de changer de niveau
+MAX_SLOW_FRAMES = 8          # Frames lentes tolérées par fenêtre avant de baisser la qualité
+RECOVERY_WINDOWS = 4         # Fenêtres sans frame lente avant de remonter d'un niveau
+
+class FrameClock(QObject):
+    """
+    Ordonnanceur d'animations partagé: un seul QTimer pour tous les widgets animés.
+    Les abonnés sont appelés avec le dt (secondes) et sont retirés quand ils retournent False.
+    Le timer est arrêté dès qu'il n'y a plus d'abonné, et suspendu quand la fenêtre est cachée.
+
+    Le temps de chaque frame est mesuré: si le budget est dépassé trop souvent, ou si un jeu
+    tourne, la qualité baisse (moins de particules, cadence réduite, plus de transitions).
+    """
+    quality_changed = pyqtSignal(str)
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self.subscribers = []
+        self.last_tick = 0.0
+        self.suspended = False
+        self.game_running = False
+        self.measured_tier = 0
+        self.tier_index = 0
+        self.frames_in_window = 0
+        self.slow_frames = 0
+        self.clean_windows = 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(QUALITY_TIERS[0]["interval_ms"])
+        self.timer.timeout.connect(self._tick)
+
+    # --- Abonnements ---
+
+    def subscribe(self, callback):
+        if callback in self.subscribers:
+            return
+        self.subscribers.append(callback)
+        self._start()
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+        if not self.subscribers:
+            self.timer.stop()
+
+    def is_running(self):
+        return self.timer.isActive()
+
+    def _start(self):
+        if self.subscribers and not self.suspended and not self.timer.isActive():
+            self.last_tick = time.perf_counter()
+            self.timer.start()
+
+    # --- Qualité ---
+
+    @property
+    def tier(self):
+        return QUALITY_TIERS[self.tier_index]
+
+    def particle_count(self, count):
+        """Nombre de particules à émettre pour le niveau courant (arrondi aléatoire)."""
+        scaled = count * self.tier["particles"]
+        whole = int(scaled)
+        return whole + (1 if random.random() < scaled - whole else 0)
+
+    def transitions_enabled(self):
+        """Les fondus et animations d'easing sont coupés au niveau le plus bas."""
+        return self.tier["transitions"]
+
+    def set_suspended(self, suspended):
+        """Suspend toutes les animations (fenêtre cachée ou réduite); les abonnés sont conservés."""
+        if suspended == self.suspended:
+            return
+        self.suspended = suspended
+        if suspended:
+            self.timer.stop()
+        else:
+            self._start()
+
+    def set_game_running(self, running):
+        """Limite la qualité pendant qu'un jeu lancé par le launcher utilise le CPU/GPU."""
+        self.game_running = running
+        self._apply_tier()
+
+    def _apply_tier(self):
+        tier_index = max(self.measured_tier, GAME_RUNNING_TIER if self.game_running else 0)
+        if tier_index == self.tier_index:
+            return
+        self.tier_index = tier_index
+        self.timer.setInterval(self.tier["interval_ms"])
+        print(f"Qualité des animations: {self.tier['name']}")
+        self.quality_changed.emit(self.tier["name"])
+
+    def _record_frame(self, frame_time):
+        """Compte les frames hors budget et ajuste le niveau mesuré par fenêtre de BUDGET_WINDOW frames."""
+        if frame_time > self.timer.interval() / 1000 * SLOW_FRAME_FACTOR:
+            self.slow_frames += 1
+        self.frames_in_window += 1
+        if self.frames_in_window < BUDGET_WINDOW:
+            return
+        if self.slow_frames > MAX_SLOW_FRAMES and self.measured_tier < len(QUALITY_TIERS) - 1:
+            self.measured_tier += 1
+            self.clean_windows = 0
+        elif self.slow_frames == 0:
+            self.clean_windows += 1
+            if self.clean_windows >= RECOVERY_WINDOWS and self.measured_tier > 0:
+                self.measured_tier -= 1
+                self.clean_windows = 0
+        else:
+            self.clean_windows = 0
+        self.frames_in_window = 0
+        self.slow_frames = 0
+        self._apply_tier()
+
+    def _tick(self):
+        now = time.perf_counter()
+        dt = now - self.last_tick
+        self.last_tick = now
+        for callback in list(self.subscribers):
+            try:
+                keep = callback(min(dt, MAX_FRAME_DT))
+            except RuntimeError:
+                # Widget Qt déjà détruit
+                keep = False
+            if not keep and callback in self.subscribers:
+                self.subscribers.remove(callback)
+        # Temps de frame = intervalle réel entre deux ticks, ou temps passé dans les abonnés s'il est plus long
+        self._record_frame(max(dt, time.perf_counter() - now))
+        if not self.subscribers:
+            self.timer.stop()
+
+class ParticleSpriteAtlas:
+    """
+    Sprites de particules pré-rendus dans un seul QPixmap, un par couple (taille, couleur) arrondi.
+    Le dégradé radial n'est dessiné qu'une fois par sprite; les particules sont ensuite copiées
+    avec drawPixmapFragments et leur opacité.
+    """
+    SIZE_STEP = 0.5        # px
+    COLOR_STEP = 32        # arrondi de chaque canal au palier le plus proche (0, 32... 224, 255)
+    MAX_SIZE = 8.0
+    COLUMNS = 32
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        # Créé à la demande: un QPixmap nécessite une QApplication
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.cell = int(math.ceil(self.MAX_SIZE * 2)) + 2
+        self.rows = 4
+        self.pixmap = self._new_pixmap(self.rows)
+        self.sprites = {}
+        self.cells = []  # (left, top) de chaque sprite dans le pixmap
+
+    def _new_pixmap(self, rows):
+        pixmap = QPixmap(self.COLUMNS * self.cell, rows * self.cell)
+        pixmap.fill(Qt.transparent)
+        return pixmap
+
+    def _grow(self):
+        """Double la hauteur de l'atlas en conservant les sprites déjà rendus."""
+        pixmap = self._new_pixmap(self.rows * 2)
+        painter = QPainter(pixmap)
+        painter.drawPixmap(0, 0, self.pixmap)
+        painter.end()
+        self.pixmap = pixmap
+        self.rows *= 2
+
+    def _quantize(self, channel):
+        """Palier de couleur le plus proche (255 reste 255: le blanc ne doit pas virer au gris)."""
+        return min(255, round(channel / self.COLOR_STEP) * self.COLOR_STEP)
+
+    def sprite_index(self, size, rgb):
+        """Retourne l'index du sprite pour une taille et une couleur (0xRRGGBB), en le rendant si besoin."""
+        size = min(self.MAX_SIZE, max(self.SIZE_STEP, round(size / self.SIZE_STEP) * self.SIZE_STEP))
+        rgb = self._quantize(rgb >> 16 & 0xFF) << 16 | self._quantize(rgb >> 8 & 0xFF) << 8 | self._quantize(rgb & 0xFF)
+        key = (size, rgb)
+        index = self.sprites.get(key)
+        if index is None:
+            index = self._render(size, rgb)
+            self.sprites[key] = index
+        return index
+
+    def _render(self, size, rgb):
+        index = len(self.cells)
+        if index >= self.COLUMNS * self.rows:
+            self._grow()
+        left = (index % self.COLUMNS) * self.cell
+        top = (index // self.COLUMNS) * self.cell
+        center_x = left + self.cell / 2
+        center_y = top + self.cell / 2
+
+        painter = QPainter(self.pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        gradient = QRadialGradient(center_x, center_y, size)
+        gradient.setColorAt(0, QColor(rgb))
+        gradient.setColorAt(1, QColor(0, 0, 0, 0))
+        painter.setBrush(QBrush(gradient))
+        painter.drawEllipse(QRectF(center_x - size, center_y - size, size * 2, size * 2))
+        painter.end()
+
+        self.cells.append((left, top))
+        return index
+
+class ParticleField:
+    """
+    Particules stockées en colonnes (struct-of-arrays) préallouées et mises à jour en lot.
+    Les particules mortes sont retirées par compaction en place: une animation stable
+    n'alloue ni liste ni objet Python par frame (pas de pauses du GC pendant les téléchargements).
+    Vitesse, gravité et friction sont exprimées par frame de `frame_rate` (cadence de l'ancien timer du widget).
+    """
+    COLUMNS = ("x", "y", "vx", "vy", "life", "max_life", "sprite")
+    TYPECODES = {"sprite": 'I'}
+
+    def __init__(self, gravity=0.1, friction=0.98, frame_rate=60, capacity=64):
+        self.gravity = gravity
+        self.friction = friction
+        self.frame_rate = frame_rate
+        self.capacity = capacity
+        self.count = 0
+        for name in self.COLUMNS:
+            setattr(self, name, array(self.TYPECODES.get(name, 'f'), [0]) * capacity)
+        # Fragments de dessin réutilisés d'une frame à l'autre (free-list)
+        self._fragments = []
+        self._spare_fragments = []
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """Double la capacité de toutes les colonnes."""
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column.extend(array(column.typecode, [0]) * self.capacity)
+        self.capacity *= 2
+
+    def emit(self, x, y, vx, vy, life, size, color):
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.life[i] = life
+        self.max_life[i] = life
+        self.sprite[i] = ParticleSpriteAtlas.instance().sprite_index(size, color.rgb() & 0xFFFFFF)
+        self.count = i + 1
+
+    def step(self, dt):
+        """Avance toutes les particules de dt secondes et retourne le nombre de particules vivantes."""
+        count = self.count
+        if not count:
+            return 0
+        frames = dt * self.frame_rate
+        drag = self.friction ** frames
+        gravity = self.gravity * frames
+        x, y, vx, vy, life, max_life, sprite = self.x, self.y, self.vx, self.vy, self.life, self.max_life, self.sprite
+        alive = 0
+        for i in range(count):
+            remaining = life[i] - dt
+            if remaining <= 0:
+                continue
+            # Compaction en place: la particule vivante i est déplacée à l'index alive
+            x[alive] = x[i] + vx[i] * frames
+            y[alive] = y[i] + vy[i] * frames
+            vx[alive] = vx[i] * drag
+            vy[alive] = (vy[i] + gravity) * drag
+            life[alive] = remaining
+            max_life[alive] = max_life[i]
+            sprite[alive] = sprite[i]
+            alive += 1
+        self.count = alive
+        return alive
+
+    def _sync_fragments(self, count, cell):
+        """Ajuste le nombre de fragments au nombre de particules sans réallouer en régime stable."""
+        fragments = self._fragments
+        while len(fragments) > count:
+            self._spare_fragments.append(fragments.pop())
+        while len(fragments) < count:
+            if self._spare_fragments:
+                fragments.append(self._spare_fragments.pop())
+            else:
+                fragments.append(QPainter.PixmapFragment.create(QPointF(0, 0), QRectF(0, 0, cell, cell)))
+        return fragments
+
+    def draw(self, painter):
+        """Dessine toutes les particules en un seul appel, l'opacité suivant la durée de vie restante."""
+        count = self.count
+        if not count:
+            return
+        atlas = ParticleSpriteAtlas.instance()
+        cells = atlas.cells
+        cell = atlas.cell
+        fragments = self._sync_fragments(count, cell)
+        x, y, life, max_life, sprite = self.x, self.y, self.life, self.max_life, self.sprite
+        for i in range(count):
+            fragment = fragments[i]
+            fragment.x = x[i]
+            fragment.y = y[i]
+            fragment.sourceLeft, fragment.sourceTop = cells[sprite[i]]
+            fragment.opacity = life[i] / max_life[i]
+        painter.drawPixmapFragments(fragments, atlas.pixmap)
 
 class ParticleSystem(QWidget):
     """A widget that displays animated particles following the mouse."""
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.particles = []
+        self.particles = ParticleField(frame_rate=30)
         self.mouse_pos = QPoint(0, 0)
         self.last_emission = 0
         self.emission_rate = 0.05  # seconds between emissions
@@ -49,11 +349,6 @@ class ParticleSystem(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setProperty("class", "particle-system")
         
-        # Animation timer
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_particles)
-        self.timer.start(33)  # ~30 FPS
-        
     def mouse_move_event(self, pos):
         """Handle mouse movement to update particle emission position."""
         if not self.window() or not self.window().isActiveWindow():
@@ -70,53 +365,35 @@ class ParticleSystem(QWidget):
         """Emit new particles at the given position."""
         if not self.window() or not self.window().isActiveWindow():
             return
-            
+
+        count = FrameClock.instance().particle_count(count)
+        if not count:
+            return
         for _ in range(count):
-            particle = Particle(
+            self.particles.emit(
                 pos.x(), pos.y(),
-                color=QColor(random.randint(150, 255), random.randint(150, 255), random.randint(150, 255)),
+                random.uniform(-1, 1), random.uniform(-1, 1),
+                life=random.uniform(0.8, 1.5),
                 size=random.uniform(1, 4),
-                velocity=(random.uniform(-1, 1), random.uniform(-1, 1)),
-                life=random.uniform(0.8, 1.5)
+                color=QColor(random.randint(150, 255), random.randint(150, 255), random.randint(150, 255))
             )
-            self.particles.append(particle)
+        FrameClock.instance().subscribe(self.update_particles)
     
-    def update_particles(self):
-        """Update all particles and remove dead ones."""
+    def update_particles(self, dt):
+        """Update all particles; returns False (stops the clock for this widget) when none are left."""
         if not self.window() or not self.window().isActiveWindow():
-            if self.particles: # Clear only if there are particles
-                self.particles.clear()
-                self.update() # Schedule a repaint to clear them from screen
-            return
+            self.particles.clear()
+            self.update() # Schedule a repaint to clear them from screen
+            return False
 
-        dt = 0.016  # Approximate delta time for 60 FPS
-        
-        # Update particles
-        alive_particles = []
-        for particle in self.particles:
-            if particle.update(dt):
-                alive_particles.append(particle)
-        
-        self.particles = alive_particles
+        alive = self.particles.step(dt)
         self.update()
+        return alive > 0
     
     def paintEvent(self, event):
         """Paint all particles."""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        for particle in self.particles:
-            # Create gradient for particle
-            gradient = QRadialGradient(particle.x, particle.y, particle.size)
-            color = QColor(particle.color)
-            color.setAlpha(particle.alpha)
-            gradient.setColorAt(0, color)
-            gradient.setColorAt(1, QColor(0, 0, 0, 0))
-            
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.NoPen)
-            painter.drawEllipse(int(particle.x - particle.size), int(particle.y - particle.size), 
-                              int(particle.size * 2), int(particle.size * 2))
+        self.particles.draw(painter)
 
 class AnimatedButton(QPushButton):
     """A button with hover animations and particle effects that respects QSS."""
@@ -125,14 +402,9 @@ class AnimatedButton(QPushButton):
     
     def __init__(self, text="", parent=None):
         super().__init__(text, parent)
-        self.particles = []
+        self.particles = ParticleField()
         
         self.setCursor(Qt.PointingHandCursor)
-
-        # Timer for particle animation
-        self.particle_timer = QTimer(self)
-        self.particle_timer.timeout.connect(self.update_particles)
-        self.particle_timer.start(16) # ~60 FPS
         
     # setText, text, and setEnabled are inherited.
         
@@ -158,35 +430,30 @@ class AnimatedButton(QPushButton):
         if not self.window() or not self.window().isActiveWindow():
             return
 
+        count = FrameClock.instance().particle_count(count)
+        if not count:
+            return
         for _ in range(count):
-            particle = Particle(
+            self.particles.emit(
                 random.randint(0, self.width()),
                 random.randint(0, self.height()),
-                color=QColor(255, 255, 255, 180),
+                random.uniform(-3, 3), random.uniform(-3, 3),
+                life=random.uniform(0.5, 1.0),
                 size=random.uniform(1, 3),
-                velocity=(random.uniform(-3, 3), random.uniform(-3, 3)),
-                life=random.uniform(0.5, 1.0)
+                color=QColor(255, 255, 255)
             )
-            self.particles.append(particle)
+        FrameClock.instance().subscribe(self.update_particles)
 
-    def update_particles(self):
-        """Met à jour les particules et repeint le widget si nécessaire."""
+    def update_particles(self, dt):
+        """Met à jour les particules; retourne False quand il n'y en a plus (fin de l'animation)."""
         if not self.window() or not self.window().isActiveWindow():
-            if self.particles:
-                self.particles.clear()
-                self.update()
-            return
-
-        if not self.particles:
-            return
-
-        alive_particles = [p for p in self.particles if p.update(0.016)]
-        
-        if len(alive_particles) != len(self.particles):
-            self.particles = alive_particles
-            self.update()
-        elif self.particles:
+            self.particles.clear()
             self.update()
+            return False
+
+        alive = self.particles.step(dt)
+        self.update()
+        return alive > 0
 
     def paintEvent(self, event):
         """Paint the button using QSS and then draw particles on top."""
@@ -194,21 +461,9 @@ class AnimatedButton(QPushButton):
         super().paintEvent(event)
         
         # Now, draw our particles over the button.
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        if self.particles:
-            for particle in self.particles:
-                gradient = QRadialGradient(particle.x, particle.y, particle.size)
-                color = QColor(particle.color)
-                color.setAlpha(particle.alpha)
-                gradient.setColorAt(0, color)
-                gradient.setColorAt(1, QColor(0, 0, 0, 0))
-                
-                painter.setBrush(QBrush(gradient))
-                painter.setPen(Qt.NoPen)
-                painter.drawEllipse(int(particle.x - particle.size), int(particle.y - particle.size), 
-                                  int(particle.size * 2), int(particle.size * 2))
+        if len(self.particles):
+            painter = QPainter(self)
+            self.particles.draw(painter)
 
 class LoadingSpinner(QWidget):
     """An animated loading spinner with particle effects."""
@@ -216,46 +471,60 @@ class LoadingSpinner(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.angle = 0
-        self.particles = []
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_animation)
-        self.timer.start(50)
+        self.particles = ParticleField(frame_rate=20)
+        self.emission_accumulator = 0.0
+
+    def _is_animating(self):
+        return self.isVisible() and self.window() is not None and self.window().isActiveWindow()
+
+    def _resume(self):
+        if self._is_animating():
+            FrameClock.instance().subscribe(self.update_animation)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._resume()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.ActivationChange:
+            self._resume()
         
-    def update_animation(self):
-        """Update the spinner animation."""
-        if not self.window() or not self.window().isActiveWindow():
-            return # Ne fait rien si la fenêtre n'est pas active
+    def update_animation(self, dt):
+        """Update the spinner animation; stops when hidden or when the window is inactive."""
+        if not self._is_animating():
+            self.particles.clear()
+            return False # Ne fait rien si la fenêtre n'est pas active
 
-        self.angle = (self.angle + 10) % 360
+        self.angle = (self.angle + 200 * dt) % 360  # 10° toutes les 50 ms
         
-        # Emit particles occasionally
-        if random.random() < 0.3:
-            self.emit_particles()
-            
+        # Emit particles occasionally (~6 salves par seconde)
+        self.emission_accumulator += dt
+        if self.emission_accumulator >= 0.05:
+            self.emission_accumulator = 0.0
+            if random.random() < 0.3:
+                self.emit_particles()
+
+        self.particles.step(dt)
         self.update()
+        return True
         
     def emit_particles(self):
         """Emit particles from the spinner."""
-        if not self.window() or not self.window().isActiveWindow():
-            return
-
         center_x = self.width() / 2
         center_y = self.height() / 2
         radius = min(self.width(), self.height()) / 4
         
-        for _ in range(2):
+        for _ in range(FrameClock.instance().particle_count(2)):
             angle = random.uniform(0, 2 * math.pi)
-            x = center_x + math.cos(angle) * radius
-            y = center_y + math.sin(angle) * radius
-            
-            particle = Particle(
-                x, y,
-                color=QColor(100, 150, 255),
+            self.particles.emit(
+                center_x + math.cos(angle) * radius,
+                center_y + math.sin(angle) * radius,
+                random.uniform(-1, 1), random.uniform(-1, 1),
+                life=random.uniform(0.5, 1.0),
                 size=random.uniform(1, 3),
-                velocity=(random.uniform(-1, 1), random.uniform(-1, 1)),
-                life=random.uniform(0.5, 1.0)
+                color=QColor(100, 150, 255)
             )
-            self.particles.append(particle)
     
     def paintEvent(self, event):
         """Paint the loading spinner."""
@@ -284,18 +553,4 @@ class LoadingSpinner(QWidget):
             painter.drawLine(int(x1), int(y1), int(x2), int(y2))
         
         # Draw particles
-        if self.window() and self.window().isActiveWindow():
-            for particle in self.particles[:]:
-                if particle.update(0.05):
-                    gradient = QRadialGradient(particle.x, particle.y, particle.size)
-                    color = QColor(particle.color)
-                    color.setAlpha(particle.alpha)
-                    gradient.setColorAt(0, color)
-                    gradient.setColorAt(1, QColor(0, 0, 0, 0))
-                    
-                    painter.setBrush(QBrush(gradient))
-                    painter.setPen(Qt.NoPen)
-                    painter.drawEllipse(int(particle.x - particle.size), int(particle.y - particle.size), 
-                                      int(particle.size * 2), int(particle.size * 2))
-                else:
-                    self.particles.remove(particle) 
\ No newline at end of file
+        self.particles.draw(painter)
@@ -0,0 +1,167 @@
+"""
+Mise à jour d'un dossier par préparation puis bascule.
+
+La nouvelle version est construite dans un dossier voisin (`<dossier>.staging`) : les fichiers
+inchangés y sont des liens physiques vers la version en place, seuls les fichiers modifiés sont
+écrits. Le dossier préparé remplace ensuite l'original par renommage sur le même volume.
+Une interruption laisse toujours une version complète sur le disque; `recover_swap` remet
+les choses en ordre au passage suivant. Une préparation terminée peut être marquée
+(`mark_stage_ready`) et basculée plus tard, quand l'utilisateur accepte la mise à jour;
+elle est abandonnée si le dossier en place a changé depuis (partie lancée, même hors du launcher).
+
+    stage_dir = begin_stage(modpack_dir)
+    detach(os.path.join(stage_dir, "mods/old.jar"))
+    ...  # écrire les nouveaux fichiers dans stage_dir
+    commit_stage(modpack_dir)
+"""
+import os
+import json
+import shutil
+import time
+
+STAGING_SUFFIX = ".staging"
+BACKUP_SUFFIX = ".previous"
+STAGE_INFO_FILE = ".stage.json"
+# Marge sur les dates de modification (systèmes de fichiers à 2 s de précision, FAT32)
+MTIME_SLACK = 2
+
+def staging_path(live_dir):
+    return os.path.normpath(live_dir) + STAGING_SUFFIX
+
+def backup_path(live_dir):
+    return os.path.normpath(live_dir) + BACKUP_SUFFIX
+
+def is_modpack_dir_name(name):
+    """
+    False pour les dossiers de travail voisins d'un modpack (`<modpack>.staging`, `<modpack>.previous`,
+    `.download_*`...): ceux qui listent le dossier des modpacks doivent les ignorer.
+    """
+    return not name.startswith(".") and not name.endswith((STAGING_SUFFIX, BACKUP_SUFFIX))
+
+def link_or_copy(source, target):
+    """Lien physique si le système le permet, copie sinon (FAT32, partage réseau...)."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+def link_tree(source_dir, target_dir, items=None):
+    """
+    Reproduit `source_dir` dans `target_dir` par liens physiques.
+    `items` limite la reprise à ces éléments de premier niveau (ceux absents sont ignorés).
+    """
+    names = os.listdir(source_dir) if items is None else items
+    for name in names:
+        source = os.path.join(source_dir, name)
+        target = os.path.join(target_dir, name)
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                target_root = os.path.join(target, os.path.relpath(root, source))
+                os.makedirs(target_root, exist_ok=True)
+                for file_name in files:
+                    link_or_copy(os.path.join(root, file_name), os.path.join(target_root, file_name))
+        elif os.path.isfile(source):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            link_or_copy(source, target)
+
+def detach(path):
+    """
+    Retire `path` du dossier préparé avant de le réécrire ou de le supprimer.
+    Indispensable: écrire dans un lien physique modifierait aussi la version en place.
+    """
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+def recover_swap(live_dir):
+    """
+    Termine une bascule interrompue. Retourne True si quelque chose a été récupéré.
+    Sans dossier en place, l'ancienne version est restaurée; sinon elle est simplement supprimée.
+    """
+    backup = backup_path(live_dir)
+    if not os.path.isdir(backup):
+        return False
+    if os.path.isdir(live_dir):
+        shutil.rmtree(backup, ignore_errors=True)
+    else:
+        print(f"Bascule interrompue détectée, restauration de {live_dir}")
+        os.replace(backup, live_dir)
+    return True
+
+def begin_stage(live_dir, items=None):
+    """
+    Crée le dossier préparé à partir de la version en place et retourne son chemin.
+    `items` limite la reprise à ces éléments de premier niveau (None: tout le dossier).
+    """
+    recover_swap(live_dir)
+    stage_dir = staging_path(live_dir)
+    if os.path.exists(stage_dir):
+        # Reste d'une préparation interrompue, jamais basculée
+        shutil.rmtree(stage_dir)
+    os.makedirs(stage_dir)
+    if os.path.isdir(live_dir):
+        link_tree(live_dir, stage_dir, items)
+    return stage_dir
+
+def mark_stage_ready(live_dir, info, snapshot_at):
+    """
+    Marque le dossier préparé comme complet; `info` (ex: {"sha": ...}) décrit la version préparée.
+    `snapshot_at` (time.time() relevé avant `begin_stage`) date la copie du dossier en place.
+    """
+    with open(os.path.join(staging_path(live_dir), STAGE_INFO_FILE), 'w', encoding='utf-8') as f:
+        json.dump(dict(info, snapshot_at=snapshot_at), f)
+
+def changed_since(live_dir, since):
+    """
+    True si un fichier ou dossier de `live_dir` a été modifié après `since`. La date d'un dossier
+    change aussi quand une entrée y est créée, renommée ou supprimée.
+    """
+    since -= MTIME_SLACK
+    for root, dirs, files in os.walk(live_dir):
+        for name in [None] + files:
+            try:
+                if os.stat(os.path.join(root, name) if name else root).st_mtime > since:
+                    return True
+            except OSError:
+                return True
+    return False
+
+def ready_stage_info(live_dir):
+    """
+    Retourne les informations d'une préparation complète pas encore basculée, sinon None.
+    Une préparation plus ancienne que le contenu du dossier en place est abandonnée: la basculer
+    ferait perdre ce qui a été écrit depuis (mondes, options, captures d'écran...).
+    """
+    try:
+        with open(os.path.join(staging_path(live_dir), STAGE_INFO_FILE), 'r', encoding='utf-8') as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    snapshot_at = info.get("snapshot_at") if isinstance(info, dict) else None
+    if not snapshot_at or changed_since(live_dir, snapshot_at):
+        print(f"Mise à jour préparée périmée (dossier modifié depuis), abandon: {staging_path(live_dir)}")
+        abort_stage(live_dir)
+        return None
+    return info
+
+def commit_stage(live_dir):
+    """Remplace `live_dir` par le dossier préparé (deux renommages), puis supprime l'ancienne version."""
+    stage_dir = staging_path(live_dir)
+    backup = backup_path(live_dir)
+    info_file = os.path.join(stage_dir, STAGE_INFO_FILE)
+    if os.path.exists(info_file):
+        os.remove(info_file)
+    if os.path.isdir(live_dir):
+        os.replace(live_dir, backup)
+    try:
+        os.replace(stage_dir, live_dir)
+    except OSError:
+        if os.path.isdir(backup):
+            os.replace(backup, live_dir)
+        raise
+    shutil.rmtree(backup, ignore_errors=True)
+
+def abort_stage(live_dir):
+    """Abandonne la préparation; la version en place n'a pas été touchée."""
+    shutil.rmtree(staging_path(live_dir), ignore_errors=True)
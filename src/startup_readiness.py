@@ -0,0 +1,70 @@
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from .tracing import tracer
+
+# (nom, poids dans la barre de progression, critique pour afficher le contenu principal)
+STARTUP_TASKS = [
+    ("config", 10, True),
+    ("first_paint", 20, True),
+    ("catalogue", 50, True),
+    ("auth", 20, False),
+]
+READINESS_TIMEOUT_MS = 10000
+
+class StartupReadiness(QObject):
+    """
+    Suit les vraies tâches du démarrage et pilote l'écran de chargement.
+    `ready` est émis dès que toutes les tâches critiques sont terminées (ou au délai de sécurité),
+    `finished` quand toutes les tâches le sont.
+    """
+    progress = pyqtSignal(int)
+    ready = pyqtSignal()
+    finished = pyqtSignal()
+
+    def __init__(self, tasks=STARTUP_TASKS, timeout_ms=READINESS_TIMEOUT_MS, parent=None):
+        super().__init__(parent)
+        self.tasks = {name: {"weight": weight, "critical": critical, "done": False} for name, weight, critical in tasks}
+        self.started_at = time.perf_counter()
+        self.durations = {}
+        self.is_ready = False
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.setSingleShot(True)
+        self.timeout_timer.timeout.connect(self._on_timeout)
+        self.timeout_timer.start(timeout_ms)
+
+    def complete(self, name):
+        """Marque une tâche comme terminée (réussie ou non). Les appels répétés sont ignorés."""
+        task = self.tasks.get(name)
+        if task is None or task["done"]:
+            return
+        task["done"] = True
+        self.durations[name] = time.perf_counter() - self.started_at
+        tracer.instant(f"startup.{name}")
+        self.progress.emit(self.get_progress())
+        if not self.is_ready and all(t["done"] for t in self.tasks.values() if t["critical"]):
+            self._set_ready()
+        if not self.pending_tasks():
+            self.timeout_timer.stop()
+            self.finished.emit()
+
+    def get_progress(self):
+        total = sum(t["weight"] for t in self.tasks.values())
+        done = sum(t["weight"] for t in self.tasks.values() if t["done"])
+        return int(100 * done / total) if total else 100
+
+    def pending_tasks(self):
+        return [name for name, task in self.tasks.items() if not task["done"]]
+
+    def _on_timeout(self):
+        if not self.is_ready:
+            print(f"Démarrage: délai dépassé, tâches en attente: {', '.join(self.pending_tasks())}")
+            self._set_ready()
+        # La trace est écrite même si une tâche non critique ne se termine jamais
+        self.finished.emit()
+
+    def _set_ready(self):
+        self.is_ready = True
+        timings = ', '.join(f"{name} {duration * 1000:.0f} ms" for name, duration in self.durations.items())
+        print(f"Démarrage prêt en {(time.perf_counter() - self.started_at) * 1000:.0f} ms ({timings})")
+        self.ready.emit()
@@ -1,23 +1,65 @@
 import os
 import json
-import requests
-from datetime import datetime
+import bisect
+import threading
+from datetime import datetime, date
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
 
 from .utils import STATS_FILE
+from .avatar_cache import AvatarCache
 from .translation_manager import translations
 
+def compute_streak_state(play_days):
+    """Recalcul complet de l'état du streak à partir des jours ordinaux triés (migration uniquement)."""
+    if not play_days:
+        return {'start': None, 'last': None, 'best': 0}
+    start = play_days[0]
+    best = 1
+    for previous, day in zip(play_days, play_days[1:]):
+        if day != previous + 1:
+            start = day
+        if day - start + 1 > best:
+            best = day - start + 1
+    return {'start': start, 'last': play_days[-1], 'best': best}
+
+def record_play_day(stats, day):
+    """
+    Ajoute un jour joué (ordinal) et met à jour le streak en O(1).
+    Retourne False si le jour était déjà enregistré.
+    """
+    # Nouvelle liste: l'ancienne est partagée avec les copies déjà transmises aux listeners
+    play_days = stats['play_days'] = list(stats.get('play_days', []))
+    streak = stats.get('streak') or {'start': None, 'last': None, 'best': 0}
+    last = streak.get('last')
+    if last is not None and day <= last:
+        index = bisect.bisect_left(play_days, day)
+        if index < len(play_days) and play_days[index] == day:
+            return False
+        # Jour antérieur au dernier jour joué (horloge modifiée): insertion et recalcul complet
+        play_days.insert(index, day)
+        stats['streak'] = compute_streak_state(play_days)
+        return True
+    play_days.append(day)
+    start = streak['start'] if last is not None and day == last + 1 else day
+    stats['streak'] = {'start': start, 'last': day, 'best': max(streak.get('best', 0), day - start + 1)}
+    return True
+
 class StatsManager:
     """Manages user statistics for the launcher."""
 
     def __init__(self):
-        pass
+        # Stats gardées en mémoire: le fichier n'est lu qu'une fois, puis seulement écrit
+        self._stats = None
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._avatar_labels = set()
+        self._logo_pixmap = None
 
     # --- Internal helpers ---
 
-    def _read_stats(self) -> dict:
+    def _load_stats_file(self) -> dict:
         """Read stats from file, or return empty dict if not found/corrupted."""
         if os.path.exists(STATS_FILE):
             try:
@@ -27,25 +69,75 @@ class StatsManager:
                 print(f"[DEBUG] Erreur lecture stats : {e}")
         return {}
 
-    def _write_stats(self, stats: dict):
-        """Write stats to file."""
-        try:
-            with open(STATS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(stats, f, indent=4)
-        except Exception as e:
-            print(f"[DEBUG] Erreur écriture stats : {e}")
+    def _read_stats(self) -> dict:
+        """Return a copy of the in-memory stats (loaded from file on first use)."""
+        with self._lock:
+            if self._stats is None:
+                self._stats = self._load_stats_file()
+                if self._migrate_play_days(self._stats):
+                    self._write_stats(dict(self._stats), set())
+            return dict(self._stats)
+
+    def _migrate_play_days(self, stats) -> bool:
+        """Convertit l'ancien format 'days_played' (dates texte) en jours ordinaux triés + état du streak."""
+        if 'days_played' not in stats:
+            return False
+        days = set(stats.get('play_days', []))
+        for day in stats.pop('days_played') or []:
+            try:
+                days.add(datetime.strptime(day, '%Y-%m-%d').toordinal())
+            except (TypeError, ValueError):
+                pass
+        stats['play_days'] = sorted(days)
+        stats['streak'] = compute_streak_state(stats['play_days'])
+        return True
+
+    def _write_stats(self, stats: dict, changed_keys=None):
+        """Write stats to file and notify listeners of the changed keys."""
+        with self._lock:
+            previous = self._stats or {}
+            if changed_keys is None:
+                changed_keys = {key for key in set(previous) | set(stats) if previous.get(key) != stats.get(key)}
+            self._stats = stats
+            try:
+                with open(STATS_FILE, 'w', encoding='utf-8') as f:
+                    json.dump(stats, f, indent=4)
+            except Exception as e:
+                print(f"[DEBUG] Erreur écriture stats : {e}")
+        if changed_keys:
+            self._notify(dict(stats), set(changed_keys))
 
     def _update_stat(self, key: str, value):
         """Update a single stat key and save."""
-        stats = self._read_stats()
-        stats[key] = value
-        self._write_stats(stats)
+        with self._lock:
+            stats = self._read_stats()
+            stats[key] = value
+            self._write_stats(stats, {key})
 
     def _increment_stat(self, key: str, amount=1):
         """Increment a stat key by amount and save."""
-        stats = self._read_stats()
-        stats[key] = stats.get(key, 0) + amount
-        self._write_stats(stats)
+        with self._lock:
+            stats = self._read_stats()
+            stats[key] = stats.get(key, 0) + amount
+            self._write_stats(stats, {key})
+
+    def _notify(self, stats, changed_keys):
+        for listener in list(self._listeners):
+            try:
+                listener(stats, changed_keys)
+            except Exception as e:
+                print(f"[DEBUG] Erreur notification stats : {e}")
+
+    # --- Change notifications ---
+
+    def add_listener(self, listener):
+        """`listener(stats, changed_keys)` est appelé après chaque écriture (depuis le thread qui écrit)."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     # --- Public API ---
 
@@ -55,20 +147,21 @@ class StatsManager:
 
     def update_playtime_stat(self, playtime_seconds):
         """Update playtime statistics (add seconds)."""
-        stats = self._read_stats()
-        stats['playtime'] = stats.get('playtime', 0) + round(playtime_seconds)
-        self._write_stats(stats)
+        with self._lock:
+            stats = self._read_stats()
+            stats['playtime'] = stats.get('playtime', 0) + round(playtime_seconds)
+            self._write_stats(stats, {'playtime'})
 
     def update_launch_stat(self):
         """Increment launch count et enregistre le jour de jeu pour le streak."""
-        stats = self._read_stats()
-        stats['launch_count'] = stats.get('launch_count', 0) + 1
-        # Ajout du jour de jeu (format YYYY-MM-DD)
-        today = datetime.now().strftime('%Y-%m-%d')
-        days = set(stats.get('days_played', []))
-        days.add(today)
-        stats['days_played'] = list(days)
-        self._write_stats(stats)
+        with self._lock:
+            stats = self._read_stats()
+            stats['launch_count'] = stats.get('launch_count', 0) + 1
+            changed = {'launch_count'}
+            # Ajout du jour de jeu et mise à jour incrémentale du streak
+            if record_play_day(stats, date.today().toordinal()):
+                changed.update(('play_days', 'streak'))
+            self._write_stats(stats, changed)
 
     def update_stats_on_login(self):
         """Increment login count."""
@@ -164,70 +257,47 @@ class StatsManager:
         close_btn.clicked.connect(close_overlay)
         layout.addWidget(close_btn, alignment=Qt.AlignCenter)
 
-    def update_avatar(self, pseudo, avatar_label):
-        """Update the player's Minecraft avatar from minotar.net."""
-        try:
-            url = f'https://minotar.net/armor/body/{pseudo}/120'
-            data = requests.get(url, timeout=5).content
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
-            if pixmap.isNull():
-                print(f"[ERREUR] Impossible de charger l'avatar pour {pseudo} depuis {url}")
-                default_avatar = QPixmap('assets/textures/logo.png').scaled(120, 240, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                avatar_label.setPixmap(default_avatar)
-            else:
-                avatar_label.setPixmap(pixmap.scaled(120, 240, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        except Exception as e:
-            print(f"[ERREUR] Exception lors du chargement de l'avatar pour {pseudo} : {e}")
-            default_avatar = QPixmap('assets/textures/logo.png').scaled(120, 240, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            avatar_label.setPixmap(default_avatar)
+    def update_avatar(self, pseudo, avatar_label, uuid=None):
+        """Affiche l'avatar du joueur (cache immédiat, téléchargement en arrière-plan)."""
+        self._show_avatar(uuid or pseudo, pseudo, avatar_label)
 
     def set_default_avatar(self, avatar_label):
         """Display the default Steve skin as avatar."""
-        url = "https://minotar.net/armor/body/steve/120"
-        try:
-            data = requests.get(url, timeout=5).content
-            pixmap = QPixmap()
-            pixmap.loadFromData(data)
-            avatar_label.setPixmap(pixmap.scaled(120, 240, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        except Exception:
-            default_avatar = QPixmap('assets/textures/logo.png').scaled(120, 240, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            avatar_label.setPixmap(default_avatar) 
+        self._show_avatar("steve", "steve", avatar_label)
+
+    def _default_avatar_pixmap(self):
+        if self._logo_pixmap is None:
+            self._logo_pixmap = QPixmap('assets/textures/logo.png').scaled(120, 240, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return self._logo_pixmap
 
-    def get_average_playtime_per_session(self):
+    def _show_avatar(self, key, name, avatar_label):
+        cache = AvatarCache.instance()
+        # Le label n'accepte que l'avatar demandé en dernier (connexion puis déconnexion rapides)
+        avatar_label.setProperty("avatar_key", key)
+        if id(avatar_label) not in self._avatar_labels:
+            self._avatar_labels.add(id(avatar_label))
+            cache.avatar_ready.connect(
+                lambda ready_key, pixmap: avatar_label.setPixmap(pixmap) if avatar_label.property("avatar_key") == ready_key else None
+            )
+        pixmap = cache.get(key, name)
+        avatar_label.setPixmap(pixmap if pixmap is not None else self._default_avatar_pixmap())
+
+    def get_average_playtime_per_session(self, stats=None):
         """Retourne le temps de jeu moyen par session en secondes."""
-        stats = self._read_stats()
+        stats = self._read_stats() if stats is None else stats
         playtime = stats.get('playtime', 0)
         launches = stats.get('launch_count', 1)
         return playtime / launches if launches > 0 else 0
 
-    def get_streaks(self):
-        """Retourne (streak_actuel, meilleur_streak) en jours."""
-        stats = self._read_stats()
-        days = sorted(set(stats.get('days_played', [])))
-        if not days:
+    def get_streaks(self, stats=None):
+        """Retourne (streak_actuel, meilleur_streak) en jours, depuis l'état du streak (O(1))."""
+        stats = self._read_stats() if stats is None else stats
+        streak = stats.get('streak') or {}
+        if not streak.get('last'):
             return 0, 0
-        days_dt = [datetime.strptime(d, '%Y-%m-%d') for d in days]
-        days_dt.sort()
-        best = cur = 1
-        streaks = []
-        for i in range(1, len(days_dt)):
-            if (days_dt[i] - days_dt[i-1]).days == 1:
-                cur += 1
-            else:
-                streaks.append(cur)
-                cur = 1
-        streaks.append(cur)
-        best = max(streaks)
-        # Streak actuel = nombre de jours consécutifs jusqu'à aujourd'hui
-        today = datetime.now().date()
-        streak_actuel = 0
-        for i in range(len(days_dt)-1, -1, -1):
-            if (today - days_dt[i].date()).days == streak_actuel:
-                streak_actuel += 1
-            else:
-                break
-        return streak_actuel, best
+        # Streak actuel = jours consécutifs jusqu'à aujourd'hui (0 si pas encore joué aujourd'hui)
+        streak_actuel = streak['last'] - streak['start'] + 1 if streak['last'] == date.today().toordinal() else 0
+        return streak_actuel, streak.get('best', 0)
 
     def get_successes(self):
         """Retourne la liste des succès débloqués (dict: id, nom, description, date)."""
@@ -236,20 +306,85 @@ class StatsManager:
 
     def unlock_success(self, success_id, name, description):
         """Débloque un succès si pas déjà fait."""
-        stats = self._read_stats()
-        successes = stats.get('successes', [])
-        if not any(s['id'] == success_id for s in successes):
-            successes.append({
-                'id': success_id,
-                'name': name,
-                'description': description,
-                'date': datetime.now().strftime('%Y-%m-%d %H:%M')
-            })
-            stats['successes'] = successes
-            self._write_stats(stats)
+        return self.unlock_successes([(success_id, name, description)])
+
+    def unlock_successes(self, items):
+        """Débloque plusieurs succès (id, nom, description) en une seule écriture; retourne les nouveaux."""
+        with self._lock:
+            stats = self._read_stats()
+            successes = list(stats.get('successes', []))
+            known = {s['id'] for s in successes}
+            date = datetime.now().strftime('%Y-%m-%d %H:%M')
+            new_entries = []
+            for success_id, name, description in items:
+                if success_id in known:
+                    continue
+                known.add(success_id)
+                new_entries.append({'id': success_id, 'name': name, 'description': description, 'date': date})
+            if new_entries:
+                stats['successes'] = successes + new_entries
+                self._write_stats(stats, {'successes'})
+            return new_entries
 
     def reset_successes(self):
         """Réinitialise tous les succès (vide la liste dans le fichier de stats)."""
-        stats = self._read_stats()
-        stats['successes'] = []
-        self._write_stats(stats) 
\ No newline at end of file
+        with self._lock:
+            stats = self._read_stats()
+            stats['successes'] = []
+            self._write_stats(stats, {'successes'})
+
+class StatsViewModel(QObject):
+    """
+    Valeurs affichées dans les onglets Statistiques et Succès, dérivées des stats en mémoire.
+    Le StatsManager pousse chaque modification; seuls les labels dont le texte change sont mis à jour.
+    """
+    changed = pyqtSignal(str, str)
+    successes_changed = pyqtSignal(dict)
+    _stats_pushed = pyqtSignal(dict, set)
+
+    def __init__(self, stats_manager, parent=None):
+        super().__init__(parent)
+        self.stats_manager = stats_manager
+        self.values = {}
+        self.successes = {}
+        self._bindings = {}
+        # Les écritures peuvent venir d'un thread (temps de jeu): passage par un signal pour revenir au thread de l'UI
+        self._stats_pushed.connect(self._on_stats_changed)
+        stats_manager.add_listener(self._stats_pushed.emit)
+        self._on_stats_changed(stats_manager._read_stats(), None)
+
+    def _compute(self, stats, changed_keys):
+        """Calcule les textes affichés à partir des stats."""
+        streak_actuel, best_streak = self.stats_manager.get_streaks(stats)
+        format_playtime = self.stats_manager.format_playtime_seconds
+        avg_playtime = format_playtime(self.stats_manager.get_average_playtime_per_session(stats))
+        return {
+            'playtime': format_playtime(stats.get('playtime', 0)),
+            'launch_count': str(stats.get('launch_count', 0)),
+            'avg_playtime': avg_playtime,
+            'streak': f"{streak_actuel} / {best_streak} jours",
+            'last_activity': stats.get('last_activity', str(translations.tr("stats.never"))),
+            'avg_playtime_desc': f"Temps de jeu moyen/session : {avg_playtime}",
+            'streak_desc': f"Streak actuel : {streak_actuel} jours   |   Meilleur streak : {best_streak} jours",
+        }
+
+    def _on_stats_changed(self, stats, changed_keys):
+        for key, text in self._compute(stats, changed_keys).items():
+            if self.values.get(key) == text:
+                continue
+            self.values[key] = text
+            for label in self._bindings.get(key, []):
+                label.setText(text)
+            self.changed.emit(key, text)
+        if changed_keys is None or 'successes' in changed_keys:
+            successes = {s['id']: s for s in stats.get('successes', [])}
+            if successes != self.successes:
+                self.successes = successes
+                self.successes_changed.emit(successes)
+
+    def bind(self, key, label):
+        """Affiche la valeur `key` dans `label` et la tient à jour."""
+        label.setText(self.values.get(key, ""))
+        labels = self._bindings.setdefault(key, [])
+        labels.append(label)
+        label.destroyed.connect(lambda *_: labels.remove(label) if label in labels else None) 
\ No newline at end of file
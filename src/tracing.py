@@ -0,0 +1,121 @@
+"""
+Mesure du démarrage par spans, écrite au format Chrome trace (chrome://tracing, Perfetto).
+
+    with span("config.load"):
+        ...
+
+    @traced("modpacks.load")
+    def load_modpacks(self): ...
+
+Un fichier SAVE_DIR/traces/startup-<date>.json est écrit à chaque démarrage quand
+`tracer.finish()` est appelé; seuls les derniers fichiers sont conservés.
+"""
+import os
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+
+from .utils import SAVE_DIR
+
+TRACE_DIR = os.path.join(SAVE_DIR, "traces")
+MAX_TRACE_FILES = 10
+MAX_TRACE_EVENTS = 20000
+
+class Tracer:
+    """Collecte des spans (thread-safe) jusqu'à l'écriture du fichier de trace."""
+
+    def __init__(self, trace_dir=TRACE_DIR, max_files=MAX_TRACE_FILES):
+        self.trace_dir = trace_dir
+        self.max_files = max_files
+        self.enabled = True
+        self.pid = os.getpid()
+        self.origin = time.perf_counter()
+        self.started_at = datetime.now()
+        self._events = []
+        self._thread_names = {}
+        self._lock = threading.Lock()
+
+    def _now_us(self):
+        return round((time.perf_counter() - self.origin) * 1_000_000, 1)
+
+    def _record(self, event):
+        thread = threading.current_thread()
+        event.update(pid=self.pid, tid=thread.ident)
+        with self._lock:
+            if not self.enabled or len(self._events) >= MAX_TRACE_EVENTS:
+                return
+            self._thread_names.setdefault(thread.ident, thread.name)
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, name, category="startup", **args):
+        """Mesure la durée du bloc `with`."""
+        if not self.enabled:
+            yield
+            return
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            self._record({"name": name, "cat": category, "ph": "X", "ts": start,
+                          "dur": round(self._now_us() - start, 1), "args": args})
+
+    def traced(self, name=None, category="startup"):
+        """Décorateur: chaque appel de la fonction devient un span."""
+        def decorator(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, category):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instant(self, name, category="startup", **args):
+        """Enregistre un événement ponctuel (ex: une tâche de démarrage terminée)."""
+        self._record({"name": name, "cat": category, "ph": "i", "s": "g", "ts": self._now_us(), "args": args})
+
+    def _build_trace(self):
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+        metadata = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": thread_name}}
+                    for tid, thread_name in thread_names.items()]
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms",
+                "otherData": {"started_at": self.started_at.isoformat()}}
+
+    def finish(self):
+        """Écrit la trace du démarrage, arrête l'enregistrement et retourne le chemin du fichier."""
+        if not self.enabled:
+            return None
+        trace = self._build_trace()
+        with self._lock:
+            self.enabled = False
+            self._events = []
+        try:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            path = os.path.join(self.trace_dir, f"startup-{self.started_at.strftime('%Y%m%d-%H%M%S')}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(trace, f, separators=(',', ':'))
+            self._prune()
+            print(f"Trace du démarrage écrite: {path}")
+            return path
+        except OSError as e:
+            print(f"Impossible d'écrire la trace du démarrage: {e}")
+            return None
+
+    def _prune(self):
+        traces = sorted(f for f in os.listdir(self.trace_dir) if f.startswith("startup-") and f.endswith(".json"))
+        for old_file in traces[:-self.max_files]:
+            try:
+                os.remove(os.path.join(self.trace_dir, old_file))
+            except OSError:
+                pass
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
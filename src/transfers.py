@@ -0,0 +1,162 @@
+"""
+Coordination des téléchargements: plafonds de débit et priorités.
+
+Chaque téléchargement est un job (installation d'un modpack, mise à jour du launcher, avatar...)
+avec une classe de priorité:
+
+    with transfer_scheduler.job("modpack:MonPack", priority=INTERACTIVE) as job:
+        for chunk in job.iter_content(response):
+            f.write(chunk)
+
+Quand un plafond global s'applique (réglage utilisateur, ou plafond réduit pendant une partie),
+il est partagé entre les jobs actifs au prorata du poids de leur classe; un job peut aussi avoir
+son propre plafond. Les préchargements (PREFETCH) attendent tant qu'un autre téléchargement
+est en cours ou qu'une partie est lancée.
+"""
+import time
+import threading
+from contextlib import contextmanager
+
+INTERACTIVE = 0
+UPDATE = 1
+PREFETCH = 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", UPDATE: "update", PREFETCH: "prefetch"}
+PRIORITY_WEIGHTS = {INTERACTIVE: 8, UPDATE: 3, PREFETCH: 1}
+
+CHUNK_SIZE = 64 * 1024
+BURST_SECONDS = 0.25
+DEFAULT_IN_GAME_LIMIT_KBPS = 1024
+
+class TokenBucket:
+    """Seau à jetons (octets/s). Sans débit, `consume` ne bloque jamais."""
+
+    def __init__(self, rate=None):
+        self.rate = None
+        self.tokens = 0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        with self._lock:
+            if rate and not self.rate:
+                self.tokens = rate * BURST_SECONDS
+            self.rate = rate
+            self.updated = time.monotonic()
+
+    def consume(self, nbytes):
+        """Retire `nbytes` jetons, en attendant si le seau est à découvert."""
+        with self._lock:
+            if not self.rate:
+                return
+            now = time.monotonic()
+            self.tokens = min(self.rate * BURST_SECONDS, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= nbytes
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+class TransferJob:
+    """Un téléchargement logique (un ou plusieurs fichiers) suivi par le planificateur."""
+
+    def __init__(self, scheduler, name, priority, max_rate=None, should_cancel=None):
+        self.scheduler = scheduler
+        self.name = name
+        self.priority = priority
+        self.max_rate = max_rate
+        self.should_cancel = should_cancel
+        self.bytes_done = 0
+        self.started_at = time.monotonic()
+        self.bucket = TokenBucket()
+
+    def throttle(self, nbytes):
+        """À appeler pour chaque bloc reçu: attend son tour et respecte le débit alloué."""
+        self.scheduler.wait_turn(self)
+        self.bucket.consume(nbytes)
+        self.bytes_done += nbytes
+
+    def iter_content(self, response, chunk_size=CHUNK_SIZE):
+        """Parcourt une réponse `requests` (stream=True) au rythme du job."""
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                self.throttle(len(chunk))
+                yield chunk
+
+    def read(self, response):
+        """Lit toute une réponse `requests` (stream=True) au rythme du job."""
+        return b"".join(self.iter_content(response))
+
+class TransferScheduler:
+    """Registre des jobs actifs; recalcule le débit de chacun quand un job ou une partie démarre ou s'arrête."""
+
+    def __init__(self):
+        self.max_rate = None
+        self.in_game_rate = DEFAULT_IN_GAME_LIMIT_KBPS * 1024
+        self.game_running = False
+        self._jobs = []
+        self._cond = threading.Condition()
+
+    def configure(self, config):
+        """Applique les réglages `download_limit_kbps` et `download_limit_in_game_kbps` (0: illimité)."""
+        with self._cond:
+            self.max_rate = int(config.get("download_limit_kbps", 0) or 0) * 1024 or None
+            self.in_game_rate = int(config.get("download_limit_in_game_kbps", DEFAULT_IN_GAME_LIMIT_KBPS) or 0) * 1024 or None
+            self._rebalance()
+
+    def set_game_running(self, running):
+        with self._cond:
+            self.game_running = running
+            self._rebalance()
+
+    @contextmanager
+    def job(self, name, priority=INTERACTIVE, max_rate=None, should_cancel=None):
+        """
+        Enregistre un job le temps du bloc `with`. `max_rate` (octets/s) plafonne ce job seul;
+        `should_cancel()` est consulté pendant les attentes (InterruptedError s'il retourne True).
+        """
+        job = TransferJob(self, name, priority, max_rate, should_cancel)
+        with self._cond:
+            self._jobs.append(job)
+            self._rebalance()
+        try:
+            yield job
+        finally:
+            with self._cond:
+                self._jobs.remove(job)
+                self._rebalance()
+            elapsed = time.monotonic() - job.started_at
+            if job.bytes_done >= 1024 * 1024:
+                print(f"Téléchargement '{name}' ({PRIORITY_NAMES[priority]}): {job.bytes_done / (1024 * 1024):.1f} Mo "
+                      f"en {elapsed:.1f} s")
+
+    def wait_turn(self, job):
+        with self._cond:
+            while self._is_paused(job):
+                if job.should_cancel and job.should_cancel():
+                    raise InterruptedError(f"téléchargement '{job.name}' annulé")
+                self._cond.wait(1.0)
+
+    def _is_paused(self, job):
+        # Les préchargements passent après tout le reste, et jamais pendant une partie
+        return job.priority == PREFETCH and (
+            self.game_running or any(other.priority < PREFETCH for other in self._jobs)
+        )
+
+    def _global_rate(self):
+        limits = [self.max_rate, self.in_game_rate if self.game_running else None]
+        limits = [limit for limit in limits if limit]
+        return min(limits) if limits else None
+
+    def _rebalance(self):
+        """Partage le plafond global entre les jobs actifs selon le poids de leur classe (verrou tenu)."""
+        total = self._global_rate()
+        active = [job for job in self._jobs if not self._is_paused(job)]
+        weights = sum(PRIORITY_WEIGHTS[job.priority] for job in active)
+        for job in self._jobs:
+            share = total * PRIORITY_WEIGHTS[job.priority] / weights if total and job in active else None
+            limits = [limit for limit in (share, job.max_rate) if limit]
+            job.bucket.set_rate(min(limits) if limits else None)
+        self._cond.notify_all()
+
+transfer_scheduler = TransferScheduler()
@@ -1,6 +1,8 @@
 import os
 import json
 
+from .tracing import traced
+
 class TranslationManager:
     """Gestionnaire de traductions pour le launcher."""
     
@@ -22,6 +24,7 @@ class TranslationManager:
         except FileNotFoundError:
             return ["fr", "en"]
     
+    @traced("translations.load_language")
     def load_language(self, language_code):
         """Charge les traductions pour une langue donnée."""
         try:
@@ -1,6 +1,7 @@
 import os
 import sys
 import subprocess
+from enum import Enum
 from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QRect
 from PyQt5.QtGui import QPixmap, QFont, QIcon, QFontMetrics, QColor, QPainter, QPen
 from PyQt5.QtWidgets import (
@@ -13,10 +14,21 @@ from PyQt5.QtCore import Qt as QtCoreQt
 
 from .translation_manager import translations
 from .custom_widgets import (
-    AnimatedTabWidget, AnimatedProgressBar, AnimatedListWidget, 
+    AnimatedTabWidget, AnimatedProgressBar, ModpackListView,
     LoadingScreen, AnimatedButton, LoadingSpinner
 )
-from .no_scroll_combobox import NoScrollComboBox, NoScrollSlider
+from .no_scroll_combobox import NoScrollComboBox, NoScrollSlider, NoScrollSpinBox
+from .particles import FrameClock
+from .achievements import ACHIEVEMENTS
+from .transfers import DEFAULT_IN_GAME_LIMIT_KBPS
+from .install_queue import DEFAULT_INSTALL_WORKERS, MAX_INSTALL_WORKERS
+
+class ToastPreset(Enum):
+    """Types de notification (remplace les presets de pyqttoast, qui était lent à importer)."""
+    SUCCESS = 'success'
+    ERROR = 'error'
+    WARNING = 'warning'
+    INFORMATION = 'info'
 
 class BannerToast(QWidget):
     _active_toasts = []  # Liste des toasts actifs pour empilement
@@ -43,6 +55,7 @@ class BannerToast(QWidget):
         BannerToast._active_toasts.append(self)
 
     def closeEvent(self, event):
+        self.closed = True
         if self in BannerToast._active_toasts:
             BannerToast._active_toasts.remove(self)
         self._reposition_all()
@@ -126,21 +139,25 @@ class BannerToast(QWidget):
         return fm.lineSpacing() * 2 + 4
 
     def _start_timer(self):
-        self.timer = QTimer(self)
-        self.timer.setSingleShot(False)
-        self.timer.timeout.connect(self._update_progress)
-        self.timer.start(30)
-        self.start_time = QTimer().remainingTime()  # Not used, but for clarity
+        # Compte à rebours piloté par l'horloge d'animation partagée (suspendu si la fenêtre est réduite)
+        self.closed = False
         self.elapsed = 0
+        FrameClock.instance().subscribe(self._update_progress)
 
-    def _update_progress(self):
-        self.elapsed += 30
+    def _update_progress(self, dt):
+        if self.closed:
+            return False
+        self.elapsed += dt * 1000
         self.progress = max(0.0, 1.0 - self.elapsed / self.duration)
         self.update()
         if self.progress <= 0.0:
             self.close()
+            return False
+        return True
 
     def _animate_in(self):
+        if not FrameClock.instance().transitions_enabled():
+            return
         self.setWindowOpacity(0.0)
         self.anim = QPropertyAnimation(self, b'windowOpacity')
         self.anim.setDuration(250)
@@ -248,7 +265,7 @@ class UIComponents:
         title_label.setProperty("class", "title")
         modpack_layout.addWidget(title_label)
 
-        modpack_list = AnimatedListWidget()
+        modpack_list = ModpackListView()
         modpack_list.setMinimumHeight(250)
         modpack_layout.addWidget(modpack_list)
 
@@ -450,6 +467,13 @@ class UIComponents:
         java_args_label.setProperty("tr_key", "config.jvm_args")
         form_layout.addRow(java_args_label, java_args_edit)
 
+        # JVM Profile Selector
+        jvm_profile_selector = NoScrollComboBox()
+        self.config_manager.populate_jvm_profiles(jvm_profile_selector)
+        jvm_profile_label = QLabel(str(translations.tr("config.jvm_profile")))
+        jvm_profile_label.setProperty("tr_key", "config.jvm_profile")
+        form_layout.addRow(jvm_profile_label, jvm_profile_selector)
+
         # Max Memory Slider
         total_gb = self.config_manager.get_total_memory_gb()
         max_memory_slider = NoScrollSlider(Qt.Orientation.Horizontal)
@@ -469,6 +493,27 @@ class UIComponents:
         max_memory_label_form.setProperty("tr_key", "config.max_memory")
         form_layout.addRow(max_memory_label_form, mem_layout)
 
+        # Download speed limits (0 = unlimited)
+        download_limit_spin = self._create_rate_spinbox(self.config_manager.get_config().get("download_limit_kbps", 0))
+        download_limit_label = QLabel(str(translations.tr("config.download_limit")))
+        download_limit_label.setProperty("tr_key", "config.download_limit")
+        form_layout.addRow(download_limit_label, download_limit_spin)
+
+        download_limit_in_game_spin = self._create_rate_spinbox(
+            self.config_manager.get_config().get("download_limit_in_game_kbps", DEFAULT_IN_GAME_LIMIT_KBPS)
+        )
+        download_limit_in_game_label = QLabel(str(translations.tr("config.download_limit_in_game")))
+        download_limit_in_game_label.setProperty("tr_key", "config.download_limit_in_game")
+        form_layout.addRow(download_limit_in_game_label, download_limit_in_game_spin)
+
+        # Number of modpacks installed at the same time
+        install_workers_spin = NoScrollSpinBox()
+        install_workers_spin.setRange(1, MAX_INSTALL_WORKERS)
+        install_workers_spin.setValue(int(self.config_manager.get_config().get("install_workers", DEFAULT_INSTALL_WORKERS) or DEFAULT_INSTALL_WORKERS))
+        install_workers_label = QLabel(str(translations.tr("config.install_workers")))
+        install_workers_label.setProperty("tr_key", "config.install_workers")
+        form_layout.addRow(install_workers_label, install_workers_spin)
+
         layout.addWidget(form_container)
 
         # Modpack Auto-update checkbox
@@ -499,7 +544,11 @@ class UIComponents:
             'github_token_edit': github_token_edit,
             'token_status_label': token_status_label,
             'java_args_edit': java_args_edit,
+            'jvm_profile_selector': jvm_profile_selector,
             'max_memory_slider': max_memory_slider,
+            'download_limit_spin': download_limit_spin,
+            'download_limit_in_game_spin': download_limit_in_game_spin,
+            'install_workers_spin': install_workers_spin,
             'auto_check_cb': auto_check_cb,
             'auto_check_launcher_cb': auto_check_launcher_cb,
             'save_settings_btn': save_settings_btn
@@ -507,11 +556,17 @@ class UIComponents:
         ui_elements['status_label'] = status_label
         return tab, ui_elements
 
-    def create_stats_tab(self):
-        """Crée le tab Statistiques avec les infos utilisateur et l'activité récente."""
-        from .stats_manager import StatsManager
-        from PyQt5.QtCore import QTimer
-        stats_manager = StatsManager()
+    def _create_rate_spinbox(self, value):
+        """Champ de débit (Ko/s); 0 s'affiche « illimité »."""
+        spinbox = NoScrollSpinBox()
+        spinbox.setRange(0, 1000000)
+        spinbox.setSingleStep(256)
+        spinbox.setSpecialValueText(str(translations.tr("config.unlimited")))
+        spinbox.setValue(int(value or 0))
+        return spinbox
+
+    def create_stats_tab(self, stats_view):
+        """Crée le tab Statistiques; les valeurs sont liées au view-model et mises à jour en place."""
         tab = QWidget()
         main_layout = QVBoxLayout(tab)
         main_layout.setContentsMargins(30, 30, 30, 30)
@@ -527,18 +582,11 @@ class UIComponents:
         title.setProperty("class", "title")
         main_layout.addWidget(title)
 
-        # Lecture des stats
-        stats = stats_manager._read_stats()
-        playtime = stats.get('playtime', 0)
-        launch_count = stats.get('launch_count', 0)
-        modpacks_installed = stats.get('modpacks_installed', 0)
-        updates = stats.get('updates', 0)
-
         # Cartes de stats (ligne)
         cards_layout = QHBoxLayout()
         cards_layout.setSpacing(18)
         stat_labels = {}
-        def stat_card(icon, label, value, key=None):
+        def stat_card(icon, label, key):
             card = QFrame()
             card.setFrameShape(QFrame.StyledPanel)
             card.setProperty("class", "stat-card")
@@ -552,23 +600,21 @@ class UIComponents:
             label_widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
             label_widget.setProperty("class", "stat-title")
             card_layout.addWidget(label_widget)
-            value_widget = QLabel(value)
+            value_widget = QLabel()
             value_widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
             value_widget.setProperty("class", "stat-value")
             card_layout.addWidget(value_widget)
-            if key:
-                stat_labels[key] = value_widget
+            stats_view.bind(key, value_widget)
+            stat_labels[key] = value_widget
             return card
 
         # Stats principales
-        cards_layout.addWidget(stat_card("⏱️", str(translations.tr("stats.playtime")), stats_manager.format_playtime_seconds(playtime), key="playtime"))
-        cards_layout.addWidget(stat_card("🚀", str(translations.tr("stats.launch_count")), str(launch_count), key="launch_count"))
+        cards_layout.addWidget(stat_card("⏱️", str(translations.tr("stats.playtime")), "playtime"))
+        cards_layout.addWidget(stat_card("🚀", str(translations.tr("stats.launch_count")), "launch_count"))
         # Temps de jeu moyen par session
-        avg_playtime = stats_manager.get_average_playtime_per_session()
-        cards_layout.addWidget(stat_card("📊", "Moyenne/session", stats_manager.format_playtime_seconds(avg_playtime), key="avg_playtime"))
+        cards_layout.addWidget(stat_card("📊", "Moyenne/session", "avg_playtime"))
         # Streak
-        streak_actuel, best_streak = stats_manager.get_streaks()
-        cards_layout.addWidget(stat_card("🔥", "Streak (meilleur)", f"{streak_actuel} / {best_streak} jours", key="streak"))
+        cards_layout.addWidget(stat_card("🔥", "Streak (meilleur)", "streak"))
 
         # Activité récente
         recent_box = QFrame()
@@ -579,24 +625,24 @@ class UIComponents:
         recent_title = QLabel(str(translations.tr("stats.recent_activity")))
         recent_title.setProperty("class", "stat-title")
         recent_layout.addWidget(recent_title)
-        last_activity = stats.get('last_activity', str(translations.tr("stats.never")))
-        last_activity_label = QLabel(last_activity)
+        last_activity_label = QLabel()
         last_activity_label.setProperty("class", "stat-value")
+        stats_view.bind('last_activity', last_activity_label)
         recent_layout.addWidget(last_activity_label)
         recent_layout.addStretch(1)
 
         # Après les stats principales
         # Affichage temps de jeu moyen par session
-        avg_playtime = stats_manager.get_average_playtime_per_session()
-        avg_label = QLabel(f"Temps de jeu moyen/session : {stats_manager.format_playtime_seconds(avg_playtime)}")
+        avg_label = QLabel()
         avg_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         avg_label.setProperty("class", "stat-desc")
+        stats_view.bind('avg_playtime_desc', avg_label)
         main_layout.addWidget(avg_label)
         # Affichage streak
-        streak_actuel, best_streak = stats_manager.get_streaks()
-        streak_label = QLabel(f"Streak actuel : {streak_actuel} jours   |   Meilleur streak : {best_streak} jours")
+        streak_label = QLabel()
         streak_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         streak_label.setProperty("class", "stat-desc")
+        stats_view.bind('streak_desc', streak_label)
         main_layout.addWidget(streak_label)
 
         # Crée un QFrame de fond harmonisé
@@ -615,9 +661,7 @@ class UIComponents:
         # (on ne met plus main_layout.addLayout(cards_layout), etc. directement)
         return tab, stat_labels
 
-    def create_success_tab(self, parent_launcher=None):
-        from .stats_manager import StatsManager
-        stats_manager = StatsManager()
+    def create_success_tab(self, stats_view, parent_launcher=None):
         from .custom_widgets import AnimatedButton
         from PyQt5.QtWidgets import QScrollArea, QWidget, QVBoxLayout
         tab = QWidget()
@@ -635,22 +679,15 @@ class UIComponents:
         scroll_layout = QVBoxLayout(scroll_content)
         scroll_layout.setContentsMargins(0, 0, 0, 0)
         scroll_layout.setSpacing(0)
-        all_successes = [
-            ("first_launch", "Premier lancement", "Lancer Minecraft pour la première fois"),
-            ("10_sessions", "10 sessions", "Jouer 10 sessions différentes"),
-            ("10h_play", "10 heures de jeu", "Atteindre 10 heures de jeu cumulées"),
-            ("3_streak", "3 jours de streak", "Jouer 3 jours d'affilée"),
-            ("7_streak", "7 jours de streak", "Jouer 7 jours d'affilée"),
-            ("new_year", "Jour de l'an", "Jouer un 1er janvier"),
-        ]
-        unlocked = {s['id']: s for s in stats_manager.get_successes()}
+        all_successes = [(a["id"], a["name"], a["description"]) for a in ACHIEVEMENTS]
+        success_widgets = {}
         for i, (sid, name, desc) in enumerate(all_successes):
             box = QFrame()
             box.setFrameShape(QFrame.StyledPanel)
             box.setProperty("class", "success-card")
             box_layout = QHBoxLayout(box)
             box_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
-            icon = QLabel("✅" if sid in unlocked else "⬜")
+            icon = QLabel("⬜")
             icon.setProperty("class", "success-icon")
             box_layout.addWidget(icon)
             text_col = QVBoxLayout()
@@ -661,12 +698,22 @@ class UIComponents:
             desc_label.setProperty("class", "success-desc")
             text_col.addWidget(desc_label)
             box_layout.addLayout(text_col)
-            if sid in unlocked:
-                date = unlocked[sid]['date']
-                date_label = QLabel(f"Débloqué le {date}")
-                date_label.setProperty("class", "success-date")
-                box_layout.addWidget(date_label)
+            date_label = QLabel()
+            date_label.setProperty("class", "success-date")
+            date_label.hide()
+            box_layout.addWidget(date_label)
+            success_widgets[sid] = (icon, date_label)
             scroll_layout.addWidget(box)
+
+        def update_successes(unlocked):
+            """Met à jour uniquement l'icône et la date des cartes."""
+            for sid, (icon, date_label) in success_widgets.items():
+                icon.setText("✅" if sid in unlocked else "⬜")
+                date_label.setVisible(sid in unlocked)
+                if sid in unlocked:
+                    date_label.setText(f"Débloqué le {unlocked[sid]['date']}")
+        update_successes(stats_view.successes)
+        stats_view.successes_changed.connect(update_successes)
         scroll_layout.addStretch(1)
         scroll_content.setLayout(scroll_layout)
         scroll.setWidget(scroll_content)
@@ -0,0 +1,216 @@
+"""
+Vérification périodique des mises à jour pendant que le launcher est ouvert.
+
+Le catalogue, la tête de branche de chaque modpack GitHub installé et la version du launcher
+sont interrogés par requêtes conditionnelles (ETag / Last-Modified): tant que rien ne change,
+le serveur répond 304 sans contenu, ce qui ne compte pas dans le quota de l'API GitHub.
+L'intervalle s'allonge tant que rien ne change et revient au minimum dès qu'un changement
+est vu. Rien n'est vérifié pendant une partie. Une mise à jour de modpack trouvée est
+téléchargée dans son dossier préparé (voir staging.py) avant d'être proposée: l'accepter
+ne coûte alors qu'un renommage.
+
+Une mise à jour est identifiée par son SHA (GitHub), son ETag/Last-Modified (archive) ou sa
+version (launcher) et n'est proposée qu'une fois; un modpack trouvé à jour (mise à jour
+installée) est oublié, sa mise à jour suivante sera donc proposée.
+"""
+import os
+import time
+import threading
+
+from .utils import (
+    lazy_import, check_update, get_installed_modpacks, get_minecraft_directory,
+    github_commit_api_url, prefetch_modpack_update, _get_github_auth_headers
+)
+
+requests = lazy_import("requests")
+
+REQUEST_TIMEOUT = 10
+
+class ConditionalPoller:
+    """GET conditionnels: le dernier contenu de chaque URL est réutilisé quand le serveur répond 304."""
+
+    def __init__(self):
+        self._validators = {}
+        self._bodies = {}
+
+    def get(self, url, headers=None):
+        """Retourne (changed, json); `changed` est False quand le contenu n'a pas bougé depuis le dernier appel."""
+        headers = dict(headers or {})
+        validators = self._validators.get(url, {})
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 304 and url in self._bodies:
+            return False, self._bodies[url]
+        response.raise_for_status()
+        data = response.json()
+        self._validators[url] = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        self._bodies[url] = data
+        return True, data
+
+class UpdateScheduler:
+    """
+    Relance les vérifications de mises à jour en arrière-plan et réutilise les signaux du démarrage
+    (`modpack_list_refreshed`, `updates_found`, `launcher_update_found`). Une même mise à jour
+    n'est proposée qu'une fois.
+    """
+    POLL_INTERVALS = (10 * 60, 20 * 60, 40 * 60, 80 * 60, 160 * 60)
+    CHECK_INTERVAL = 30
+
+    def __init__(self, modpack_manager, launcher_updater, signals, get_config, check_launcher=True):
+        self.modpack_manager = modpack_manager
+        self.launcher_updater = launcher_updater
+        self.signals = signals
+        self.get_config = get_config
+        self.check_launcher = check_launcher
+        self.poller = ConditionalPoller()
+        self._notified = {}
+        self._notified_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="update-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def is_busy(self):
+        """Pas de vérification ni de téléchargement pendant une partie."""
+        return self.modpack_manager.game_running
+
+    def remember_notified(self, modpacks):
+        """
+        Les mises à jour déjà proposées ailleurs (vérification au démarrage) ne sont pas reproposées.
+        Leur identifiant (SHA, ETag...) est demandé au serveur hors du thread de l'interface.
+        """
+        threading.Thread(target=self._remember_markers, args=(list(modpacks),), daemon=True).start()
+
+    def _remember_markers(self, modpacks):
+        for modpack in modpacks:
+            try:
+                marker = self._remote_marker(modpack)
+            except Exception as e:
+                print(f"Identification de la mise à jour de '{modpack['name']}' impossible: {e}")
+                continue
+            with self._notified_lock:
+                self._notified.setdefault(modpack['name'], marker)
+
+    def remember_launcher_update(self, update_info):
+        with self._notified_lock:
+            self._notified.setdefault("launcher", update_info.get('new_version'))
+
+    def _is_new(self, key, marker):
+        """True si cette mise à jour (`marker`: SHA, ETag ou version) n'a pas encore été proposée."""
+        with self._notified_lock:
+            if key in self._notified and self._notified[key] == marker:
+                return False
+            self._notified[key] = marker
+            return True
+
+    def _forget(self, key):
+        """Le modpack est à jour: sa prochaine mise à jour, quelle qu'elle soit, sera proposée."""
+        with self._notified_lock:
+            self._notified.pop(key, None)
+
+    def _remote_marker(self, modpack):
+        """SHA de la branche pour un modpack GitHub, sinon ETag ou Last-Modified de l'archive (None si absents)."""
+        api_url = github_commit_api_url(modpack['url'])
+        if api_url:
+            _, commit = self.poller.get(api_url, _get_github_auth_headers())
+            return commit['sha']
+        response = requests.head(modpack['url'], timeout=REQUEST_TIMEOUT, allow_redirects=True)
+        response.raise_for_status()
+        return response.headers.get('ETag') or response.headers.get('Last-Modified')
+
+    def _run(self, stop):
+        level = 0
+        next_poll = time.time() + self.POLL_INTERVALS[0]
+        while not stop.wait(self.CHECK_INTERVAL):
+            if time.time() < next_poll or self.is_busy():
+                continue
+            try:
+                changed = self.poll_once()
+            except Exception as e:
+                changed = False
+                print(f"Vérification des mises à jour en arrière-plan échouée ({type(e).__name__}: {e})")
+            level = 0 if changed else min(level + 1, len(self.POLL_INTERVALS) - 1)
+            next_poll = time.time() + self.POLL_INTERVALS[level]
+
+    def poll_once(self):
+        """Un passage complet. Retourne True si le serveur a signalé un changement."""
+        config = self.get_config()
+        changed = False
+        if self.check_launcher and config.get("auto_check_launcher_updates", True):
+            changed |= self._poll_launcher()
+        if config.get("auto_check_updates", True):
+            changed |= self._poll_modpacks(config)
+        return changed
+
+    def _poll_launcher(self):
+        changed, api_response = self.poller.get(
+            self.launcher_updater.api_version_url, {'Accept': 'application/vnd.github.v3+json'}
+        )
+        update_available, update_info = self.launcher_updater.parse_version_response(api_response)
+        if update_available and not self.is_busy() and self._is_new("launcher", update_info['new_version']):
+            self.signals.launcher_update_found.emit(update_info)
+        return changed
+
+    def _poll_modpacks(self, config):
+        url = config.get("modpack_url", "modpacks.json")
+        if url.startswith(('http://', 'https://')):
+            changed, modpacks = self.poller.get(url)
+            if changed:
+                self.signals.modpack_list_refreshed.emit(modpacks)
+        else:
+            changed, modpacks = False, self.modpack_manager.load_modpacks()
+
+        install_dir = os.path.join(get_minecraft_directory(), "modpacks")
+        installed = get_installed_modpacks()
+        found = []
+        for modpack in modpacks or []:
+            if self.is_busy():
+                break
+            name = modpack['name']
+            local_info = installed.get(name)
+            if not local_info:
+                continue
+            try:
+                api_url = github_commit_api_url(modpack['url'])
+                local_sha = (local_info.get('github_commit') or {}).get('sha')
+                if api_url and local_sha:
+                    head_changed, commit = self.poller.get(api_url, _get_github_auth_headers())
+                    changed |= head_changed
+                    if commit['sha'] == local_sha:
+                        self._forget(name)
+                        continue
+                    marker = commit['sha']
+                    prefetch_modpack_update(modpack['url'], install_dir, name, marker, should_cancel=self.is_busy)
+                else:
+                    update_needed, _ = check_update(name, modpack['url'], modpack.get('last_modified'))
+                    if not update_needed:
+                        self._forget(name)
+                        continue
+                    marker = self._remote_marker(modpack)
+            except Exception as e:
+                print(f"Vérification en arrière-plan de '{name}' échouée: {e}")
+                continue
+            found.append((modpack, marker))
+
+        if self.is_busy():
+            # Proposé au prochain passage, après la partie
+            return changed
+        updates = [modpack for modpack, marker in found if self._is_new(modpack['name'], marker)]
+        if updates:
+            self.signals.updates_found.emit(updates)
+        return changed
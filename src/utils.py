@@ -1,20 +1,45 @@
 import os
 import json
 import shutil
-import requests
 import hashlib
+import importlib
 from datetime import datetime
 from zipfile import ZipFile
 import zipfile
-from minecraft_launcher_lib.forge import install_forge_version
 import sys
+import tempfile
+import threading
+import time
 import urllib.request
 import urllib.error
 import urllib.parse
-import keyring
-import keyring.errors
+from contextlib import nullcontext
 from PyQt5.QtWidgets import QMessageBox
 
+from .transfers import transfer_scheduler, INTERACTIVE, PREFETCH
+
+class LazyModule:
+    """
+    Module importé au premier accès à l'un de ses attributs.
+    Évite de payer l'import de requests/keyring/psutil avant l'affichage de la fenêtre.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+def lazy_import(name):
+    """Retourne un proxy qui n'importe le module qu'à sa première utilisation."""
+    return LazyModule(name)
+
+requests = lazy_import("requests")
+keyring = lazy_import("keyring")
+
 def get_minecraft_directory():
     """Retourne le chemin du dossier Minecraft de l'utilisateur."""
     home = os.path.expanduser("~")
@@ -46,14 +71,27 @@ INSTALLED_FILE = os.path.join(SAVE_DIR, "installed_modpacks.json")
 STATS_FILE = os.path.join(SAVE_DIR, "user_stats.json")
 CONFIG_FILE = os.path.join(SAVE_DIR, "launcher_config.json")
 SERVICE_NAME = "CatzLauncher.GitHubToken"
+AUTH_SERVICE_NAME = "CatzLauncher.Auth"
+# Le coffre d'identifiants Windows limite la taille de chaque secret: les longs tokens sont découpés
+KEYRING_CHUNK_SIZE = 1000
+# installed_modpacks.json est relu puis réécrit par chaque installation (plusieurs en parallèle)
+INSTALLED_FILE_LOCK = threading.Lock()
+_modpack_locks = {}
+_modpack_locks_guard = threading.Lock()
+
+def modpack_update_lock(modpack_name):
+    """Verrou d'un modpack: une seule installation ou préparation à la fois pour son dossier .staging."""
+    with _modpack_locks_guard:
+        return _modpack_locks.setdefault(modpack_name, threading.RLock())
 
 def save_local_github_commit(modpack_name, commit_info):
     """Saves the GitHub commit information locally"""
-    installed_data = get_installed_modpacks()
-    if modpack_name in installed_data:
-        installed_data[modpack_name]['github_commit'] = commit_info
-        with open(INSTALLED_FILE, 'w') as f:
-            json.dump(installed_data, f, indent=4)
+    with INSTALLED_FILE_LOCK:
+        installed_data = get_installed_modpacks()
+        if modpack_name in installed_data:
+            installed_data[modpack_name]['github_commit'] = commit_info
+            with open(INSTALLED_FILE, 'w') as f:
+                json.dump(installed_data, f, indent=4)
 
 def get_cumulative_changes(repo_url, old_sha, new_sha):
     """Gets cumulative changes between two commits using GitHub API compare endpoint"""
@@ -126,6 +164,50 @@ def load_github_token():
         print(f"ERREUR: Impossible de charger le token depuis le stockage sécurisé: {e}")
         return None
 
+def save_secret(name, value, service=AUTH_SERVICE_NAME):
+    """
+    Enregistre un secret dans le keyring, découpé en morceaux de KEYRING_CHUNK_SIZE caractères.
+    `value=None` supprime le secret. Retourne False si le keyring n'est pas disponible.
+    """
+    try:
+        previous = keyring.get_password(service, name)
+        previous_count = int(previous.split("|", 1)[0]) if previous and "|" in previous else 1
+        if value is None:
+            chunks = []
+        else:
+            chunks = [value[i:i + KEYRING_CHUNK_SIZE] for i in range(0, len(value), KEYRING_CHUNK_SIZE)] or [""]
+            keyring.set_password(service, name, f"{len(chunks)}|{chunks[0]}")
+            for index, chunk in enumerate(chunks[1:], start=1):
+                keyring.set_password(service, f"{name}#{index}", chunk)
+        # Supprime les morceaux en trop d'une version précédente plus longue
+        for index in range(len(chunks), previous_count if previous else 0):
+            try:
+                keyring.delete_password(service, name if index == 0 else f"{name}#{index}")
+            except keyring.errors.PasswordDeleteError:
+                pass
+        return True
+    except Exception as e:
+        print(f"ERREUR: Impossible d'enregistrer '{name}' dans le stockage sécurisé: {e}")
+        return False
+
+def load_secret(name, service=AUTH_SERVICE_NAME):
+    """Charge un secret enregistré avec save_secret (None s'il est absent ou incomplet)."""
+    try:
+        head = keyring.get_password(service, name)
+        if not head or "|" not in head:
+            return None
+        count, first = head.split("|", 1)
+        chunks = [first]
+        for index in range(1, int(count)):
+            chunk = keyring.get_password(service, f"{name}#{index}")
+            if chunk is None:
+                return None
+            chunks.append(chunk)
+        return "".join(chunks)
+    except Exception as e:
+        print(f"ERREUR: Impossible de charger '{name}' depuis le stockage sécurisé: {e}")
+        return None
+
 def _get_github_auth_headers():
     """Charge le token GitHub depuis le stockage sécurisé et retourne les headers."""
     headers = {'User-Agent': 'CatzLauncher'}
@@ -184,10 +266,11 @@ def extract_mb_from_string(mb_string):
     
     return 200  # Valeur par défaut
 
-def download_file_with_progress(url, destination, callback=None, estimated_mb=200):
+def download_file_with_progress(url, destination, callback=None, estimated_mb=200, name=None, priority=INTERACTIVE):
     """
     Télécharge un fichier depuis une URL HTTP/S.
     Version avec User-Agent pour GitHub et taille estimée pour la progression.
+    Le débit est réglé par le planificateur de transferts (job `name`, classe `priority`).
     """
     # Convertir estimated_mb en nombre si c'est une chaîne
     estimated_mb = extract_mb_from_string(estimated_mb)
@@ -231,11 +314,12 @@ def download_file_with_progress(url, destination, callback=None, estimated_mb=20
         bytes_so_far = 0
         
         print("Début de l'écriture du fichier...")
-        with open(destination, 'wb') as f:
+        with transfer_scheduler.job(name or url, priority) as job, open(destination, 'wb') as f:
             while True:
                 buffer = response.read(8192)
                 if not buffer:
                     break
+                job.throttle(len(buffer))
                 f.write(buffer)
                 bytes_so_far += len(buffer)
                 if callback:
@@ -259,9 +343,16 @@ def download_file_with_progress(url, destination, callback=None, estimated_mb=20
 def install_modpack_files_fresh(url, install_dir, modpack_name, estimated_mb, progress_callback=None):
     """
     Télécharge et installe les fichiers du modpack avec suppression complète (installation fraîche).
+    Le modpack est extrait dans un dossier préparé, les données du joueur (get_preserved_items) y sont
+    reprises par liens physiques, puis il remplace l'ancien dossier d'un coup.
     """
+    from .staging import begin_stage, commit_stage, abort_stage, link_tree
+
     modpack_profile_dir = os.path.join(install_dir, modpack_name)
-    temp_zip = os.path.join(install_dir, "temp_modpack.zip")
+    # Dossier temporaire propre à cette installation: plusieurs modpacks peuvent s'installer en parallèle
+    os.makedirs(install_dir, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(prefix=".download_", dir=install_dir)
+    temp_zip = os.path.join(temp_dir, "modpack.zip")
 
     print(f"Installation fraîche de '{modpack_name}'...")
     
@@ -269,9 +360,7 @@ def install_modpack_files_fresh(url, install_dir, modpack_name, estimated_mb, pr
     installed_data = get_installed_modpacks()
     existing_info = installed_data.get(modpack_name, {})
     
-    if os.path.isdir(modpack_profile_dir):
-        shutil.rmtree(modpack_profile_dir)
-    os.makedirs(modpack_profile_dir, exist_ok=True)
+    stage_dir = begin_stage(modpack_profile_dir, items=[])
 
     try:
         final_url = url
@@ -288,7 +377,7 @@ def install_modpack_files_fresh(url, install_dir, modpack_name, estimated_mb, pr
             print(f"URL Dropbox convertie pour téléchargement direct : {final_url}")
         
         print(f"Téléchargement de '{modpack_name}' depuis {final_url}...")
-        download_file_with_progress(final_url, temp_zip, progress_callback, estimated_mb)
+        download_file_with_progress(final_url, temp_zip, progress_callback, estimated_mb, name=f"modpack:{modpack_name}")
 
         print("Vérification de l'intégrité du fichier téléchargé...")
         if not zipfile.is_zipfile(temp_zip):
@@ -296,17 +385,17 @@ def install_modpack_files_fresh(url, install_dir, modpack_name, estimated_mb, pr
                 content_preview = f.read(512)
             raise ValueError(f"Le fichier téléchargé n'est pas un ZIP valide. Contenu initial : {content_preview}")
 
-        print(f"Extraction de '{modpack_name}' dans {modpack_profile_dir}...")
+        print(f"Extraction de '{modpack_name}' dans {stage_dir}...")
         with zipfile.ZipFile(temp_zip, 'r') as zip_ref:
-            zip_ref.extractall(modpack_profile_dir)
+            zip_ref.extractall(stage_dir)
         print("Extraction terminée.")
 
         # Correction de la structure : déplacer le contenu du sous-dossier si nécessaire
-        extracted_items = os.listdir(modpack_profile_dir)
+        extracted_items = os.listdir(stage_dir)
         print(f"Éléments extraits du ZIP: {extracted_items}")
         
-        if len(extracted_items) == 1 and os.path.isdir(os.path.join(modpack_profile_dir, extracted_items[0])):
-            subfolder = os.path.join(modpack_profile_dir, extracted_items[0])
+        if len(extracted_items) == 1 and os.path.isdir(os.path.join(stage_dir, extracted_items[0])):
+            subfolder = os.path.join(stage_dir, extracted_items[0])
             print(f"Correction de la structure : déplacement du contenu de '{extracted_items[0]}'...")
             
             # Vérifier qu'il y a des fichiers dans le sous-dossier
@@ -317,7 +406,7 @@ def install_modpack_files_fresh(url, install_dir, modpack_name, estimated_mb, pr
                 # Déplacer tous les fichiers du sous-dossier vers le dossier principal
                 for item in subfolder_contents:
                     src = os.path.join(subfolder, item)
-                    dst = os.path.join(modpack_profile_dir, item)
+                    dst = os.path.join(stage_dir, item)
                     print(f"Déplacement: {src} -> {dst}")
                     shutil.move(src, dst)
                 
@@ -334,10 +423,22 @@ def install_modpack_files_fresh(url, install_dir, modpack_name, estimated_mb, pr
         else:
             print(f"Pas de sous-dossier unique détecté. Structure: {extracted_items}")
             
+        # Reprendre les données du joueur que le ZIP ne fournit pas (sauvegardes, captures...)
+        if os.path.isdir(modpack_profile_dir):
+            preserved = [
+                item for item in get_preserved_items()
+                if os.path.exists(os.path.join(modpack_profile_dir, item)) and not os.path.exists(os.path.join(stage_dir, item))
+            ]
+            link_tree(modpack_profile_dir, stage_dir, preserved)
+            if preserved:
+                print(f"Données conservées: {preserved}")
+
         # Vérification finale
-        final_contents = os.listdir(modpack_profile_dir)
+        final_contents = os.listdir(stage_dir)
         print(f"Contenu final du dossier modpack: {final_contents}")
 
+        commit_stage(modpack_profile_dir)
+
         # Récupérer les informations du commit GitHub si c'est un repo GitHub
         commit_info = None
         if 'github.com' in url and '/archive/refs/heads/' in url:
@@ -351,31 +452,33 @@ def install_modpack_files_fresh(url, install_dir, modpack_name, estimated_mb, pr
         timestamp = datetime.now().isoformat()
         
         # Mettre à jour les informations d'installation en conservant first_install si existant
-        installed_data[modpack_name] = {
-            "version": "1.0.0",
-            "timestamp": timestamp,
-            "path": modpack_profile_dir,
-            "first_install": existing_info.get('first_install', True)  # Conserver la valeur existante
-        }
-        
-        # Ajouter les informations du commit si disponibles
-        if commit_info:
-            installed_data[modpack_name]["github_commit"] = commit_info
-        
-        with open(INSTALLED_FILE, 'w') as f:
-            json.dump(installed_data, f, indent=4)
+        with INSTALLED_FILE_LOCK:
+            # Relu ici: d'autres modpacks ont pu être installés pendant le téléchargement
+            installed_data = get_installed_modpacks()
+            installed_data[modpack_name] = {
+                "version": "1.0.0",
+                "timestamp": timestamp,
+                "path": modpack_profile_dir,
+                "first_install": existing_info.get('first_install', True)  # Conserver la valeur existante
+            }
+            
+            # Ajouter les informations du commit si disponibles
+            if commit_info:
+                installed_data[modpack_name]["github_commit"] = commit_info
+            
+            with open(INSTALLED_FILE, 'w') as f:
+                json.dump(installed_data, f, indent=4)
             
         print(f"'{modpack_name}' a été installé avec succès.")
         return True 
 
     except Exception as e:
         print(f"ERREUR FATALE lors de l'installation de '{modpack_name}': {e}")
-        if os.path.isdir(modpack_profile_dir):
-            shutil.rmtree(modpack_profile_dir)
+        # L'ancienne installation (s'il y en a une) n'a pas été touchée
+        abort_stage(modpack_profile_dir)
         raise e
     finally:
-        if os.path.exists(temp_zip):
-            os.remove(temp_zip)
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
 def check_update(name, url, last_modified):
     """
@@ -525,44 +628,54 @@ def get_installed_modpacks():
     except (IOError, json.JSONDecodeError):
         return {}
 
+def parse_github_branch_url(repo_url):
+    """
+    Retourne (owner, repo, branch) pour une URL d'archive de branche GitHub, sinon None.
+    Format: https://github.com/owner/repo/archive/refs/heads/branch.zip
+    """
+    start_marker = '/archive/refs/heads/'
+    start_pos = repo_url.find(start_marker)
+    if 'github.com' not in repo_url or start_pos == -1:
+        return None
+    branch_start = start_pos + len(start_marker)
+    branch_end = repo_url.find('.zip', branch_start)
+    if branch_end == -1:
+        return None
+    parts = repo_url.split('/')
+    return parts[3], parts[4], repo_url[branch_start:branch_end]
+
+def github_commit_api_url(repo_url):
+    """URL de l'API GitHub donnant le dernier commit de la branche d'une URL d'archive, sinon None."""
+    parsed = parse_github_branch_url(repo_url)
+    if not parsed:
+        return None
+    owner, repo, branch = parsed
+    return f"https://api.github.com/repos/{owner}/{repo}/commits/{branch}"
+
 def get_github_last_commit(repo_url):
     """
     Récupère le dernier commit d'une branche GitHub.
     Exemple: get_github_last_commit("https://github.com/quentin452/CatzLauncher/archive/refs/heads/forge-1.16.5-biggess-pack-cat-edition-v2.zip")
     """
     try:
-        # Extraire les informations du repo depuis l'URL
-        if 'github.com' in repo_url and '/archive/refs/heads/' in repo_url:
-            # Format: https://github.com/owner/repo/archive/refs/heads/branch.zip
-            # Trouver la position de '/archive/refs/heads/' et extraire la branche
-            start_marker = '/archive/refs/heads/'
-            start_pos = repo_url.find(start_marker)
-            if start_pos != -1:
-                branch_start = start_pos + len(start_marker)
-                branch_end = repo_url.find('.zip', branch_start)
-                if branch_end != -1:
-                    branch = repo_url[branch_start:branch_end]
-                    
-                    # Extraire owner et repo depuis l'URL
-                    parts = repo_url.split('/')
-                    owner = parts[3]
-                    repo = parts[4]
-                    
-                    print(f"Extraction GitHub: owner={owner}, repo={repo}, branch={branch}")
-                    
-                    # API GitHub pour récupérer le dernier commit de la branche
-                    api_url = f"https://api.github.com/repos/{owner}/{repo}/commits/{branch}"
-                    headers = _get_github_auth_headers()
-                    
-                    response = requests.get(api_url, headers=headers, timeout=10)
-                    response.raise_for_status()
-                    
-                    commit_data = response.json()
-                    return {
-                        'sha': commit_data['sha'],
-                        'date': commit_data['commit']['author']['date'],
-                        'message': commit_data['commit']['message']
-                    }
+        parsed = parse_github_branch_url(repo_url)
+        if parsed:
+            owner, repo, branch = parsed
+            print(f"Extraction GitHub: owner={owner}, repo={repo}, branch={branch}")
+            
+            # API GitHub pour récupérer le dernier commit de la branche
+            api_url = github_commit_api_url(repo_url)
+            headers = _get_github_auth_headers()
+            
+            response = requests.get(api_url, headers=headers, timeout=10)
+            response.raise_for_status()
+            
+            commit_data = response.json()
+            return {
+                'sha': commit_data['sha'],
+                'date': commit_data['commit']['author']['date'],
+                'message': commit_data['commit']['message']
+            }
     except Exception as e:
         print(f"Erreur lors de la récupération du commit GitHub: {e}")
         return None
@@ -672,9 +785,10 @@ def get_github_file_size(repo_url, file_path, commit_sha):
         print(f"Avertissement: Impossible de récupérer la taille de {file_path} au commit {commit_sha[:7]}: {e}")
         return 0
 
-def download_single_file_from_github(repo_url, file_path, destination_path, commit_sha):
+def download_single_file_from_github(repo_url, file_path, destination_path, commit_sha, job=None):
     """
     Télécharge un fichier spécifique depuis GitHub en utilisant un SHA de commit précis.
+    `job` (planificateur de transferts) regroupe les fichiers d'une même mise à jour.
     """
     try:
         if 'github.com' not in repo_url: return False
@@ -686,13 +800,14 @@ def download_single_file_from_github(repo_url, file_path, destination_path, comm
         raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{commit_sha}/{file_path}"
         headers = _get_github_auth_headers()
         
-        response = requests.get(raw_url, headers=headers, timeout=30)
+        response = requests.get(raw_url, headers=headers, timeout=30, stream=True)
         response.raise_for_status()
         
         os.makedirs(os.path.dirname(destination_path), exist_ok=True)
         
-        with open(destination_path, 'wb') as f:
-            f.write(response.content)
+        with nullcontext(job) if job else transfer_scheduler.job(file_path) as transfer, open(destination_path, 'wb') as f:
+            for chunk in transfer.iter_content(response):
+                f.write(chunk)
         
         # print(f"Fichier téléchargé: {file_path}") # Optionnel, peut être verbeux
         return True
@@ -701,10 +816,16 @@ def download_single_file_from_github(repo_url, file_path, destination_path, comm
         print(f"Erreur lors du téléchargement de {file_path} au commit {commit_sha[:7]}: {e}")
         return False
 
-def update_modpack_delta(modpack_name, install_dir, changes, repo_url, new_sha, progress_callback=None):
+def prepare_modpack_delta(modpack_name, install_dir, changes, repo_url, new_sha, progress_callback=None,
+                          should_cancel=None, priority=INTERACTIVE):
     """
-    Applique les changements delta au modpack installé en téléchargeant fichier par fichier depuis GitHub.
+    Prépare la nouvelle version du modpack à côté du dossier en place (fichiers inchangés en liens
+    physiques, fichiers modifiés téléchargés depuis GitHub) sans la basculer.
+    Retourne True si la préparation est complète; elle est alors marquée avec `new_sha`.
+    `should_cancel()` est consulté entre chaque fichier (préparation en arrière-plan).
     """
+    from .staging import begin_stage, abort_stage, detach, mark_stage_ready
+
     modpack_dir = os.path.join(install_dir, modpack_name)
     
     print(f"Mise à jour delta pour '{modpack_name}':")
@@ -712,70 +833,129 @@ def update_modpack_delta(modpack_name, install_dir, changes, repo_url, new_sha,
     print(f"  - Fichiers à modifier: {len(changes['modified'])}")
     print(f"  - Fichiers à supprimer: {len(changes['removed'])}")
     
-    # Supprimer les fichiers en premier
-    for file_path in changes['removed']:
-        full_path = os.path.join(modpack_dir, file_path)
-        if os.path.exists(full_path):
+    # Date de la copie: une modification du dossier en place après elle rend la préparation périmée
+    snapshot_at = time.time()
+    stage_dir = begin_stage(modpack_dir)
+    try:
+        # Supprimer les fichiers en premier
+        for file_path in changes['removed']:
             try:
-                os.remove(full_path)
+                detach(os.path.join(stage_dir, file_path))
                 print(f"  Supprimé: {file_path}")
             except OSError as e:
                 print(f"Erreur lors de la suppression de {file_path}: {e}")
 
-    
-    # Mettre à jour les fichiers ajoutés/modifiés
-    files_to_update = changes['added'] + changes['modified']
-    
-    if files_to_update:
-        print(f"Calcul de la taille totale de la mise à jour...")
+        # Mettre à jour les fichiers ajoutés/modifiés
+        files_to_update = changes['added'] + changes['modified']
+        success = True
         
-        # Utiliser le new_sha pour obtenir la taille des fichiers de la nouvelle version
-        file_sizes = {f: get_github_file_size(repo_url, f, new_sha) for f in files_to_update}
-        total_size = sum(file_sizes.values())
-        
-        if total_size == 0 and any(s is not None and s > 0 for s in file_sizes.values()):
-             print("Avertissement: La taille totale est 0 mais certains fichiers ont une taille > 0. Un problème de calcul est survenu.")
-        elif total_size == 0:
-            print("Aucun contenu à télécharger (fichiers de taille nulle).")
-        else:
-            print(f"Taille totale à télécharger: {total_size / (1024*1024):.2f} MB")
-        
-        bytes_downloaded = 0
-        if progress_callback:
-            progress_callback(bytes_downloaded, total_size)
-
-        if total_size > 0:
-            print(f"Téléchargement de {len(files_to_update)} fichiers depuis GitHub...")
+        if files_to_update:
+            print(f"Calcul de la taille totale de la mise à jour...")
             
-            success_count = 0
-            for file_path, file_size in file_sizes.items():
-                dest_path = os.path.join(modpack_dir, file_path)
-                
-                # Utiliser le new_sha pour télécharger la version la plus récente du fichier
-                if download_single_file_from_github(repo_url, file_path, dest_path, new_sha):
-                    success_count += 1
-                    # La taille réelle pourrait être différente si get_github_file_size a échoué.
-                    # On utilise la taille connue pour la progression.
-                    bytes_downloaded += file_size if file_size is not None else 0
-                    if progress_callback:
-                        progress_callback(bytes_downloaded, total_size)
-                    # print(f"  ✓ Mis à jour: {file_path}") # Trop verbeux
-                else:
-                    print(f"  ✗ Erreur de téléchargement: {file_path}")
+            # Utiliser le new_sha pour obtenir la taille des fichiers de la nouvelle version
+            file_sizes = {f: get_github_file_size(repo_url, f, new_sha) for f in files_to_update}
+            total_size = sum(file_sizes.values())
+            
+            if total_size == 0 and any(s is not None and s > 0 for s in file_sizes.values()):
+                 print("Avertissement: La taille totale est 0 mais certains fichiers ont une taille > 0. Un problème de calcul est survenu.")
+            elif total_size == 0:
+                print("Aucun contenu à télécharger (fichiers de taille nulle).")
+            else:
+                print(f"Taille totale à télécharger: {total_size / (1024*1024):.2f} MB")
             
-            if progress_callback and total_size > 0:
-                progress_callback(total_size, total_size)
+            bytes_downloaded = 0
+            if progress_callback:
+                progress_callback(bytes_downloaded, total_size)
+
+            if total_size > 0:
+                print(f"Téléchargement de {len(files_to_update)} fichiers depuis GitHub...")
                 
-            print(f"Mise à jour delta terminée: {success_count}/{len(files_to_update)} fichiers mis à jour")
-            return success_count == len(files_to_update)
+                success_count = 0
+                with transfer_scheduler.job(f"modpack:{modpack_name}", priority, should_cancel=should_cancel) as job:
+                    for file_path, file_size in file_sizes.items():
+                        if should_cancel and should_cancel():
+                            raise InterruptedError("préparation interrompue")
+                        dest_path = os.path.join(stage_dir, file_path)
+                        # Casser le lien physique: le fichier en place ne doit pas être modifié
+                        detach(dest_path)
+                    
+                        # Utiliser le new_sha pour télécharger la version la plus récente du fichier
+                        if download_single_file_from_github(repo_url, file_path, dest_path, new_sha, job):
+                            success_count += 1
+                            # La taille réelle pourrait être différente si get_github_file_size a échoué.
+                            # On utilise la taille connue pour la progression.
+                            bytes_downloaded += file_size if file_size is not None else 0
+                            if progress_callback:
+                                progress_callback(bytes_downloaded, total_size)
+                            # print(f"  ✓ Mis à jour: {file_path}") # Trop verbeux
+                        else:
+                            print(f"  ✗ Erreur de téléchargement: {file_path}")
+                
+                if progress_callback and total_size > 0:
+                    progress_callback(total_size, total_size)
+                    
+                print(f"Mise à jour delta terminée: {success_count}/{len(files_to_update)} fichiers mis à jour")
+                success = success_count == len(files_to_update)
+            else:
+                # S'il n'y avait que des fichiers vides à "mettre à jour"
+                print("Mise à jour delta terminée: Aucun contenu à télécharger.")
+            
         else:
-            # S'il n'y avait que des fichiers vides à "mettre à jour"
-            print("Mise à jour delta terminée: Aucun contenu à télécharger.")
+            print("Aucun fichier à mettre à jour (seulement des suppressions).")
+    except Exception:
+        abort_stage(modpack_dir)
+        raise
+
+    if not success:
+        # La version en place reste intacte
+        abort_stage(modpack_dir)
+        return False
+    mark_stage_ready(modpack_dir, {"sha": new_sha, "base": (get_local_github_commit(modpack_name) or {}).get('sha')}, snapshot_at)
+    return True
+
+def update_modpack_delta(modpack_name, install_dir, changes, repo_url, new_sha, progress_callback=None):
+    """
+    Applique les changements delta au modpack installé en téléchargeant fichier par fichier depuis GitHub.
+    La nouvelle version est préparée à côté du dossier en place puis basculée d'un coup:
+    une interruption ne laisse jamais un modpack à moitié mis à jour.
+    """
+    from .staging import commit_stage
+
+    if not prepare_modpack_delta(modpack_name, install_dir, changes, repo_url, new_sha, progress_callback):
+        return False
+    commit_stage(os.path.join(install_dir, modpack_name))
+    return True
+
+def prefetch_modpack_update(repo_url, install_dir, modpack_name, new_sha, should_cancel=None):
+    """
+    Prépare en arrière-plan la mise à jour delta d'un modpack GitHub installé, sans la basculer:
+    quand l'utilisateur l'accepte, il ne reste qu'un renommage. Retourne True si elle est prête.
+    """
+    from .staging import ready_stage_info
+
+    with modpack_update_lock(modpack_name):
+        local_commit = get_local_github_commit(modpack_name)
+        if not local_commit or not local_commit.get('sha') or local_commit['sha'] == new_sha:
+            return False
+        prepared = ready_stage_info(os.path.join(install_dir, modpack_name))
+        if prepared and prepared.get("sha") == new_sha and prepared.get("base") == local_commit['sha']:
             return True
-        
-    else:
-        print("Aucun fichier à mettre à jour (seulement des suppressions).")
-        return True
+        changes = get_cumulative_changes(repo_url, local_commit['sha'], new_sha)
+        if not changes:
+            return False
+        print(f"Préparation en arrière-plan de la mise à jour de '{modpack_name}' ({new_sha[:7]})...")
+        return prepare_modpack_delta(modpack_name, install_dir, changes, repo_url, new_sha,
+                                     should_cancel=should_cancel, priority=PREFETCH)
+
+def discard_prepared_update(install_dir, modpack_name):
+    """
+    Abandonne la mise à jour préparée d'un modpack. À appeler après une partie: le jeu a écrit dans
+    le dossier en place (sauvegardes, options) et la version préparée ne le reflète plus.
+    """
+    from .staging import abort_stage
+
+    with modpack_update_lock(modpack_name):
+        abort_stage(os.path.join(install_dir, modpack_name))
 
 def get_local_github_commit(modpack_name):
     """
@@ -815,6 +995,16 @@ def install_or_update_modpack_github(url, install_dir, modpack_name, estimated_m
                 if not local_commit or not local_commit.get('sha'):
                      raise ValueError("Le commit local est invalide ou manquant. Une réinstallation complète est nécessaire.")
 
+                # Mise à jour déjà téléchargée en arrière-plan: il ne reste qu'à basculer
+                from .staging import ready_stage_info, commit_stage
+                modpack_dir = os.path.join(install_dir, modpack_name)
+                prepared = ready_stage_info(modpack_dir)
+                if prepared and prepared.get("sha") == new_sha and prepared.get("base") == local_commit['sha']:
+                    commit_stage(modpack_dir)
+                    save_local_github_commit(modpack_name, remote_commit)
+                    print(f"'{modpack_name}' mis à jour vers le commit {new_sha[:7]} (préparé en arrière-plan).")
+                    return True
+
                 all_changes = get_cumulative_changes(url, local_commit['sha'], new_sha)
                 
                 if all_changes:
@@ -855,17 +1045,10 @@ def install_or_update_modpack_github(url, install_dir, modpack_name, estimated_m
                 return True
             else:
                 print(f"L'installation de '{modpack_name}' a échoué.")
-                # Nettoyer les fichiers potentiellement corrompus
-                modpack_dir = os.path.join(install_dir, modpack_name)
-                if os.path.exists(modpack_dir):
-                    shutil.rmtree(modpack_dir)
                 return False
         except Exception as e:
+            # Le dossier préparé a déjà été abandonné: le dossier en place (sauvegardes...) n'a pas été touché
             print(f"Exception lors de l'installation de '{modpack_name}': {e}")
-            # Nettoyer les fichiers potentiellement corrompus
-            modpack_dir = os.path.join(install_dir, modpack_name)
-            if os.path.exists(modpack_dir):
-                shutil.rmtree(modpack_dir)
             return False
 
 def is_connected_to_internet(host="http://www.google.com", timeout=3):